@@ -15,45 +15,37 @@ Before moving to Part B, write down:
   2. The spread covers roughly ±___ (is it ±10, ±30, or ±100?)
 """
 
-import random
-
-
-def ascii_hist(values, bins=20, width=40):
-    lo, hi = min(values), max(values)
-    if lo == hi:
-        print(f"All values: {lo}")
-        return
-    bin_size = (hi - lo) / bins
-    counts = [0] * bins
-    for v in values:
-        idx = min(int((v - lo) / bin_size), bins - 1)
-        counts[idx] += 1
-    max_count = max(counts)
-    for i, c in enumerate(counts):
-        label = f"{lo + i * bin_size:+7.1f}"
-        bar = "#" * int(c / max_count * width)
-        print(f"{label} | {bar} ({c})")
-
-
-# --- A1: one walker, 100 steps, print every 10 ---
-print("=== A1: one walker, 100 steps ===")
-pos = 0
-for step in range(1, 101):
-    pos += random.choice([-1, 1])
-    if step % 10 == 0:
-        print(f"  step {step:>3}: pos = {pos:+}")
-
-# --- A2: one walker, 1000 steps ---
-print("\n=== A2: one walker, 1000 steps ===")
-pos = sum(random.choices([-1, 1], k=1000))
-print(f"  final position: {pos:+}")
-
-# --- A3: ten walkers, 1000 steps ---
-print("\n=== A3: ten walkers, 1000 steps ===")
-final_positions = [sum(random.choices([-1, 1], k=1000)) for _ in range(10)]
-print("  " + "  ".join(f"{p:+}" for p in final_positions))
-
-# --- A4: 1000 walkers, 1000 steps — histogram ---
-print("\n=== A4: 1000 walkers, 1000 steps ===")
-final_positions = [sum(random.choices([-1, 1], k=1000)) for _ in range(1000)]
-ascii_hist(final_positions)
+import argparse
+
+import numpy as np
+
+from p1_randomness.walks import ascii_hist, endpoints, paths
+
+
+def main(seed=None):
+    """Run A1-A4 (seed None draws fresh walks every run)."""
+    rng = np.random.default_rng(seed)
+
+    # --- A1: one walker, 100 steps, print every 10 ---
+    print("=== A1: one walker, 100 steps ===")
+    path = paths(1, 100, rng)[0]
+    for step in range(10, 101, 10):
+        print(f"  step {step:>3}: pos = {path[step]:+}")
+
+    # --- A2: one walker, 1000 steps ---
+    print("\n=== A2: one walker, 1000 steps ===")
+    print(f"  final position: {endpoints(1, 1000, rng)[0]:+}")
+
+    # --- A3: ten walkers, 1000 steps ---
+    print("\n=== A3: ten walkers, 1000 steps ===")
+    print("  " + "  ".join(f"{p:+}" for p in endpoints(10, 1000, rng)))
+
+    # --- A4: 1000 walkers, 1000 steps — histogram ---
+    print("\n=== A4: 1000 walkers, 1000 steps ===")
+    print(ascii_hist(endpoints(1000, 1000, rng)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drunken Walker Part A")
+    parser.add_argument("--seed", type=int, default=None, help="Seed (default: fresh)")
+    main(parser.parse_args().seed)
@@ -27,47 +27,29 @@ Sample output (1000 walks per step count):
     1600 |    -0.79 |    41.36 |   40.00
 """
 
-import math
-import random
-
-
-def ascii_hist(values, bins=20, width=40):
-    lo, hi = min(values), max(values)
-    if lo == hi:
-        print(f"All values: {lo}")
-        return
-    bin_size = (hi - lo) / bins
-    counts = [0] * bins
-    for v in values:
-        idx = min(int((v - lo) / bin_size), bins - 1)
-        counts[idx] += 1
-    max_count = max(counts)
-    for i, c in enumerate(counts):
-        label = f"{lo + i * bin_size:+7.1f}"
-        bar = "#" * int(c / max_count * width)
-        print(f"{label} | {bar} ({c})")
-
-
-num_walks = 1000
-step_counts = [100, 400, 900, 1600]
-
-means = []
-stds = []
-
-for n_steps in step_counts:
-    final_positions = []
-    for _ in range(num_walks):
-        pos = sum(random.choices([-1, 1], k=n_steps))
-        final_positions.append(pos)
-
-    ascii_hist(final_positions)
-    mean = sum(final_positions) / len(final_positions)
-    std = math.sqrt(sum((x - mean) ** 2 for x in final_positions) / (len(final_positions) - 1))
-    means.append(mean)
-    stds.append(std)
-
-
-print(f"{'Steps':>8} | {'Mean':>8} | {'Std Dev':>8}")
-print(f"{'-' * 8}-+-{'-' * 8}-+-{'-' * 8}")
-for n_steps, mean, std in zip(step_counts, means, stds):
-    print(f"{n_steps:>8} | {mean:>8.2f} | {std:>8.2f}")
+import argparse
+
+import numpy as np
+
+from p1_randomness.walks import ascii_hist, endpoints, format_spread, spread
+
+STEP_COUNTS = [100, 400, 900, 1600]
+
+
+def main(num_walks: int = 1000, step_counts=STEP_COUNTS, seed=None):
+    """Histogram final positions per step count, then tabulate the spread."""
+    rng = np.random.default_rng(seed)
+    for n_steps in step_counts:
+        print(f"\n=== {num_walks} walks, {n_steps} steps ===")
+        print(ascii_hist(endpoints(num_walks, n_steps, rng)))
+
+    print()
+    print(format_spread(spread(step_counts, num_walks, rng)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drunken Walker: the sqrt(n) diffusion law")
+    parser.add_argument("--walks", type=int, default=1000, help="Walks per step count")
+    parser.add_argument("--seed", type=int, default=None, help="Seed (default: fresh)")
+    args = parser.parse_args()
+    main(args.walks, seed=args.seed)
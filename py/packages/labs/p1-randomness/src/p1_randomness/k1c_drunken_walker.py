@@ -44,49 +44,35 @@ References:
   - First passage times: Grinstead & Snell Ch. 12
 """
 
-import random
-import statistics
-
-
-def ascii_hist(values, bins=20, width=40):
-    lo, hi = min(values), max(values)
-    if lo == hi:
-        print(f"All values: {lo}")
-        return
-    bin_size = (hi - lo) / bins
-    counts = [0] * bins
-    for v in values:
-        idx = min(int((v - lo) / bin_size), bins - 1)
-        counts[idx] += 1
-    max_count = max(counts)
-    for i, c in enumerate(counts):
-        label = f"{lo + i * bin_size:+7.1f}"
-        bar = "#" * int(c / max_count * width)
-        print(f"{label} | {bar} ({c})")
-
-
-targets = [5, 10, 20, 40]
-walkers = 1000
-
-
-# --- A1: one walker, 100 steps, print every 10 ---
-print("=== Passage Times ===")
-pos = 0
-
-for target in targets:
-    passage_times = []
-    for _ in range(walkers):
-        step_count = 0
-        pos = 0
-        while step_count <= 100000:
-            step_count += 1
-            pos += 1 if random.random() > 0.5 else -1
-            if pos == target:
-                passage_times.append(step_count)
-                break
-    print(f"Passage Times for Target: {target}")
-    print(
-        f"Mean:{sum(passage_times) / len(passage_times)}\nMedian:{statistics.median(passage_times)}\nMax:{max(passage_times)}\n"
-    )
-    print(f"Fails: {walkers - len(passage_times)}\n")
-    ascii_hist(passage_times)
+import argparse
+
+import numpy as np
+
+from p1_randomness.walks import (
+    NOT_REACHED,
+    ascii_hist,
+    first_passage_times,
+    format_passage,
+    passage_summary,
+)
+
+TARGETS = [5, 10, 20, 40]
+
+
+def main(walkers: int = 1000, targets=TARGETS, max_steps: int = 100_000, seed=None):
+    """Passage-time statistics and histogram for each target."""
+    rng = np.random.default_rng(seed)
+    print("=== Passage Times ===")
+    for target in targets:
+        times = first_passage_times(target, walkers, max_steps, rng)
+        print(f"\n{format_passage(target, passage_summary(times))}\n")
+        print(ascii_hist(times[times != NOT_REACHED]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drunken Walker Part C: first passage times")
+    parser.add_argument("--walkers", type=int, default=1000, help="Walkers per target")
+    parser.add_argument("--max-steps", type=int, default=100_000, help="Give up after this many")
+    parser.add_argument("--seed", type=int, default=None, help="Seed (default: fresh)")
+    args = parser.parse_args()
+    main(args.walkers, max_steps=args.max_steps, seed=args.seed)
@@ -1,8 +1,83 @@
-"""p1-randomness"""
+"""
+p1-randomness command line
 
+Runs the random-walk engine (walks.py) with sizes and seed from the command
+line:
 
-def main():
-    print("Hello from p1-randomness!")
+    python -m p1_randomness.main endpoints --walkers 1000 --steps 1000
+    python -m p1_randomness.main path --steps 100 --every 10
+    python -m p1_randomness.main spread --steps 100 400 900 1600
+    python -m p1_randomness.main passage --targets 5 10 20 40
+
+With no command, the endpoints histogram is shown.
+"""
+
+import argparse
+
+import numpy as np
+
+from p1_randomness import walks
+
+ENDPOINT_ARGS = ("walkers", "steps", "bins")
+
+
+def main(argv: list[str] | None = None):
+    """
+    CLI entry point.
+
+    Args:
+        argv: Arguments (default: sys.argv[1:])
+    """
+    parser = argparse.ArgumentParser(description="Simulate simple symmetric random walks")
+    parser.add_argument("--seed", type=int, default=None, help="Seed (default: fresh)")
+    commands = parser.add_subparsers(dest="command")
+
+    endpoints = commands.add_parser("endpoints", help="Histogram of final positions")
+    endpoints.add_argument("--walkers", type=int, default=1000, help="Number of walkers")
+    endpoints.add_argument("--steps", type=int, default=1000, help="Steps per walker")
+    endpoints.add_argument("--bins", type=int, default=20, help="Histogram bins")
+
+    path = commands.add_parser("path", help="One walker's position as it goes")
+    path.add_argument("--steps", type=int, default=100, help="Steps to take")
+    path.add_argument("--every", type=int, default=10, help="Print every this many steps")
+
+    spread = commands.add_parser("spread", help="Spread of final positions vs sqrt(n)")
+    spread.add_argument("--walkers", type=int, default=1000, help="Walkers per step count")
+    spread.add_argument(
+        "--steps", type=int, nargs="+", default=[100, 400, 900, 1600], help="Step counts"
+    )
+
+    passage = commands.add_parser("passage", help="First-passage times to target positions")
+    passage.add_argument("--walkers", type=int, default=1000, help="Walkers per target")
+    passage.add_argument("--targets", type=int, nargs="+", default=[5, 10, 20, 40])
+    passage.add_argument("--max-steps", type=int, default=100_000, help="Give up after this many")
+    passage.add_argument("--bins", type=int, default=20, help="Histogram bins")
+
+    # No command: endpoints with its defaults
+    parser.set_defaults(
+        command="endpoints", **{name: endpoints.get_default(name) for name in ENDPOINT_ARGS}
+    )
+    args = parser.parse_args(argv)
+    if args.command == "path" and args.every < 1:
+        parser.error("--every must be positive")
+
+    if args.command == "endpoints":
+        final = walks.endpoints(args.walkers, args.steps, args.seed)
+        print(f"\n{args.walkers} walkers, {args.steps} steps:")
+        print(f"  mean {final.mean():+.2f}, std {final.std(ddof=1):.2f}\n")
+        print(walks.ascii_hist(final, bins=args.bins))
+    elif args.command == "path":
+        positions = walks.paths(1, args.steps, args.seed)[0]
+        for step in range(args.every, args.steps + 1, args.every):
+            print(f"  step {step:>4}: pos = {positions[step]:+}")
+    elif args.command == "spread":
+        print(walks.format_spread(walks.spread(args.steps, args.walkers, args.seed)))
+    elif args.command == "passage":
+        rng = np.random.default_rng(args.seed)
+        for target in args.targets:
+            times = walks.first_passage_times(target, args.walkers, args.max_steps, rng)
+            print(f"\n{walks.format_passage(target, walks.passage_summary(times))}\n")
+            print(walks.ascii_hist(times[times != walks.NOT_REACHED], bins=args.bins))
 
 
 if __name__ == "__main__":
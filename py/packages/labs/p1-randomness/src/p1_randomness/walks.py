@@ -0,0 +1,214 @@
+"""
+Random-walk engine
+
+Simple symmetric walks on the integers: a walker starts at 0 and each step
+moves +1 or -1 with equal probability. Every function takes its sizes and
+a seed as arguments and does nothing until called, so the k1 experiments,
+the CLI and other code share one implementation and importing costs
+nothing.
+
+Ensembles are simulated as numpy arrays, one row per walker:
+- endpoints() draws final positions directly as 2·Binomial(n, ½) − n,
+  which has exactly the distribution of a summed ±1 walk, in O(walkers)
+- paths() materializes every position (walkers × (n + 1) integers)
+- first_passage_times() advances only the walkers that have not arrived,
+  a block of steps at a time, so memory stays at walkers × chunk_steps
+
+Seeds are anything np.random.default_rng accepts (None, an int, a
+SeedSequence or a Generator). Results for a seed are reproducible for the
+same arguments; first-passage times also depend on chunk_steps.
+"""
+
+import math
+import statistics
+from dataclasses import dataclass
+
+import numpy as np
+
+# First-passage time of a walker that did not reach the target
+NOT_REACHED = -1
+
+
+def endpoints(n_walkers: int, n_steps: int, seed=None) -> np.ndarray:
+    """
+    Final positions of independent walks.
+
+    Args:
+        n_walkers: Number of walkers
+        n_steps: Steps per walker
+        seed: Seed or Generator
+
+    Returns:
+        Integer array of shape (n_walkers,)
+    """
+    rng = np.random.default_rng(seed)
+    return 2 * rng.binomial(n_steps, 0.5, size=n_walkers) - n_steps
+
+
+def paths(n_walkers: int, n_steps: int, seed=None) -> np.ndarray:
+    """
+    Full position histories of independent walks.
+
+    Args:
+        n_walkers: Number of walkers
+        n_steps: Steps per walker
+        seed: Seed or Generator
+
+    Returns:
+        Integer array of shape (n_walkers, n_steps + 1); column 0 is the
+        start (0) and column k the position after k steps
+    """
+    rng = np.random.default_rng(seed)
+    positions = np.zeros((n_walkers, n_steps + 1), dtype=np.int64)
+    steps = rng.integers(0, 2, size=(n_walkers, n_steps), dtype=np.int8)
+    steps *= 2
+    steps -= 1
+    np.cumsum(steps, axis=1, out=positions[:, 1:])
+    return positions
+
+
+def first_passage_times(
+    target: int,
+    n_walkers: int,
+    max_steps: int = 100_000,
+    seed=None,
+    chunk_steps: int = 4096,
+) -> np.ndarray:
+    """
+    Steps until each walker first stands on the target.
+
+    Args:
+        target: Nonzero position to reach
+        n_walkers: Number of walkers
+        max_steps: Give up on walkers still out after this many steps
+        seed: Seed or Generator
+        chunk_steps: Steps simulated per block for the walkers still out
+
+    Returns:
+        Integer array of shape (n_walkers,), NOT_REACHED for walkers that
+        gave up
+    """
+    if target == 0:
+        raise ValueError("target must be nonzero (every walker starts at 0)")
+    rng = np.random.default_rng(seed)
+    times = np.full(n_walkers, NOT_REACHED, dtype=np.int64)
+    active = np.arange(n_walkers)
+    position = np.zeros(n_walkers, dtype=np.int64)
+
+    elapsed = 0
+    while len(active) and elapsed < max_steps:
+        n = min(chunk_steps, max_steps - elapsed)
+        steps = rng.integers(0, 2, size=(len(active), n), dtype=np.int8)
+        steps *= 2
+        steps -= 1
+        block = np.cumsum(steps, axis=1, dtype=np.int64)
+        block += position[:, None]
+
+        hit = block == target
+        arrived = hit.any(axis=1)
+        times[active[arrived]] = elapsed + hit[arrived].argmax(axis=1) + 1
+
+        position = block[~arrived, -1]
+        active = active[~arrived]
+        elapsed += n
+    return times
+
+
+@dataclass(frozen=True)
+class Spread:
+    """Mean and sample standard deviation of final positions after n steps."""
+
+    n_steps: int
+    mean: float
+    std: float
+
+    @property
+    def sqrt_n(self) -> float:
+        """The diffusion-law prediction for std."""
+        return math.sqrt(self.n_steps)
+
+
+def spread(step_counts: list[int], n_walkers: int, seed=None) -> list[Spread]:
+    """
+    Spread of final positions for each step count (the √n diffusion law).
+
+    Args:
+        step_counts: Walk lengths to compare
+        n_walkers: Walkers per length
+        seed: Seed or Generator (one stream shared by all lengths)
+
+    Returns:
+        One Spread per step count, in order
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for n_steps in step_counts:
+        final = endpoints(n_walkers, n_steps, rng)
+        rows.append(Spread(n_steps, float(final.mean()), float(final.std(ddof=1))))
+    return rows
+
+
+def format_spread(rows: list[Spread]) -> str:
+    """Render spread() rows as a table next to the √n prediction."""
+    lines = [
+        f"{'Steps':>8} | {'Mean':>8} | {'Std Dev':>8} | {'sqrt(n)':>7}",
+        f"{'-' * 8}-+-{'-' * 8}-+-{'-' * 8}-+-{'-' * 7}",
+    ]
+    for row in rows:
+        lines.append(f"{row.n_steps:>8} | {row.mean:>8.2f} | {row.std:>8.2f} | {row.sqrt_n:>7.2f}")
+    return "\n".join(lines)
+
+
+def passage_summary(times: np.ndarray) -> dict:
+    """
+    Mean, median, max and failure count of first-passage times.
+
+    Statistics cover the walkers that arrived; fails counts the rest.
+    """
+    reached = times[times != NOT_REACHED]
+    if not len(reached):
+        return {"mean": math.nan, "median": math.nan, "max": NOT_REACHED, "fails": len(times)}
+    return {
+        "mean": float(reached.mean()),
+        "median": float(statistics.median(reached.tolist())),
+        "max": int(reached.max()),
+        "fails": len(times) - len(reached),
+    }
+
+
+def format_passage(target: int, summary: dict) -> str:
+    """Render a passage_summary() for one target."""
+    return (
+        f"Passage times for target {target}: mean {summary['mean']:.1f}, "
+        f"median {summary['median']:.1f}, max {summary['max']}, fails {summary['fails']}"
+    )
+
+
+def ascii_hist(values, bins: int = 20, width: int = 40) -> str:
+    """
+    Render a histogram as text, one line per bin.
+
+    Args:
+        values: Numbers to bin
+        bins: Number of equal-width bins over [min, max]
+        width: Characters of the longest bar
+
+    Returns:
+        The histogram lines joined by newlines
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return "No values"
+    lo, hi = float(values.min()), float(values.max())
+    if lo == hi:
+        return f"All values: {lo:g}"
+    bin_size = (hi - lo) / bins
+    idx = np.minimum(((values - lo) / bin_size).astype(np.int64), bins - 1)
+    counts = np.bincount(idx, minlength=bins)
+    max_count = counts.max()
+    lines = []
+    for i, c in enumerate(counts.tolist()):
+        label = f"{lo + i * bin_size:+7.1f}"
+        bar = "#" * int(c / max_count * width)
+        lines.append(f"{label} | {bar} ({c})")
+    return "\n".join(lines)
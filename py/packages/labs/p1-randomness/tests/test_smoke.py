@@ -4,4 +4,4 @@ from p1_randomness import main
 
 
 def test_main_runs():
-    main.main()
+    main.main([])
@@ -0,0 +1,67 @@
+"""Tests for the random-walk engine"""
+
+import importlib
+
+import numpy as np
+import pytest
+from p1_randomness import main, walks
+
+
+def test_importing_experiments_runs_nothing(capsys):
+    for name in ("k1a_drunken_walker", "k1b_drunken_walker", "k1c_drunken_walker"):
+        importlib.reload(importlib.import_module(f"p1_randomness.{name}"))
+    assert capsys.readouterr().out == ""
+
+
+def test_paths_are_unit_steps_and_seeded():
+    positions = walks.paths(20, 50, seed=3)
+    assert positions.shape == (20, 51)
+    assert (positions[:, 0] == 0).all()
+    assert (np.abs(np.diff(positions, axis=1)) == 1).all()
+    np.testing.assert_array_equal(positions, walks.paths(20, 50, seed=3))
+
+
+def test_endpoints_have_walk_parity_and_sqrt_n_spread():
+    final = walks.endpoints(20_000, 400, seed=0)
+    assert (final % 2 == 0).all()
+    assert abs(final.std() - 20.0) < 0.5
+    rows = walks.spread([100, 400], 5000, seed=1)
+    assert [round(row.std / row.sqrt_n, 1) for row in rows] == [1.0, 1.0]
+
+
+def test_first_passage_times_land_on_target():
+    times = walks.first_passage_times(4, 200, max_steps=500, seed=2, chunk_steps=64)
+    reached = times != walks.NOT_REACHED
+    assert (times[reached] >= 4).all()
+    assert (times[reached] % 2 == 0).all()  # Odd parity is impossible for an even target
+    # Three steps are needed to reach 3, so a two-step cap fails everyone
+    capped = walks.first_passage_times(3, 50, max_steps=2, seed=0)
+    assert (capped == walks.NOT_REACHED).all()
+
+    summary = walks.passage_summary(times)
+    assert summary["fails"] == int((~reached).sum())
+    assert summary["median"] <= summary["mean"]
+
+
+def test_cli_commands(capsys):
+    for argv in (["path"], ["spread", "--walkers", "100"], ["passage", "--walkers", "50"]):
+        main.main(["--seed", "1", *argv])
+    out = capsys.readouterr().out
+    assert "step  100" in out
+    assert "sqrt(n)" in out
+    assert "target 40" in out
+
+
+def test_cli_without_command_is_seeded(capsys):
+    main.main(["--seed", "4"])
+    first = capsys.readouterr().out
+    main.main(["--seed", "4"])
+    assert capsys.readouterr().out == first
+    assert "1000 walkers, 1000 steps" in first
+
+
+def test_cli_rejects_non_positive_every(capsys):
+    with pytest.raises(SystemExit) as exc:
+        main.main(["path", "--every", "0"])
+    assert exc.value.code == 2
+    assert "--every must be positive" in capsys.readouterr().err
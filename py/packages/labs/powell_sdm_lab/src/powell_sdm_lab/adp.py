@@ -0,0 +1,304 @@
+"""
+Approximate dynamic programming on the post-decision state
+
+Learns a lookup-table value function V[d, x] over day-of-week d and a grid
+of post-decision inventory levels x (inventory_post in env_inventory):
+the discounted expected cost from just after ordering, before demand.
+
+Training runs forward passes over batched demand scenario matrices. At
+each period every scenario moves to a post-decision state, random or
+greedy on the current V, and the observed stage cost plus the discounted
+greedy value of the next state updates the cell of its previous
+post-decision state (one bincount per period, so all scenarios are folded
+in at once). By default every decision is random, which visits the whole
+grid evenly; greedy decisions concentrate samples near the policy's own
+path but leave noisy cells elsewhere that the greedy step then exploits.
+
+Greedy decisions only need, for each inventory bucket, the best reachable
+post-decision level: argmin over x >= I of c*(x - I) + V[d, x], a suffix
+minimum over the grid. compile() stores it as a (7 × buckets) target table,
+so at run time decide() is one array lookup. Tables save to .npz so later
+runs skip training.
+"""
+
+import argparse
+import math
+from pathlib import Path
+
+import numpy as np
+
+from powell_sdm_lab.demand_model import PERIOD
+from powell_sdm_lab.demand_process import DemandProcess
+from powell_sdm_lab.evaluate import DEFAULT_SPECS, simulate_batch
+
+
+def _suffix_argmin(w: np.ndarray) -> np.ndarray:
+    """Index of the minimum of w[..., b:] for every b (last axis)."""
+    n = w.shape[-1]
+    rev = w[..., ::-1]
+    running = np.minimum.accumulate(rev, axis=-1)
+    # Position in rev where each running minimum was set
+    is_new = np.concatenate(
+        [np.ones(rev.shape[:-1] + (1,), dtype=bool), running[..., 1:] < running[..., :-1]],
+        axis=-1,
+    )
+    pos = np.maximum.accumulate(np.where(is_new, np.arange(n), 0), axis=-1)
+    return (n - 1 - pos)[..., ::-1]
+
+
+class ValueTablePolicy:
+    """
+    Greedy policy on a learned post-decision value table.
+
+    Decision: q_t = max(0, X[t mod 7, bucket(I_t)] - I_t)
+    where X is the compiled table of target post-decision inventory and
+    bucket(I) is the first grid level at or above I.
+    """
+
+    def __init__(
+        self,
+        max_inventory: float = 200.0,
+        step: float = 2.0,
+        discount: float = 0.95,
+        ordering_cost: float = 0.2,
+        holding_cost: float = 0.05,
+        penalty_cost: float = 1.0,
+    ):
+        """
+        Initialize an untrained (all-zero) value table.
+
+        Args:
+            max_inventory: Top of the post-decision inventory grid
+            step: Grid spacing
+            discount: Discount factor for future costs
+            ordering_cost: Per-unit ordering cost
+            holding_cost: Per-unit holding cost per period
+            penalty_cost: Per-unit stockout penalty
+        """
+        self.grid = np.arange(0.0, max_inventory + step / 2, step)
+        self.step = step
+        self.discount = discount
+        self.c, self.h, self.p = ordering_cost, holding_cost, penalty_cost
+        self.values = np.zeros((PERIOD, len(self.grid)))
+        self.visits = np.zeros((PERIOD, len(self.grid)))
+        self.targets = np.zeros((PERIOD, len(self.grid)))
+        self._targets = self.targets.tolist()
+        self.compile()
+
+    def _bucket(self, inventory: np.ndarray) -> np.ndarray:
+        """First grid index at or above each inventory (clipped to the grid)."""
+        idx = np.ceil(inventory / self.step - 1e-9).astype(np.intp)
+        return np.clip(idx, 0, len(self.grid) - 1)
+
+    def _greedy(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Best reachable post-decision level for every (day, bucket).
+
+        Returns:
+            (target grid indices, greedy value c*(x - grid[b]) + V[d, x]), both (7, buckets)
+        """
+        w = self.c * self.grid + self.values
+        best = _suffix_argmin(w)
+        value = np.take_along_axis(w, best, axis=1) - self.c * self.grid
+        return best, value
+
+    def train(
+        self,
+        n_iterations: int = 20,
+        n_scenarios: int = 500,
+        T: int = 56,
+        seed: int = 0,
+        initial_inventory: float = 80.0,
+        process: DemandProcess | None = None,
+        learning_rate: float = 1.0,
+        exploration: float = 1.0,
+    ) -> "ValueTablePolicy":
+        """
+        Learn the value table from batches of demand scenarios.
+
+        Cell step sizes decay as visits^-learning_rate (1 / n averaging for 1).
+        With probability `exploration` a scenario picks a random reachable
+        post-decision level instead of the greedy one; updates always
+        bootstrap from the greedy value of the next state.
+
+        Args:
+            n_iterations: Scenario batches to train on
+            n_scenarios: Scenarios per batch
+            T: Periods per scenario
+            seed: Root demand seed; batch i uses scenarios i*N .. (i+1)*N-1
+            initial_inventory: Starting inventory of each scenario
+            process: Demand process (default: DemandProcess())
+            learning_rate: Step-size decay exponent in (0.5, 1]
+            exploration: Probability of a random instead of greedy decision
+
+        Returns:
+            self, with the table compiled
+        """
+        process = process or DemandProcess()
+        rng = np.random.default_rng(seed)
+        n_cells = len(self.grid)
+        flat_values = self.values.reshape(-1)
+        flat_visits = self.visits.reshape(-1)
+
+        for it in range(n_iterations):
+            demands = process.sample(n_scenarios, T, seed, first_scenario=it * n_scenarios)
+            inventory = np.full(n_scenarios, initial_inventory)
+            prev_cells = prev_cost = None
+
+            for t in range(T + 1):
+                d = t % PERIOD
+                best, value = self._greedy()
+                bucket = self._bucket(inventory)
+
+                # Sample of V at the previous post-decision state
+                if prev_cells is not None:
+                    v_hat = prev_cost + self.discount * value[d, bucket]
+                    counts = np.bincount(prev_cells, minlength=flat_values.size)
+                    sums = np.bincount(prev_cells, weights=v_hat, minlength=flat_values.size)
+                    hit = counts > 0
+                    flat_visits[hit] += counts[hit]
+                    alpha = counts[hit] / flat_visits[hit] ** learning_rate
+                    alpha = np.minimum(alpha, 1.0)
+                    flat_values[hit] += alpha * (sums[hit] / counts[hit] - flat_values[hit])
+                if t == T:
+                    break
+
+                choice = best[d, bucket]
+                explore = rng.random(n_scenarios) < exploration
+                choice[explore] = rng.integers(bucket[explore], n_cells)
+                post = np.maximum(self.grid[choice], inventory)
+                demand = demands[:, t]
+                stockout = np.maximum(0.0, demand - post)
+                inventory = post - np.minimum(post, demand)
+
+                prev_cells = d * n_cells + np.minimum(
+                    np.rint(post / self.step).astype(np.intp), n_cells - 1
+                )
+                prev_cost = self.h * inventory + self.p * stockout
+
+        self.compile()
+        return self
+
+    def compile(self):
+        """Precompute the (day, bucket) -> target post-decision inventory table."""
+        best, _ = self._greedy()
+        self.targets = self.grid[best]
+        self._targets = self.targets.tolist()
+
+    def decide(self, inventory: float, t: int) -> float:
+        """
+        Compute order quantity by table lookup.
+
+        Args:
+            inventory: Current inventory level
+            t: Time index
+
+        Returns:
+            Order quantity
+        """
+        b = min(max(math.ceil(inventory / self.step - 1e-9), 0), len(self.grid) - 1)
+        return max(0, self._targets[t % PERIOD][b] - inventory)
+
+    def learn(self, t: int, demand: float):
+        """No online learning; the table is trained offline."""
+        pass
+
+    def reset_batch(self, n_scenarios: int):
+        """No per-scenario state to set up."""
+        pass
+
+    def decide_batch(self, inventories: np.ndarray, t: int) -> np.ndarray:
+        """
+        Compute order quantities for N scenarios by table lookup.
+
+        Args:
+            inventories: Current inventory levels, shape (N,)
+            t: Time index
+
+        Returns:
+            Order quantities, shape (N,)
+        """
+        return np.maximum(0.0, self.targets[t % PERIOD][self._bucket(inventories)] - inventories)
+
+    def learn_batch(self, t: int, demands: np.ndarray):
+        """No online learning; the table is trained offline."""
+        pass
+
+    def get_forecast(self, t: int) -> float | None:
+        """No forecast available."""
+        return None
+
+    def get_forecast_error(self, t: int, demand: float) -> float | None:
+        """No forecast error to report."""
+        return None
+
+    def save(self, path: Path):
+        """Write the value, visit and target tables to an .npz file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            grid=self.grid,
+            values=self.values,
+            visits=self.visits,
+            targets=self.targets,
+            params=np.array([self.step, self.discount, self.c, self.h, self.p]),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "ValueTablePolicy":
+        """Read a policy written by save(); no training needed."""
+        with np.load(path) as data:
+            step, discount, c, h, p = data["params"].tolist()
+            policy = cls(float(data["grid"][-1]), step, discount, c, h, p)
+            policy.values[:] = data["values"]
+            policy.visits[:] = data["visits"]
+            policy.targets = data["targets"]
+        policy._targets = policy.targets.tolist()
+        return policy
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Train a post-decision value table and compare it with policies A and B"
+    )
+    parser.add_argument("--iterations", type=int, default=20, help="Training batches")
+    parser.add_argument("--scenarios", type=int, default=500, help="Scenarios per batch")
+    parser.add_argument("--train-T", type=int, default=56, help="Periods per training scenario")
+    parser.add_argument("--seed", type=int, default=0, help="Training seed (default: 0)")
+    parser.add_argument("--table", type=Path, default=None, help=".npz table to load or save")
+    parser.add_argument("--retrain", action="store_true", help="Train even if --table exists")
+    parser.add_argument("--eval-scenarios", type=int, default=200, help="Held-out scenarios")
+    parser.add_argument("--T", type=int, default=365, help="Evaluation periods (default: 365)")
+    args = parser.parse_args()
+
+    if args.table is not None and args.table.exists() and not args.retrain:
+        policy = ValueTablePolicy.load(args.table)
+        print(f"\nLoaded value table from {args.table}")
+    else:
+        print(f"\nTraining on {args.iterations} × {args.scenarios} scenarios...")
+        policy = ValueTablePolicy().train(
+            args.iterations, args.scenarios, args.train_T, seed=args.seed
+        )
+        if args.table is not None:
+            policy.save(args.table)
+            print(f"Value table written to {args.table}")
+
+    # Held-out evaluation on a different root seed, common to all policies
+    demands = DemandProcess().sample(args.eval_scenarios, args.T, seed=args.seed + 1)
+    print(f"\nMean over {args.eval_scenarios} held-out scenarios (T={args.T}):\n")
+    print(f"{'Policy':<8} {'Total cost':>12} {'Stockouts':>12} {'Avg inv':>10}")
+    print("-" * 45)
+    candidates = {name: spec.build() for name, spec in DEFAULT_SPECS.items() if name in ("a", "b")}
+    candidates["adp"] = policy
+    for name, candidate in candidates.items():
+        metrics = simulate_batch(candidate, demands, 80.0)
+        print(
+            f"{name:<8} {metrics['total_cost'].mean():>12.2f} "
+            f"{metrics['total_stockouts'].mean():>12.2f} {metrics['avg_inventory'].mean():>10.2f}"
+        )
+    print()
+
+
+if __name__ == "__main__":
+    main()
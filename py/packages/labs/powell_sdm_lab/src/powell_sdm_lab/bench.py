@@ -0,0 +1,405 @@
+"""
+Benchmark suite with scaling curves and regression checks
+
+Times the hot pieces of the lab over a scaling grid: horizons T for the
+per-step code (demand generation, InventoryEnv.step, OnlineDemandModel
+predict/update, TraceWriter.write_step, compare_traces) and scenario
+counts N for the vectorized code (demand matrices, BatchInventoryEnv.step).
+Each case reports throughput in steps per second (T * N steps) and peak
+traced memory.
+
+Setup (pregenerated demands, traces to compare) is excluded from timing.
+Throughput is the best of `repeats` runs; a run longer than a second is
+not repeated. Peak memory comes from one extra run under tracemalloc, so
+it does not slow the timed runs down.
+
+`--output` writes the results as a JSON baseline; `--check BASELINE`
+reruns the baseline's grid and exits non-zero when any case loses more
+than `--threshold` percent of its throughput or grows its peak memory by
+more than that (ignoring growth under MEMORY_SLACK bytes). Baselines are
+machine-specific: compare runs on the same machine.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from powell_sdm_lab.compare import compare_traces
+from powell_sdm_lab.demand_model import OnlineDemandModel
+from powell_sdm_lab.demand_process import DemandProcess
+from powell_sdm_lab.env_inventory import BatchInventoryEnv, InventoryEnv
+from powell_sdm_lab.trace import TraceWriter
+
+GRIDS = {
+    "quick": {"T": [10**2, 10**3, 10**4], "N": [1, 100], "scenario_T": 365},
+    "full": {
+        "T": [10**2, 10**3, 10**4, 10**5, 10**6],
+        "N": [1, 10, 100, 10**3, 10**4],
+        "scenario_T": 365,
+    },
+}
+
+# Peak-memory growth below this is noise (interpreter caches, small arrays)
+MEMORY_SLACK = 1 << 20
+
+TARGET_STOCK = 90.0
+
+
+@dataclass
+class BenchResult:
+    """Throughput and peak memory of one benchmark case."""
+
+    name: str
+    T: int
+    n_scenarios: int
+    steps: int
+    seconds: float
+    steps_per_sec: float
+    peak_bytes: int | None = None
+
+    @property
+    def key(self) -> str:
+        """Identifier of the case within a suite."""
+        return f"{self.name}[T={self.T},N={self.n_scenarios}]"
+
+
+@dataclass
+class Regression:
+    """One case that got slower or bigger than its baseline."""
+
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change_pct(self) -> float:
+        """Relative change vs the baseline, in percent."""
+        return 100 * (self.current - self.baseline) / self.baseline
+
+
+def _demands(T: int, n_scenarios: int = 1) -> np.ndarray:
+    return DemandProcess().sample(n_scenarios, T, seed=0)
+
+
+def _records(T: int):
+    env = InventoryEnv(initial_inventory=80.0)
+    for demand in _demands(T)[0].tolist():
+        yield env.step(max(0.0, TARGET_STOCK - env.inventory), demand)
+
+
+# Each benchmark takes (T, N, workdir), does its setup and returns the
+# closure to time.
+
+
+def bench_demand_generation(T: int, n_scenarios: int, workdir: Path) -> Callable[[], None]:
+    """Sample an (N, T) demand matrix."""
+    process = DemandProcess()
+    return lambda: process.sample(n_scenarios, T, seed=0)
+
+
+def bench_env_step(T: int, n_scenarios: int, workdir: Path) -> Callable[[], None]:
+    """Step the scalar environment under a base-stock rule."""
+    demands = _demands(T)[0].tolist()
+
+    def run():
+        env = InventoryEnv(initial_inventory=80.0)
+        for demand in demands:
+            env.step(max(0.0, TARGET_STOCK - env.inventory), demand)
+
+    return run
+
+
+def bench_demand_model(T: int, n_scenarios: int, workdir: Path) -> Callable[[], None]:
+    """One predict and one update per period."""
+    demands = _demands(T)[0].tolist()
+
+    def run():
+        model = OnlineDemandModel()
+        for t, demand in enumerate(demands):
+            model.predict(t)
+            model.update(t, demand)
+
+    return run
+
+
+def bench_trace_write(T: int, n_scenarios: int, workdir: Path) -> Callable[[], None]:
+    """Write T steps to an indexed text trace."""
+    records = list(_records(T))
+    path = workdir / "write.txt"
+
+    def run():
+        with TraceWriter(path) as trace:
+            for record in records:
+                trace.write_step(record, 80.0, 0.0)
+
+    return run
+
+
+def bench_compare_traces(T: int, n_scenarios: int, workdir: Path) -> Callable[[], None]:
+    """Stream two T-step text traces through compare_traces."""
+    paths = [workdir / "compare_a.txt", workdir / "compare_b.txt"]
+    for i, path in enumerate(paths):
+        with TraceWriter(path) as trace:
+            for record in _records(T):
+                trace.write_step(record, 80.0 + i, float(i))
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            compare_traces(*paths)
+
+    return run
+
+
+def bench_env_step_batch(T: int, n_scenarios: int, workdir: Path) -> Callable[[], None]:
+    """Step N scenarios at once under a base-stock rule."""
+    demands = _demands(T, n_scenarios)
+
+    def run():
+        env = BatchInventoryEnv(80.0, n_scenarios)
+        for t in range(T):
+            env.step(np.maximum(0.0, TARGET_STOCK - env.inventory), demands[:, t])
+
+    return run
+
+
+# name -> (benchmark, scales over scenarios as well as T)
+BENCHMARKS: dict[str, tuple[Callable, bool]] = {
+    "demand_generation": (bench_demand_generation, True),
+    "env_step": (bench_env_step, False),
+    "demand_model": (bench_demand_model, False),
+    "trace_write": (bench_trace_write, False),
+    "compare_traces": (bench_compare_traces, False),
+    "env_step_batch": (bench_env_step_batch, True),
+}
+
+
+def cases(grid: dict, names: list[str] | None = None) -> list[tuple[str, int, int]]:
+    """
+    Expand a grid into (benchmark, T, N) cases.
+
+    Every benchmark runs over the T axis with N=1; scenario benchmarks also
+    run over the N axis at T=scenario_T.
+    """
+    out = []
+    for name, (_, by_scenario) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        out.extend((name, T, 1) for T in grid["T"])
+        if by_scenario:
+            out.extend((name, grid["scenario_T"], n) for n in grid["N"] if n > 1)
+    return out
+
+
+def run_case(
+    name: str, T: int, n_scenarios: int, repeats: int = 3, memory: bool = True
+) -> BenchResult:
+    """
+    Time one benchmark case (and measure its peak traced memory).
+
+    Args:
+        name: Benchmark name in BENCHMARKS
+        T: Time periods
+        n_scenarios: Scenarios N
+        repeats: Timed runs; the fastest counts
+        memory: Also measure peak memory in one run under tracemalloc
+
+    Returns:
+        BenchResult for the case
+    """
+    bench, _ = BENCHMARKS[name]
+    with tempfile.TemporaryDirectory() as tmp:
+        run = bench(T, n_scenarios, Path(tmp))
+        best = float("inf")
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - t0)
+            if best > 1.0:
+                break
+
+        peak = None
+        if memory:
+            tracemalloc.start()
+            try:
+                run()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+    steps = T * n_scenarios
+    return BenchResult(name, T, n_scenarios, steps, best, steps / best, peak)
+
+
+def run_suite(
+    grid: dict,
+    names: list[str] | None = None,
+    repeats: int = 3,
+    memory: bool = True,
+    progress: Callable[[BenchResult], None] | None = None,
+) -> list[BenchResult]:
+    """
+    Run every case of a grid.
+
+    Args:
+        grid: Axes as in GRIDS ("T", "N", "scenario_T")
+        names: Benchmarks to run (default: all)
+        repeats: Timed runs per case
+        memory: Measure peak memory per case
+        progress: Called with each result as it completes
+
+    Returns:
+        Results in case order
+    """
+    results = []
+    for name, T, n in cases(grid, names):
+        result = run_case(name, T, n, repeats, memory)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return results
+
+
+def save_baseline(results: list[BenchResult], grid: dict, path: Path):
+    """Write results and the grid that produced them as a JSON baseline."""
+    baseline = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "grid": grid,
+        "results": {r.key: asdict(r) for r in results},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def load_baseline(path: Path) -> dict:
+    """Read a baseline written by save_baseline."""
+    return json.loads(path.read_text())
+
+
+def find_regressions(
+    results: list[BenchResult], baseline: dict, threshold_pct: float = 25.0
+) -> list[Regression]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: Current results
+        baseline: Baseline from load_baseline
+        threshold_pct: Allowed throughput loss / peak memory growth in percent
+
+    Returns:
+        Cases beyond the threshold (cases missing from the baseline are skipped)
+    """
+    regressions = []
+    for result in results:
+        base = baseline["results"].get(result.key)
+        if base is None:
+            continue
+        if result.steps_per_sec < base["steps_per_sec"] * (1 - threshold_pct / 100):
+            regressions.append(
+                Regression(result.key, "steps_per_sec", base["steps_per_sec"], result.steps_per_sec)
+            )
+        base_peak, peak = base.get("peak_bytes"), result.peak_bytes
+        if (
+            base_peak
+            and peak is not None
+            and peak > base_peak * (1 + threshold_pct / 100)
+            and peak - base_peak > MEMORY_SLACK
+        ):
+            regressions.append(Regression(result.key, "peak_bytes", base_peak, peak))
+    return regressions
+
+
+def format_result(result: BenchResult, baseline: dict | None = None) -> str:
+    """One fixed-width line per case, with the change vs the baseline if given."""
+    peak = f"{result.peak_bytes / 1024:>10.1f}" if result.peak_bytes is not None else f"{'-':>10}"
+    line = (
+        f"{result.name:<18} {result.T:>8} {result.n_scenarios:>6} "
+        f"{result.steps_per_sec:>14,.0f} {peak}"
+    )
+    base = baseline["results"].get(result.key) if baseline else None
+    if base is not None:
+        change = 100 * (result.steps_per_sec / base["steps_per_sec"] - 1)
+        line += f" {change:>+9.1f}%"
+    return line
+
+
+def format_header(with_baseline: bool = False) -> str:
+    """Column header matching format_result."""
+    header = f"{'Benchmark':<18} {'T':>8} {'N':>6} {'Steps/sec':>14} {'Peak KiB':>10}"
+    if with_baseline:
+        header += f" {'vs base':>10}"
+    return header + "\n" + "-" * len(header)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the lab's hot paths over a scaling grid"
+    )
+    parser.add_argument("--grid", choices=sorted(GRIDS), default="quick", help="Scaling grid")
+    parser.add_argument(
+        "--only", nargs="+", choices=sorted(BENCHMARKS), default=None, help="Benchmarks to run"
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per case")
+    parser.add_argument("--no-memory", action="store_true", help="Skip peak memory runs")
+    parser.add_argument("--output", type=Path, default=None, help="Write results as a baseline")
+    parser.add_argument(
+        "--check", type=Path, default=None, help="Fail on regressions vs this baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=25.0,
+        help="Allowed throughput loss / memory growth in percent (default: 25)",
+    )
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.check) if args.check is not None else None
+    # A check reruns the baseline's grid so every case has a counterpart
+    grid = baseline["grid"] if baseline is not None else GRIDS[args.grid]
+
+    print(f"\n{format_header(baseline is not None)}")
+    results = run_suite(
+        grid,
+        args.only,
+        args.repeats,
+        memory=not args.no_memory,
+        progress=lambda r: print(format_result(r, baseline), flush=True),
+    )
+
+    if args.output is not None:
+        save_baseline(results, grid, args.output)
+        print(f"\nBaseline written to {args.output}")
+
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0f}%:")
+            for r in regressions:
+                print(
+                    f"  {r.key} {r.metric}: {r.baseline:,.0f} -> {r.current:,.0f} "
+                    f"({r.change_pct:+.1f}%)"
+                )
+            raise SystemExit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0f}% vs {args.check}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
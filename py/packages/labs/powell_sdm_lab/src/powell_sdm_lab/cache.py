@@ -0,0 +1,299 @@
+"""
+Content-addressed cache of evaluation results
+
+Results are stored under a SHA-256 of everything that determines them: the
+policy class and parameters, the InventoryEnv cost parameters, the demand
+configuration (DemandProcess parameters, or a scenario store's digest),
+seed, T, initial inventory and a fingerprint of the package code. Equal
+inputs hit the same entry whichever command produced it, so repeated and
+overlapping runs (more seeds, a finer sweep grid) only compute what is new.
+
+The fingerprint is the package version plus a hash of the package's source
+files, so any code change moves every key: stale entries are never served,
+they just stop being used and age out (or `--prune-stale` drops them).
+
+Entries live in an SQLite index (safe to share between concurrent runs)
+with optional file artifacts such as traces next to it. Each get touches the
+entry; when the cache grows past max_bytes or max_entries, the least
+recently used entries go first.
+"""
+
+import argparse
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import shutil
+import sqlite3
+import time
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+
+from powell_sdm_lab.demand_process import DemandProcess
+from powell_sdm_lab.env_inventory import InventoryEnv
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent.parent / "runs" / "cache"
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+# Cost parameters every evaluation runs with (InventoryEnv's defaults)
+ENV_COSTS = {
+    name: param.default
+    for name, param in inspect.signature(InventoryEnv.__init__).parameters.items()
+    if name.endswith("_cost")
+}
+
+
+@lru_cache(maxsize=1)
+def code_fingerprint() -> str:
+    """Package version and a hash of every source file of the package."""
+    try:
+        version = importlib.metadata.version("powell-sdm-lab")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    digest = hashlib.sha256()
+    package_dir = Path(__file__).parent
+    for path in sorted(package_dir.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return f"{version}+{digest.hexdigest()[:16]}"
+
+
+def demand_identity(process: DemandProcess | None = None, store_digest: str | None = None) -> dict:
+    """What determines the demand paths: a store by content, else the process."""
+    if store_digest is not None:
+        return {"store": store_digest}
+    return {"process": asdict(process or DemandProcess())}
+
+
+def cache_key(kind: str, policy: str, params: dict, **inputs) -> str:
+    """
+    Hash of everything that determines a result.
+
+    Args:
+        kind: What the entry holds ("run", "scenario", "sweep", ...)
+        policy: Policy class name
+        params: Policy constructor parameters
+        **inputs: The remaining inputs (demand, seed, T, initial_inventory, ...)
+
+    Returns:
+        Hex SHA-256 key
+    """
+    payload = json.dumps(
+        {
+            "kind": kind,
+            "policy": policy,
+            "params": params,
+            "env": ENV_COSTS,
+            "code": code_fingerprint(),
+            **inputs,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class EvalCache:
+    """
+    Persistent result cache with LRU eviction by total size and entry count.
+
+    Values are JSON-serializable dicts; entries may also carry files, which
+    are copied into the cache directory.
+    """
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entries: int | None = None,
+    ):
+        """
+        Args:
+            root: Cache directory (created if missing)
+            max_bytes: Size budget for values plus files
+            max_entries: Optional cap on the number of entries
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.root / "index.sqlite", timeout=30)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, kind TEXT, code TEXT, value TEXT,"
+                " files TEXT, nbytes INTEGER, last_used REAL)"
+            )
+
+    def close(self):
+        """Close the index."""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get(self, key: str) -> dict | None:
+        """Cached value (and mark it recently used), or None."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: list[str]) -> dict[str, dict]:
+        """Cached values of the keys that are present."""
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = self._db.execute(
+                f"SELECT key, value FROM entries WHERE key IN ({marks})", chunk
+            ).fetchall()
+            found.update((key, json.loads(value)) for key, value in rows)
+        if found:
+            now = time.time()
+            with self._db:
+                self._db.executemany(
+                    "UPDATE entries SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+        self.hits += len(found)
+        self.misses += len(set(keys)) - len(found)
+        return found
+
+    def files(self, key: str) -> dict[str, Path]:
+        """Files stored with an entry, by name (empty if none or missing)."""
+        row = self._db.execute("SELECT files FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] is None:
+            return {}
+        return {name: self.root / rel for name, rel in json.loads(row[0]).items()}
+
+    def put(self, key: str, kind: str, value: dict, files: dict[str, Path] | None = None):
+        """
+        Store a value, with optional files copied into the cache.
+
+        Args:
+            key: Key from cache_key()
+            kind: Entry kind (for stats)
+            value: JSON-serializable result
+            files: Named files to keep with the entry
+        """
+        stored = {}
+        nbytes = 0
+        for name, path in (files or {}).items():
+            rel = Path("files") / key[:2] / f"{key}-{name}{path.suffix}"
+            (self.root / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, self.root / rel)
+            stored[name] = str(rel)
+            nbytes += (self.root / rel).stat().st_size
+        self._insert([(key, kind, value, stored or None, nbytes)])
+
+    def put_many(self, items: list[tuple[str, str, dict]]):
+        """Store many (key, kind, value) entries in one transaction."""
+        self._insert([(key, kind, value, None, 0) for key, kind, value in items])
+
+    def _insert(self, entries: list[tuple[str, str, dict, dict | None, int]]):
+        now = time.time()
+        code = code_fingerprint()
+        rows = []
+        for key, kind, value, files, file_bytes in entries:
+            payload = json.dumps(value)
+            files = json.dumps(files) if files else None
+            rows.append((key, kind, code, payload, files, len(payload) + file_bytes, now))
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until within budget; returns how many."""
+        count, total = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM entries"
+        ).fetchone()
+        if total <= self.max_bytes and (self.max_entries is None or count <= self.max_entries):
+            return 0
+
+        doomed = []
+        rows = self._db.execute("SELECT key, nbytes FROM entries ORDER BY last_used, key")
+        for key, nbytes in rows:
+            if total <= self.max_bytes and (self.max_entries is None or count <= self.max_entries):
+                break
+            doomed.append(key)
+            total -= nbytes
+            count -= 1
+        self._delete(doomed)
+        return len(doomed)
+
+    def prune_stale(self) -> int:
+        """Drop entries written by other versions of the code; returns how many."""
+        rows = self._db.execute(
+            "SELECT key FROM entries WHERE code != ?", (code_fingerprint(),)
+        ).fetchall()
+        self._delete([key for (key,) in rows])
+        return len(rows)
+
+    def clear(self):
+        """Drop every entry."""
+        self._delete([key for (key,) in self._db.execute("SELECT key FROM entries").fetchall()])
+
+    def _delete(self, keys: list[str]):
+        for key in keys:
+            for path in self.files(key).values():
+                path.unlink(missing_ok=True)
+        with self._db:
+            self._db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+
+    def stats(self) -> dict:
+        """Entry counts and sizes, overall and per kind."""
+        code = code_fingerprint()
+        rows = self._db.execute(
+            "SELECT kind, COUNT(*), SUM(nbytes), SUM(code != ?) FROM entries GROUP BY kind",
+            (code,),
+        ).fetchall()
+        kinds = {
+            kind: {"entries": n, "bytes": nbytes, "stale": stale} for kind, n, nbytes, stale in rows
+        }
+        return {
+            "entries": sum(k["entries"] for k in kinds.values()),
+            "bytes": sum(k["bytes"] for k in kinds.values()),
+            "stale": sum(k["stale"] for k in kinds.values()),
+            "kinds": kinds,
+            "code": code,
+        }
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Inspect or clean the evaluation cache")
+    parser.add_argument("--dir", type=Path, default=DEFAULT_CACHE_DIR, help="Cache directory")
+    parser.add_argument("--prune-stale", action="store_true", help="Drop entries of older code")
+    parser.add_argument("--clear", action="store_true", help="Drop every entry")
+    parser.add_argument(
+        "--max-mb", type=float, default=None, help="Evict LRU entries down to this size"
+    )
+    args = parser.parse_args()
+
+    max_bytes = int(args.max_mb * 2**20) if args.max_mb is not None else DEFAULT_MAX_BYTES
+    with EvalCache(args.dir, max_bytes=max_bytes) as cache:
+        if args.clear:
+            cache.clear()
+            print("Cleared the cache")
+        if args.prune_stale:
+            print(f"Dropped {cache.prune_stale()} stale entries")
+        if args.max_mb is not None:
+            print(f"Evicted {cache.evict()} entries")
+
+        stats = cache.stats()
+        print(f"\n{args.dir}: {stats['entries']} entries, {stats['bytes'] / 2**20:.2f} MiB")
+        print(f"Code fingerprint: {stats['code']} ({stats['stale']} stale entries)")
+        for kind, k in sorted(stats["kinds"].items()):
+            print(f"  {kind:<10} {k['entries']:>8} entries {k['bytes'] / 2**20:>9.2f} MiB")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,212 @@
 Trace comparison utility
 
 Reads trace files from both policies and produces side-by-side comparison.
+
+Both traces are streamed in lockstep, one row at a time, so memory stays
+bounded by the number of rows displayed regardless of trace length. Text
+and columnar traces (see trace.py) are both accepted.
+
+compare_many handles any number of policies: several trace files, or one
+combined lockstep trace (see lockstep.py) holding all of them.
+
+A window [start, end) restricts the comparison to those steps. Windows
+seek straight to `start` (text index or columnar block arithmetic), so
+inspecting a window deep into a long trace does not read what precedes it.
 """
 
+import argparse
+import math
+from itertools import tee, zip_longest
 from pathlib import Path
 
+from powell_sdm_lab.trace import (
+    COLUMNS,
+    TRACE_SUFFIXES,
+    format_value,
+    is_columnar,
+    iter_columnar_blocks,
+    iter_text_rows,
+    read_columnar_header,
+)
+
+# Column positions used for the summary
+_COST = 8
+_STOCKOUT = 7
+_INVENTORY_NEXT = 6
+
+_SUMMARY_LINES = {
+    "Total cost:": "cost",
+    "Total stockouts:": "stockouts",
+    "Average inventory:": "inventory",
+}
+
+
+class TraceStream:
+    """
+    Iterate the data rows of a text or columnar trace.
+
+    Yields one tuple of floats per step (columns as in trace.COLUMNS) and
+    keeps running totals as it goes. For text traces, `line` holds the raw
+    text of the row just yielded (None for columnar traces). After
+    exhaustion, `summary` holds total cost, total stockouts and average
+    inventory: taken from the "Total ..." lines of a text trace when
+    present (they are computed from unrounded values), otherwise from the
+    running totals. Windowed streams always use the running totals over
+    the window.
+    """
+
+    def __init__(
+        self, path: Path, start: int = 0, end: int | None = None, policy: str | None = None
+    ):
+        """
+        Args:
+            path: Trace file (text or columnar)
+            start: First step to stream
+            end: Step to stop before (default: end of trace)
+            policy: Policy to stream from a combined lockstep trace (default: the first)
+        """
+        self.path = path
+        self.policy = policy
+        self.start = start
+        self.end = end
+        self.windowed = start > 0 or end is not None
+        self.columnar = is_columnar(path)
+        self.header_lines: list[str] = []
+        self.summary: dict[str, float] = {}
+        self.line: str | None = None
+        # Shared block iterator, set by split_lockstep
+        self._blocks = None
+
+        self._n = 0
+        self._cost = 0.0
+        self._stockouts = 0.0
+        self._inventory = 0.0
+
+    def __iter__(self):
+        rows = self._columnar_rows() if self.columnar else self._text_rows()
+        for row in rows:
+            self._n += 1
+            self._cost += row[_COST]
+            self._stockouts += row[_STOCKOUT]
+            self._inventory += row[_INVENTORY_NEXT]
+            yield row
+
+        computed = {
+            "cost": self._cost,
+            "stockouts": self._stockouts,
+            "inventory": self._inventory / self._n if self._n else 0.0,
+        }
+        if self._n:
+            self.summary = {**computed, **self.summary}
+
+    def _text_rows(self):
+        if self.windowed:
+            with open(self.path) as f:
+                self.header_lines = [f.readline(), f.readline()]
+            for line in iter_text_rows(self.path, self.start, self.end):
+                self.line = line
+                yield tuple(float(v) for v in line.split())
+            return
+
+        with open(self.path) as f:
+            self.header_lines = [f.readline(), f.readline()]
+            in_rows = True
+            for line in f:
+                if in_rows and line.strip():
+                    self.line = line.rstrip()
+                    yield tuple(float(v) for v in line.split())
+                    continue
+                in_rows = False
+                for prefix, key in _SUMMARY_LINES.items():
+                    if line.startswith(prefix):
+                        self.summary[key] = float(line.split(":")[1].strip())
+
+    def _columnar_rows(self):
+        labels = [label for label, _ in COLUMNS]
+        self.header_lines = [
+            "  ".join(f"{h:>8}" for h in labels) + "\n",
+            "-" * (10 * len(labels) + len(labels) - 1) + "\n",
+        ]
+        width = len(COLUMNS)
+        policies = lockstep_policies(self.path) or []
+        first = policies.index(self.policy) * width if self.policy in policies else 0
+        blocks = self._blocks
+        if blocks is None:
+            blocks = iter_columnar_blocks(self.path, self.start, self.end)
+        for _, block in blocks:
+            block = block[first : first + width]
+            # Missing forecasts are NaN in columnar traces, 0 in text traces
+            for row in block.T.tolist():
+                yield tuple(0.0 if math.isnan(v) else v for v in row)
+
+
+def lockstep_policies(path: Path) -> list[str] | None:
+    """Policy names stored in a combined lockstep trace, or None for other traces."""
+    if not is_columnar(path):
+        return None
+    with open(path, "rb") as f:
+        return read_columnar_header(f)["metadata"].get("policies")
+
+
+def split_lockstep(path: Path, start: int = 0, end: int | None = None) -> dict[str, TraceStream]:
+    """
+    One TraceStream per policy of a combined lockstep trace.
+
+    The streams share a single pass over the file: blocks are read and
+    decoded once and handed to every stream (itertools.tee), so iterating
+    them together (as compare_many does) holds about one block in memory.
+
+    Args:
+        path: Combined lockstep trace
+        start: First step to stream
+        end: Step to stop before (default: end of trace)
+
+    Returns:
+        Policy name -> stream, in the trace's policy order
+    """
+    policies = lockstep_policies(path)
+    blocks = tee(iter_columnar_blocks(path, start, end), len(policies))
+    streams = {}
+    for policy, policy_blocks in zip(policies, blocks):
+        stream = TraceStream(path, start, end, policy)
+        stream._blocks = policy_blocks
+        streams[policy] = stream
+    return streams
+
+
+class ColumnDiffs:
+    """Running per-column statistics of (B - A) over rows seen in both traces."""
+
+    def __init__(self, n_columns: int):
+        self.n = 0
+        self.sum = [0.0] * n_columns
+        self.max_abs = [0.0] * n_columns
+
+    def update(self, row_a: tuple, row_b: tuple):
+        """Add one pair of aligned rows."""
+        self.n += 1
+        for i, (a, b) in enumerate(zip(row_a, row_b)):
+            d = b - a
+            self.sum[i] += d
+            if abs(d) > self.max_abs[i]:
+                self.max_abs[i] = abs(d)
+
+    def mean(self, i: int) -> float:
+        """Mean difference of column i."""
+        return self.sum[i] / self.n if self.n else 0.0
+
+
+def format_row(row: tuple) -> str:
+    """Format one row the way TraceWriter writes it."""
+    return "  ".join(format_value(v) for v in row)
+
 
 def compare_traces(
     trace_a: Path,
     trace_b: Path,
     n_steps: int = 10,
+    start: int = 0,
+    end: int | None = None,
 ):
     """
     Compare two trace files side by side.
@@ -18,7 +215,9 @@ def compare_traces(
     Args:
         trace_a: Path to Policy A trace
         trace_b: Path to Policy B trace
-        n_steps: Number of steps to show (default: first 10)
+        n_steps: Number of steps to show (default: first 10 of the window)
+        start: First step of the window
+        end: Step to stop before (default: end of trace)
     """
     if not trace_a.exists():
         print(f"ERROR: {trace_a} not found")
@@ -34,46 +233,45 @@ def compare_traces(
     print("TRACE COMPARISON: Policy A vs Policy B")
     print("=" * 80 + "\n")
 
-    # Read both files
-    with open(trace_a) as f:
-        lines_a = f.readlines()
+    # Single lockstep pass over both traces
+    stream_a = TraceStream(trace_a, start, end)
+    stream_b = TraceStream(trace_b, start, end)
+    diffs = ColumnDiffs(len(COLUMNS))
+    head_a, head_b = [], []
 
-    with open(trace_b) as f:
-        lines_b = f.readlines()
+    for row_a, row_b in zip_longest(stream_a, stream_b):
+        if row_a is not None and len(head_a) < n_steps:
+            head_a.append(stream_a.line or format_row(row_a))
+        if row_b is not None and len(head_b) < n_steps:
+            head_b.append(stream_b.line or format_row(row_b))
+        if row_a is not None and row_b is not None:
+            diffs.update(row_a, row_b)
 
-    # Show first n_steps (skip header lines)
-    print(f"First {n_steps} steps:\n")
+    # Show first n_steps
+    if stream_a.windowed:
+        window = f"{start}-{end - 1}" if end is not None else f"{start}-end"
+        print(f"First {n_steps} steps of window {window}:\n")
+    else:
+        print(f"First {n_steps} steps:\n")
     print("Policy A (constant base-stock):")
-    print("".join(lines_a[:2]))  # Header
-    for line in lines_a[2 : 2 + n_steps]:
-        print(line.rstrip())
+    print("".join(stream_a.header_lines))  # Header
+    for line in head_a:
+        print(line)
 
     print("\n" + "-" * 80 + "\n")
 
     print("Policy B (forecast-driven with learning):")
-    print("".join(lines_b[:2]))  # Header
-    for line in lines_b[2 : 2 + n_steps]:
-        print(line.rstrip())
+    print("".join(stream_b.header_lines))  # Header
+    for line in head_b:
+        print(line)
 
-    # Extract and show summaries
+    # Show summaries
     print("\n" + "=" * 80)
     print("SUMMARY COMPARISON")
     print("=" * 80 + "\n")
 
-    def extract_summary(lines):
-        """Extract summary stats from trace file."""
-        summary = {}
-        for line in lines:
-            if line.startswith("Total cost:"):
-                summary["cost"] = float(line.split(":")[1].strip())
-            elif line.startswith("Total stockouts:"):
-                summary["stockouts"] = float(line.split(":")[1].strip())
-            elif line.startswith("Average inventory:"):
-                summary["inventory"] = float(line.split(":")[1].strip())
-        return summary
-
-    summary_a = extract_summary(lines_a)
-    summary_b = extract_summary(lines_b)
+    summary_a = stream_a.summary
+    summary_b = stream_b.summary
 
     if summary_a and summary_b:
         print(f"{'Metric':<25} {'Policy A':>15} {'Policy B':>15} {'Difference':>15}")
@@ -98,16 +296,145 @@ def compare_traces(
             f"{summary_b['inventory']:>15.2f} {inv_diff:>15.2f}"
         )
 
+    if diffs.n:
+        print(f"\nPer-column differences (B - A) over {diffs.n} aligned steps:\n")
+        print(f"{'Column':<25} {'Mean diff':>15} {'Max |diff|':>15}")
+        print("-" * 57)
+        for i, (label, _) in enumerate(COLUMNS[1:], start=1):
+            print(f"{label:<25} {diffs.mean(i):>15.2f} {diffs.max_abs[i]:>15.2f}")
+
+    print("\n")
+
+
+def compare_many(
+    traces: list[Path],
+    n_steps: int = 10,
+    start: int = 0,
+    end: int | None = None,
+):
+    """
+    Compare any number of policies, streamed together in one pass.
+
+    Each path is a single-policy trace (named by its file stem) or a combined
+    lockstep trace (expanded to its policies, read once). The first policy
+    is the baseline for the difference table. Policy names must be unique
+    across all inputs (ValueError otherwise).
+
+    Args:
+        traces: Trace files (text, columnar or lockstep)
+        n_steps: Number of steps to show per policy (default: first 10 of the window)
+        start: First step of the window
+        end: Step to stop before (default: end of trace)
+    """
+    for path in traces:
+        if not path.exists():
+            print(f"ERROR: {path} not found")
+            return
+
+    streams: dict[str, TraceStream] = {}
+    for path in traces:
+        if lockstep_policies(path) is not None:
+            found = split_lockstep(path, start, end)
+        else:
+            found = {path.stem: TraceStream(path, start, end)}
+        for name, stream in found.items():
+            if name in streams:
+                raise ValueError(f"policy {name!r} appears in more than one trace ({path})")
+            streams[name] = stream
+    names = list(streams)
+
+    print("\n" + "=" * 80)
+    print(f"TRACE COMPARISON: {' vs '.join(names)}")
+    print("=" * 80 + "\n")
+
+    diffs = {name: ColumnDiffs(len(COLUMNS)) for name in names[1:]}
+    heads: dict[str, list[str]] = {name: [] for name in names}
+    for rows in zip_longest(*streams.values()):
+        for name, row in zip(names, rows):
+            if row is not None and len(heads[name]) < n_steps:
+                heads[name].append(streams[name].line or format_row(row))
+        base = rows[0]
+        for name, row in zip(names[1:], rows[1:]):
+            if base is not None and row is not None:
+                diffs[name].update(base, row)
+
+    where = f" from step {start}" if start else ""
+    for name in names:
+        print(f"{name} (first {n_steps} steps{where}):")
+        print("".join(streams[name].header_lines))
+        for line in heads[name]:
+            print(line)
+        print()
+
+    print("=" * 80)
+    print("SUMMARY COMPARISON")
+    print("=" * 80 + "\n")
+    metrics = [
+        ("Total Cost", "cost"),
+        ("Total Stockouts", "stockouts"),
+        ("Average Inventory", "inventory"),
+    ]
+    print(f"{'Metric':<25}" + "".join(f" {name:>15}" for name in names))
+    print("-" * (25 + 16 * len(names)))
+    for label, key in metrics:
+        values = [streams[name].summary.get(key, math.nan) for name in names]
+        print(f"{label:<25}" + "".join(f" {v:>15.2f}" for v in values))
+
+    if len(names) > 1:
+        print(f"\nMean per-step difference vs {names[0]}:\n")
+        print(f"{'Column':<25}" + "".join(f" {name:>15}" for name in names[1:]))
+        print("-" * (25 + 16 * (len(names) - 1)))
+        for i, (label, _) in enumerate(COLUMNS[1:], start=1):
+            print(f"{label:<25}" + "".join(f" {diffs[n].mean(i):>15.2f}" for n in names[1:]))
+
     print("\n")
 
 
+def find_trace(runs_dir: Path, policy: str) -> Path:
+    """Latest trace for a policy, preferring text over columnar when both exist."""
+    for suffix in TRACE_SUFFIXES.values():
+        path = runs_dir / f"policy_{policy}_latest{suffix}"
+        if path.exists():
+            return path
+    return runs_dir / f"policy_{policy}_latest{TRACE_SUFFIXES['text']}"
+
+
 def main():
     """CLI entry point for comparison."""
-    runs_dir = Path(__file__).parent.parent.parent.parent / "runs"
-    trace_a = runs_dir / "policy_a_latest.txt"
-    trace_b = runs_dir / "policy_b_latest.txt"
+    parser = argparse.ArgumentParser(description="Compare two policy trace files")
+    parser.add_argument(
+        "traces",
+        nargs="*",
+        type=Path,
+        help="Trace A and trace B, any number of traces, or one combined lockstep trace",
+    )
+    parser.add_argument("--steps", type=int, default=10, help="Steps to show (default: 10)")
+    parser.add_argument("--start", type=int, default=0, help="First step of the window")
+    parser.add_argument("--end", type=int, default=None, help="Step to stop before")
+    args = parser.parse_args()
+
+    for path in args.traces:
+        if not path.exists():
+            print(f"ERROR: {path} not found")
+            return
+    # Combined traces hold several policies, so only compare_many can expand them
+    lockstep = any(lockstep_policies(path) is not None for path in args.traces)
+    if len(args.traces) == 1 and not lockstep:
+        parser.error("a single trace must be a combined lockstep trace")
+    if lockstep or len(args.traces) > 2:
+        try:
+            compare_many(args.traces, n_steps=args.steps, start=args.start, end=args.end)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+    if args.traces:
+        trace_a, trace_b = args.traces
+    else:
+        runs_dir = Path(__file__).parent.parent.parent.parent / "runs"
+        trace_a = find_trace(runs_dir, "a")
+        trace_b = find_trace(runs_dir, "b")
 
-    compare_traces(trace_a, trace_b, n_steps=10)
+    compare_traces(trace_a, trace_b, n_steps=args.steps, start=args.start, end=args.end)
 
 
 if __name__ == "__main__":
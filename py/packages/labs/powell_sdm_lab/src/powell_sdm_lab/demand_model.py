@@ -3,10 +3,103 @@ Online demand forecasting model
 
 Tiny linear model with features: bias, sin(2πt/7), cos(2πt/7)
 Updates via online SGD after observing each demand realization.
+
+The features repeat every 7 periods, so they are computed once into a
+7-row table and looked up by t mod 7 instead of calling sin/cos per step.
+
+Warm start: instead of burning in from θ = [80, 0, 0], fit_theta() solves
+least squares over a demand history. Because φ(t) depends only on t mod 7,
+the normal equations reduce to per-phase sums of the history: XᵀX is
+Σ_k n_k φ_k φ_kᵀ and Xᵀy is Σ_k S_k φ_k, with S_k the sum of demands in
+phase k. Those sums are strided reductions over rows of the (SKUs × T)
+array, taken a block of rows at a time, so histories of thousands of SKUs,
+including memory-mapped ones, are fitted with one 3×3 solve.
 """
 
 import math
 
+import numpy as np
+
+PERIOD = 7
+
+# φ(t) for t mod 7: [1, sin(2πt/7), cos(2πt/7)]
+FEATURE_TABLE = np.array(
+    [
+        [1.0, math.sin(2 * math.pi * k / PERIOD), math.cos(2 * math.pi * k / PERIOD)]
+        for k in range(PERIOD)
+    ]
+)
+_FEATURE_ROWS = tuple(tuple(row) for row in FEATURE_TABLE.tolist())
+
+INITIAL_THETA = (80.0, 0.0, 0.0)  # Start near expected mean
+
+
+def fit_theta(history, t0: int = 0, chunk_rows: int = 4096) -> np.ndarray:
+    """
+    Least-squares θ for the bias/sin/cos features over a demand history.
+
+    Equal to np.linalg.lstsq on the full (T × 3) design matrix up to
+    rounding, without building it. Histories shorter than three periods
+    give the minimum-norm fit; an empty history gives INITIAL_THETA.
+
+    Args:
+        history: Demands, shape (T,) for one series or (N, T) for N series
+            (arrays or memmaps; read chunk_rows rows at a time)
+        t0: Time index of the first column, on the same clock as the
+            periods the model will predict (e.g. -T for the T periods
+            just before period 0)
+        chunk_rows: Rows reduced per block
+
+    Returns:
+        θ of shape (3,) for one series, (3, N) for N series
+    """
+    y = np.asarray(history)
+    single = y.ndim == 1
+    if single:
+        y = y[None, :]
+    n_series, T = y.shape
+    if T == 0:
+        theta = np.repeat(np.array(INITIAL_THETA)[:, None], n_series, axis=1)
+        return theta[:, 0] if single else theta
+
+    # Column offset of the first period in each phase k, and the period counts
+    offsets = [(k - t0) % PERIOD for k in range(PERIOD)]
+    counts = np.array([len(range(i, T, PERIOD)) for i in offsets], dtype=np.float64)
+
+    sums = np.empty((n_series, PERIOD))
+    for start in range(0, n_series, chunk_rows):
+        block = y[start : start + chunk_rows]
+        for k, i in enumerate(offsets):
+            sums[start : start + chunk_rows, k] = block[:, i::PERIOD].sum(axis=1, dtype=np.float64)
+
+    gram = (FEATURE_TABLE.T * counts) @ FEATURE_TABLE
+    theta = np.linalg.lstsq(gram, FEATURE_TABLE.T @ sums.T, rcond=None)[0]
+    return theta[:, 0] if single else theta
+
+
+def fit_models(
+    history, t0: int = 0, learning_rate: float = 0.05, chunk_rows: int = 4096
+) -> list["OnlineDemandModel"]:
+    """
+    Warm-started OnlineDemandModels for many series in one vectorized fit.
+
+    Args:
+        history: Demands, shape (N, T), one row per SKU (arrays or memmaps)
+        t0: Time index of the first column
+        learning_rate: Step size for the models' online updates
+        chunk_rows: Rows reduced per block
+
+    Returns:
+        N models, ready to continue with update()
+    """
+    theta = fit_theta(history, t0, chunk_rows)
+    models = []
+    for column in theta.T.tolist():
+        model = OnlineDemandModel(learning_rate=learning_rate)
+        model.theta = column
+        models.append(model)
+    return models
+
 
 class OnlineDemandModel:
     """
@@ -26,16 +119,30 @@ class OnlineDemandModel:
         Args:
             learning_rate: Step size for SGD updates
         """
-        self.theta = [80.0, 0.0, 0.0]  # Start near expected mean
+        self.theta = list(INITIAL_THETA)
         self.alpha = learning_rate
 
-    def _features(self, t: int) -> list[float]:
+    @classmethod
+    def from_history(cls, history, t0: int = 0, learning_rate: float = 0.05) -> "OnlineDemandModel":
+        """
+        Model warm-started with the least-squares θ of a demand history.
+
+        Args:
+            history: Demands, shape (T,)
+            t0: Time index of the first value (e.g. -T for the T periods
+                just before period 0)
+            learning_rate: Step size for subsequent online updates
+
+        Returns:
+            Model ready to continue with update()
+        """
+        model = cls(learning_rate=learning_rate)
+        model.theta = fit_theta(np.asarray(history).ravel(), t0).tolist()
+        return model
+
+    def _features(self, t: int) -> tuple[float, float, float]:
         """Extract features for time t."""
-        return [
-            1.0,  # bias
-            math.sin(2 * math.pi * t / 7),
-            math.cos(2 * math.pi * t / 7),
-        ]
+        return _FEATURE_ROWS[t % PERIOD]
 
     def predict(self, t: int) -> float:
         """
@@ -48,7 +155,8 @@ class OnlineDemandModel:
             Predicted demand
         """
         phi = self._features(t)
-        return sum(w * f for w, f in zip(self.theta, phi))
+        theta = self.theta
+        return theta[0] * phi[0] + theta[1] * phi[1] + theta[2] * phi[2]
 
     def update(self, t: int, y_obs: float) -> float:
         """
@@ -62,11 +170,150 @@ class OnlineDemandModel:
             Prediction error (y_obs - prediction)
         """
         phi = self._features(t)
-        y_hat = self.predict(t)
+        theta = self.theta
+        y_hat = theta[0] * phi[0] + theta[1] * phi[1] + theta[2] * phi[2]
         error = y_obs - y_hat
 
         # SGD update
-        for i in range(len(self.theta)):
-            self.theta[i] += self.alpha * error * phi[i]
+        for i in range(len(theta)):
+            theta[i] += self.alpha * error * phi[i]
+
+        return error
+
+    def predict_batch(self, ts) -> np.ndarray:
+        """
+        Forecast demand for many time indices with the current weights.
+
+        Args:
+            ts: Array of time indices
+
+        Returns:
+            Array of predictions, same shape as ts (equal to predict(t) elementwise)
+        """
+        phi = FEATURE_TABLE[np.asarray(ts) % PERIOD]
+        theta = self.theta
+        return theta[0] * phi[..., 0] + theta[1] * phi[..., 1] + theta[2] * phi[..., 2]
+
+    def update_batch(self, ts, ys) -> np.ndarray:
+        """
+        Apply SGD updates for a sequence of observations, in order.
+
+        Same result as calling update(t, y) for each pair; the features are
+        looked up in one vectorized step first.
+
+        Args:
+            ts: Array of time indices
+            ys: Array of observed demands
+
+        Returns:
+            Array of prediction errors, one per observation
+        """
+        phis = FEATURE_TABLE[np.asarray(ts) % PERIOD].tolist()
+        ys = np.asarray(ys, dtype=np.float64).tolist()
+        errors = []
+        theta, alpha = self.theta, self.alpha
+        for (f0, f1, f2), y in zip(phis, ys):
+            error = y - (theta[0] * f0 + theta[1] * f1 + theta[2] * f2)
+            theta[0] += alpha * error * f0
+            theta[1] += alpha * error * f1
+            theta[2] += alpha * error * f2
+            errors.append(error)
+        return np.array(errors)
+
+    def get_state(self) -> dict:
+        """Weights and learning rate as a JSON-serializable dict."""
+        return {"theta": list(self.theta), "learning_rate": self.alpha}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "OnlineDemandModel":
+        """Rebuild a model from get_state() output."""
+        model = cls(learning_rate=state["learning_rate"])
+        model.theta = list(state["theta"])
+        return model
+
+
+class BatchOnlineDemandModel:
+    """
+    N independent OnlineDemandModels stepped together.
+
+    Weights are held as a (3, N) array, one column per stream. Each stream
+    follows exactly the same arithmetic as OnlineDemandModel, so its
+    predictions and weights are bit-identical to a scalar model fed the same
+    observations.
+    """
+
+    def __init__(self, n_streams: int, learning_rate: float = 0.05, theta=None):
+        """
+        Initialize N models with the scalar model's starting weights.
+
+        Args:
+            n_streams: Number of independent streams N
+            learning_rate: Step size for SGD updates
+            theta: Starting weights, shared (3,) or per stream (3, N)
+                (default: INITIAL_THETA)
+        """
+        self.theta = np.empty((3, n_streams))
+        start = np.asarray(INITIAL_THETA if theta is None else theta, dtype=np.float64)
+        self.theta[:] = start[:, None] if start.ndim == 1 else start
+        self.alpha = learning_rate
+
+    @classmethod
+    def from_history(
+        cls, history, t0: int = 0, learning_rate: float = 0.05, chunk_rows: int = 4096
+    ) -> "BatchOnlineDemandModel":
+        """
+        N models warm-started from per-stream histories in one fit.
+
+        Args:
+            history: Demands, shape (N, T) (arrays or memmaps)
+            t0: Time index of the first column
+            learning_rate: Step size for subsequent online updates
+            chunk_rows: Rows reduced per block
+
+        Returns:
+            Batch model with stream i's θ fitted to row i
+        """
+        theta = fit_theta(history, t0, chunk_rows)
+        return cls(theta.shape[1], learning_rate=learning_rate, theta=theta)
+
+    @property
+    def n_streams(self) -> int:
+        """Number of streams N."""
+        return self.theta.shape[1]
+
+    def predict(self, t) -> np.ndarray:
+        """
+        Forecast demand for every stream.
+
+        Args:
+            t: Time index, shared (int) or per stream (array of shape (N,))
+
+        Returns:
+            Array of shape (N,)
+        """
+        phi = FEATURE_TABLE[np.asarray(t) % PERIOD].T
+        theta = self.theta
+        return theta[0] * phi[0] + theta[1] * phi[1] + theta[2] * phi[2]
+
+    def update(self, t, y_obs) -> np.ndarray:
+        """
+        Update every stream after observing its demand.
+
+        Args:
+            t: Time index, shared (int) or per stream (array of shape (N,))
+            y_obs: Observed demands, shape (N,)
+
+        Returns:
+            Prediction errors, shape (N,)
+        """
+        phi = FEATURE_TABLE[np.asarray(t) % PERIOD].T
+        theta = self.theta
+        error = y_obs - (theta[0] * phi[0] + theta[1] * phi[1] + theta[2] * phi[2])
+
+        # SGD update
+        step = self.alpha * error
+        theta[0] += step * phi[0]
+        theta[1] += step * phi[1]
+        theta[2] += step * phi[2]
 
         return error
@@ -1,12 +1,226 @@
 """
 Demand process generator
 
-Produces deterministic demand sequence with sinusoidal pattern + noise.
-Ensures both policies see the same realized demand for fair comparison.
+Produces deterministic demand sequences with sinusoidal pattern + noise.
+Ensures all policies see the same realized demand for fair comparison.
+
+Randomness comes from numpy.random.Generator instances derived from a
+SeedSequence, never from the global `random` module. Each scenario gets its
+own child stream, so scenario i is identical whether 1 or 10,000 scenarios
+are generated, and worker processes can be handed independent streams.
 """
 
-import math
-import random
+from dataclasses import dataclass
+
+import numpy as np
+
+SeedLike = int | np.random.SeedSequence
+
+# Child index of the history stream; scenario indices never reach it
+HISTORY_STREAM = 2**32 - 1
+
+
+def as_seed_sequence(seed: SeedLike) -> np.random.SeedSequence:
+    """Wrap an integer seed in a SeedSequence (SeedSequences pass through)."""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def spawn_seeds(seed: SeedLike, n: int, start: int = 0) -> list[np.random.SeedSequence]:
+    """
+    Derive n independent child seed sequences.
+
+    Children are deterministic in (seed, index), so the same index always
+    gets the same stream. Use this to hand out per-scenario or per-worker
+    streams.
+
+    Args:
+        seed: Root seed
+        n: Number of children
+        start: Index of the first child (to draw a slice of a larger set)
+
+    Returns:
+        List of n child SeedSequences (indices start .. start+n-1)
+    """
+    root = as_seed_sequence(seed)
+    # Build children explicitly rather than with root.spawn(), which is
+    # stateful and would hand out different children on a second call.
+    return [
+        np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (i,))
+        for i in range(start, start + n)
+    ]
+
+
+@dataclass(frozen=True)
+class DemandProcess:
+    """
+    Demand with weekly seasonality.
+
+    Model: D_t = base + amplitude*sin(2πt/period) + ε_t
+    where ε_t ~ Normal(0, noise_std), truncated at zero.
+    """
+
+    base: float = 80.0
+    amplitude: float = 20.0
+    period: int = 7
+    noise_std: float = 10.0
+
+    def mean(self, T: int, t0: int = 0) -> np.ndarray:
+        """Deterministic (noise-free) part of demand for t0 .. t0+T-1."""
+        t = np.arange(t0, t0 + T)
+        return self.base + self.amplitude * np.sin(2 * np.pi * t / self.period)
+
+    def noise(
+        self, n_scenarios: int, T: int, seed: SeedLike, first_scenario: int = 0
+    ) -> np.ndarray:
+        """
+        Standard-normal noise matrix, one child stream per scenario.
+
+        The loop over scenarios is deliberate: numpy has no single call that
+        fills rows from different generators, and drawing the whole block
+        from one stream would make row i depend on N, T and first_scenario.
+        Per-scenario streams keep row i fixed for every slice, let
+        DemandStream reproduce it without knowing T, and keep cached and
+        stored scenarios valid. Each row is still one vectorized draw of T
+        values; the per-row overhead is creating its generator (~30 µs).
+
+        Args:
+            n_scenarios: Number of scenarios N
+            T: Number of time periods
+            seed: Root seed
+            first_scenario: Index of the first scenario row to draw
+
+        Returns:
+            Array of shape (N, T)
+        """
+        z = np.empty((n_scenarios, T))
+        for i, child in enumerate(spawn_seeds(seed, n_scenarios, start=first_scenario)):
+            np.random.default_rng(child).standard_normal(out=z[i])
+        return z
+
+    def sample(
+        self, n_scenarios: int, T: int, seed: SeedLike, first_scenario: int = 0
+    ) -> np.ndarray:
+        """
+        Generate an (N scenarios × T) demand matrix.
+
+        Rows first_scenario .. first_scenario+N-1 of the full matrix for this
+        seed, so large matrices can be produced in independent slices.
+
+        Args:
+            n_scenarios: Number of scenarios N
+            T: Number of time periods
+            seed: Root seed (int or SeedSequence)
+            first_scenario: Index of the first scenario row to draw
+
+        Returns:
+            Array of shape (N, T) with non-negative demands
+        """
+        return self._from_noise(self.noise(n_scenarios, T, seed, first_scenario))
+
+    def sample_antithetic(
+        self, n_pairs: int, T: int, seed: SeedLike, first_pair: int = 0
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Generate antithetic pairs of demand paths.
+
+        The first matrix is exactly sample(n_pairs, T, seed, first_pair); the
+        second uses the same noise with its sign flipped, so each pair is
+        negatively correlated around the seasonal mean.
+
+        Args:
+            n_pairs: Number of pairs N
+            T: Number of time periods
+            seed: Root seed (int or SeedSequence)
+            first_pair: Index of the first scenario row to draw
+
+        Returns:
+            (demands, mirrored demands), each of shape (N, T)
+        """
+        z = self.noise(n_pairs, T, seed, first_pair)
+        return self._from_noise(z.copy()), self._from_noise(np.negative(z, out=z))
+
+    def history(self, T: int, seed: SeedLike) -> np.ndarray:
+        """
+        Demand for the T periods before period 0 (t = -T .. -1).
+
+        Drawn from a child stream of its own, independent of every scenario,
+        for warm-starting demand models on "past" data.
+
+        Returns:
+            Array of shape (T,) with non-negative demands
+        """
+        z = np.random.default_rng(spawn_seeds(seed, 1, start=HISTORY_STREAM)[0]).standard_normal(T)
+        z *= self.noise_std
+        z += self.mean(T, t0=-T)
+        return np.maximum(z, 0.0, out=z)
+
+    def _from_noise(self, z: np.ndarray) -> np.ndarray:
+        """Turn a standard-normal matrix into demands, in place."""
+        z *= self.noise_std
+        z += self.mean(z.shape[1])
+        np.maximum(z, 0.0, out=z)  # Demand cannot be negative
+        return z
+
+
+class DemandStream:
+    """
+    One scenario's demand, drawn a period at a time from a resumable RNG.
+
+    Produces exactly the values of row `scenario` of DemandProcess.sample()
+    for the same seed, but without fixing T up front, and its generator
+    state can be saved and restored to continue the sequence elsewhere.
+    """
+
+    def __init__(self, seed: SeedLike, process: DemandProcess | None = None, scenario: int = 0):
+        """
+        Args:
+            seed: Root seed
+            process: Demand process (default: DemandProcess())
+            scenario: Scenario row to reproduce
+        """
+        self.process = process or DemandProcess()
+        self.rng = np.random.default_rng(spawn_seeds(seed, 1, start=scenario)[0])
+
+    def next(self, t: int) -> float:
+        """
+        Draw the demand for period t.
+
+        Periods must be requested in order; each call consumes one draw.
+        """
+        z = self.rng.standard_normal() * self.process.noise_std
+        return max(float(z + self.process.mean(1, t)[0]), 0.0)
+
+    def get_state(self) -> dict:
+        """Generator state as a JSON-serializable dict."""
+        return self.rng.bit_generator.state
+
+    def set_state(self, state: dict):
+        """Restore a generator state from get_state()."""
+        self.rng.bit_generator.state = state
+
+
+def generate_demand_matrix(
+    n_scenarios: int,
+    T: int,
+    seed: SeedLike,
+    process: DemandProcess | None = None,
+) -> np.ndarray:
+    """
+    Generate an (N scenarios × T) demand matrix.
+
+    Args:
+        n_scenarios: Number of scenarios N
+        T: Number of time periods
+        seed: Root seed (int or SeedSequence)
+        process: Demand process (default: DemandProcess())
+
+    Returns:
+        Array of shape (N, T)
+    """
+    process = process or DemandProcess()
+    return process.sample(n_scenarios, T, seed)
 
 
 def generate_demands(T: int, seed: int) -> list[float]:
@@ -16,6 +230,9 @@ def generate_demands(T: int, seed: int) -> list[float]:
     Model: D_t = 80 + 20*sin(2πt/7) + ε_t
     where ε_t ~ Normal(0, 10)
 
+    Thin wrapper over generate_demand_matrix: returns scenario 0 of the
+    matrix for the same seed.
+
     Args:
         T: Number of time periods
         seed: Random seed for reproducibility
@@ -23,16 +240,4 @@ def generate_demands(T: int, seed: int) -> list[float]:
     Returns:
         List of demand values (length T)
     """
-    random.seed(seed)
-    demands = []
-
-    for t in range(T):
-        # Base demand with weekly cycle
-        base = 80.0
-        seasonal = 20.0 * math.sin(2 * math.pi * t / 7)
-        noise = random.gauss(0, 10)
-
-        demand = base + seasonal + noise
-        demands.append(max(0, demand))  # Demand cannot be negative
-
-    return demands
+    return generate_demand_matrix(1, T, seed)[0].tolist()
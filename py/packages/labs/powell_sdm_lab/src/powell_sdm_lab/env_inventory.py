@@ -5,10 +5,12 @@ Encodes system dynamics and cost structure.
 Implements the state transition: S_t → x_t → S^x_t → W → S_{t+1}
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class StepRecord:
     """Complete record of one time step through Powell's loop."""
 
@@ -111,3 +113,366 @@ class InventoryEnv:
         """Reset environment to initial state."""
         self.inventory = initial_inventory
         self.t = 0
+
+    def get_state(self) -> dict:
+        """Inventory, clock and cost parameters as a JSON-serializable dict."""
+        return {
+            "inventory": self.inventory,
+            "t": self.t,
+            "ordering_cost": self.c,
+            "holding_cost": self.h,
+            "penalty_cost": self.p,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "InventoryEnv":
+        """Rebuild an environment from get_state() output."""
+        env = cls(
+            state["inventory"],
+            ordering_cost=state["ordering_cost"],
+            holding_cost=state["holding_cost"],
+            penalty_cost=state["penalty_cost"],
+        )
+        env.t = state["t"]
+        return env
+
+
+class StepRecordBuffer:
+    """
+    Struct-of-arrays storage for a run's StepRecords.
+
+    Each field lives in one row of a preallocated float64 array that grows
+    by doubling, so appending a step copies nine floats instead of keeping
+    a Python object alive. Indexing returns a StepRecord view; column()
+    returns a NumPy view for summaries, comparisons and plots.
+    """
+
+    FIELDS = tuple(f.name for f in fields(StepRecord))
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize buffer.
+
+        Args:
+            capacity: Initial number of steps to preallocate
+        """
+        self._data = np.empty((len(self.FIELDS), max(1, capacity)))
+        self._n = 0
+
+    def append(self, record: StepRecord):
+        """Store one step."""
+        if self._n == self._data.shape[1]:
+            self._data = np.concatenate([self._data, np.empty_like(self._data)], axis=1)
+        self._data[:, self._n] = (
+            record.t,
+            record.inventory_pre,
+            record.order_qty,
+            record.inventory_post,
+            record.demand,
+            record.sales,
+            record.inventory_next,
+            record.stockout,
+            record.cost,
+        )
+        self._n += 1
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i: int) -> StepRecord:
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(f"step {i} out of range for buffer of {self._n}")
+        t, *values = self._data[:, i].tolist()
+        return StepRecord(int(t), *values)
+
+    def __iter__(self):
+        for t, *values in self._data[:, : self._n].T.tolist():
+            yield StepRecord(int(t), *values)
+
+    def column(self, name: str) -> np.ndarray:
+        """View of one field over all stored steps."""
+        return self._data[self.FIELDS.index(name), : self._n]
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Views of every field, keyed by StepRecord field name."""
+        return {name: self._data[i, : self._n] for i, name in enumerate(self.FIELDS)}
+
+
+@dataclass
+class BatchStepRecord:
+    """One time step through Powell's loop for N scenarios at once (one array per field)."""
+
+    t: int
+    inventory_pre: np.ndarray
+    order_qty: np.ndarray
+    inventory_post: np.ndarray
+    demand: np.ndarray
+    sales: np.ndarray
+    inventory_next: np.ndarray
+    stockout: np.ndarray
+    cost: np.ndarray
+
+
+def transition_arrays(inventory_pre, order_qty, demand, c, h, p, out=None) -> tuple:
+    """
+    InventoryEnv.step's transition and cost, elementwise over arrays.
+
+    The one vectorized copy of the dynamics, used by BatchInventoryEnv and
+    MultiItemInventoryEnv. Operations run in the scalar env's order, so
+    every entry is bit-identical to a scalar step.
+
+    Args:
+        inventory_pre: Pre-decision inventory
+        order_qty: Decisions, same shape
+        demand: Realized demands, same shape
+        c, h, p: Ordering, holding and penalty costs (scalars or per item)
+        out: Optional buffers (post, sales, stockout, next, cost, scratch)
+            to write into instead of allocating
+
+    Returns:
+        (inventory_post, sales, stockout, inventory_next, cost)
+    """
+    if out is None:
+        out = tuple(np.empty_like(inventory_pre) for _ in range(6))
+    post, sales, stockout, inventory_next, cost, scratch = out
+
+    # Post-decision state (after ordering)
+    np.add(inventory_pre, order_qty, out=post)
+
+    # Transition (after demand realization)
+    np.minimum(post, demand, out=sales)
+    np.subtract(demand, post, out=stockout)
+    np.maximum(stockout, 0.0, out=stockout)
+    np.subtract(post, sales, out=inventory_next)
+
+    # Cost: c*q + h*I_next + p*stockout, summed in that order
+    np.multiply(c, order_qty, out=cost)
+    np.multiply(h, inventory_next, out=scratch)
+    cost += scratch
+    np.multiply(p, stockout, out=scratch)
+    cost += scratch
+    return post, sales, stockout, inventory_next, cost
+
+
+class BatchInventoryEnv:
+    """
+    N independent copies of InventoryEnv stepped together.
+
+    Holds one inventory level per scenario as a float64 array and applies
+    exactly the same dynamics and cost math as InventoryEnv, elementwise.
+    Running totals are accumulated one period at a time (not with a
+    pairwise np.sum over time), so totals are bit-identical to summing the
+    scalar env's records in order.
+    """
+
+    def __init__(
+        self,
+        initial_inventory,
+        n_scenarios: int | None = None,
+        ordering_cost: float = 0.2,
+        holding_cost: float = 0.05,
+        penalty_cost: float = 1.0,
+    ):
+        """
+        Initialize environment.
+
+        Args:
+            initial_inventory: Starting inventory, scalar or array of shape (N,)
+            n_scenarios: Number of scenarios N (required if initial_inventory is scalar)
+            ordering_cost: Per-unit ordering cost
+            holding_cost: Per-unit holding cost per period
+            penalty_cost: Per-unit stockout penalty
+        """
+        self.c = ordering_cost
+        self.h = holding_cost
+        self.p = penalty_cost
+
+        self.reset(initial_inventory, n_scenarios)
+
+    @property
+    def n_scenarios(self) -> int:
+        """Number of scenarios being stepped."""
+        return self.inventory.shape[0]
+
+    def step(self, order_qty, demand) -> BatchStepRecord:
+        """
+        Execute one time step for every scenario.
+
+        Args:
+            order_qty: Decisions, scalar or array of shape (N,)
+            demand: Realized demands, scalar or array of shape (N,)
+
+        Returns:
+            Record of the step with one array entry per scenario
+        """
+        n = self.n_scenarios
+        order_qty = np.broadcast_to(np.asarray(order_qty, dtype=np.float64), (n,))
+        demand = np.broadcast_to(np.asarray(demand, dtype=np.float64), (n,))
+
+        # Pre-decision state
+        inventory_pre = self.inventory
+
+        inventory_post, sales, stockout, inventory_next, cost = transition_arrays(
+            inventory_pre, order_qty, demand, self.c, self.h, self.p
+        )
+
+        # Running totals, accumulated period by period
+        self.total_cost += cost
+        self.total_stockout += stockout
+        self.total_inventory += inventory_next
+
+        # Update state
+        self.inventory = inventory_next
+        self.t += 1
+
+        return BatchStepRecord(
+            t=self.t - 1,
+            inventory_pre=inventory_pre,
+            order_qty=order_qty,
+            inventory_post=inventory_post,
+            demand=demand,
+            sales=sales,
+            inventory_next=inventory_next,
+            stockout=stockout,
+            cost=cost,
+        )
+
+    def average_inventory(self) -> np.ndarray:
+        """Average end-of-period inventory per scenario so far."""
+        return self.total_inventory / self.t
+
+    def reset(self, initial_inventory, n_scenarios: int | None = None):
+        """Reset environment to initial state."""
+        inventory = np.asarray(initial_inventory, dtype=np.float64)
+        if inventory.ndim == 0:
+            if n_scenarios is None:
+                raise ValueError("n_scenarios is required with a scalar initial_inventory")
+            inventory = np.full(n_scenarios, float(inventory))
+        elif n_scenarios is not None and inventory.shape != (n_scenarios,):
+            raise ValueError(
+                f"initial_inventory has shape {inventory.shape}, expected ({n_scenarios},)"
+            )
+
+        self.inventory = inventory.copy()
+        self.t = 0
+
+        self.total_cost = np.zeros_like(self.inventory)
+        self.total_stockout = np.zeros_like(self.inventory)
+        self.total_inventory = np.zeros_like(self.inventory)
+
+
+class MultiItemInventoryEnv:
+    """
+    Many products (SKUs, optionally across locations) stepped together.
+
+    State, per-item cost parameters and demands are contiguous float64
+    arrays of one shape, e.g. (n_items,) or (n_locations, n_items). Cost
+    parameters may be scalars or arrays that broadcast to that shape.
+
+    Each step is a fixed number of in-place NumPy operations on
+    preallocated buffers, so Python overhead per period does not grow with
+    the number of items. The arrays in the returned record are those
+    buffers: they are overwritten by the next step, so copy anything that
+    must outlive it.
+    """
+
+    def __init__(
+        self,
+        initial_inventory,
+        shape: tuple[int, ...] | None = None,
+        ordering_cost=0.2,
+        holding_cost=0.05,
+        penalty_cost=1.0,
+    ):
+        """
+        Initialize environment.
+
+        Args:
+            initial_inventory: Starting inventory, scalar or array
+            shape: Item array shape (default: shape of initial_inventory)
+            ordering_cost: Per-unit ordering cost, scalar or per item
+            holding_cost: Per-unit holding cost per period, scalar or per item
+            penalty_cost: Per-unit stockout penalty, scalar or per item
+        """
+        initial_inventory = np.asarray(initial_inventory, dtype=np.float64)
+        self.shape = tuple(shape) if shape is not None else initial_inventory.shape
+
+        self.c = np.broadcast_to(np.asarray(ordering_cost, dtype=np.float64), self.shape)
+        self.h = np.broadcast_to(np.asarray(holding_cost, dtype=np.float64), self.shape)
+        self.p = np.broadcast_to(np.asarray(penalty_cost, dtype=np.float64), self.shape)
+
+        # Two inventory buffers swapped each step (pre-decision / next)
+        self._inventory = [np.empty(self.shape), np.empty(self.shape)]
+        self._order = np.empty(self.shape)
+        self._demand = np.empty(self.shape)
+        self._post = np.empty(self.shape)
+        self._sales = np.empty(self.shape)
+        self._stockout = np.empty(self.shape)
+        self._cost = np.empty(self.shape)
+        self._scratch = np.empty(self.shape)
+
+        self.reset(initial_inventory)
+
+    @property
+    def inventory(self) -> np.ndarray:
+        """Current (pre-decision) inventory per item."""
+        return self._inventory[self._current]
+
+    def step(self, order_qty, demand) -> BatchStepRecord:
+        """
+        Execute one time step for every item.
+
+        Args:
+            order_qty: Decisions, scalar or array broadcastable to the item shape
+            demand: Realized demands, scalar or array broadcastable to the item shape
+
+        Returns:
+            Record of the step, one array entry per item (buffers reused next step)
+        """
+        inventory_pre = self._inventory[self._current]
+        inventory_next = self._inventory[1 - self._current]
+        order, post, sales = self._order, self._post, self._sales
+        stockout, cost = self._stockout, self._cost
+
+        np.copyto(order, order_qty)
+        np.copyto(self._demand, demand)
+
+        buffers = (post, sales, stockout, inventory_next, cost, self._scratch)
+        transition_arrays(inventory_pre, order, self._demand, self.c, self.h, self.p, buffers)
+
+        # Running totals
+        self.total_cost += cost
+        self.total_stockout += stockout
+        self.total_inventory += inventory_next
+
+        # Update state
+        self._current = 1 - self._current
+        self.t += 1
+
+        return BatchStepRecord(
+            t=self.t - 1,
+            inventory_pre=inventory_pre,
+            order_qty=order,
+            inventory_post=post,
+            demand=self._demand,
+            sales=sales,
+            inventory_next=inventory_next,
+            stockout=stockout,
+            cost=cost,
+        )
+
+    def average_inventory(self) -> np.ndarray:
+        """Average end-of-period inventory per item so far."""
+        return self.total_inventory / self.t
+
+    def reset(self, initial_inventory):
+        """Reset environment to initial state."""
+        self._current = 0
+        np.copyto(self._inventory[0], initial_inventory)
+        self.t = 0
+
+        self.total_cost = np.zeros(self.shape)
+        self.total_stockout = np.zeros(self.shape)
+        self.total_inventory = np.zeros(self.shape)
@@ -0,0 +1,615 @@
+"""
+Multi-seed policy evaluation
+
+Runs every policy on many demand seeds in a process pool and aggregates
+total cost, stockouts and average inventory into mean / stdev / confidence
+interval rows.
+
+Job j always uses scenario j of the root seed (see demand_process), so every
+policy sees the same demand paths and results do not depend on worker count
+or scheduling. Scenario 0 is the sequence main.py uses for the same --seed.
+With a scenario store (see scenario_store) jobs read their rows from the
+memory-mapped bank instead; each worker maps the file itself.
+
+Given an EvalCache, per-scenario metrics are looked up before any job is
+dispatched, so rerunning with more seeds only simulates the new scenarios.
+"""
+
+import argparse
+import math
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from powell_sdm_lab.cache import DEFAULT_CACHE_DIR, EvalCache, cache_key, demand_identity
+from powell_sdm_lab.demand_process import DemandProcess
+from powell_sdm_lab.env_inventory import BatchInventoryEnv, InventoryEnv
+from powell_sdm_lab.policies import BatchPolicy, LookaheadPolicy, PolicyA, PolicyB
+from powell_sdm_lab.profiling import Profiler, clock, merge_reports, write_report
+from powell_sdm_lab.scenario_store import open_store
+from powell_sdm_lab.stats import RunSummary
+from powell_sdm_lab.trace import TraceWriter, write_summary
+
+POLICY_CLASSES = {
+    "a": PolicyA,
+    "b": PolicyB,
+    "c": LookaheadPolicy,
+}
+
+METRICS = ("total_cost", "total_stockouts", "avg_inventory")
+
+
+@dataclass(frozen=True)
+class PolicySpec:
+    """Picklable description of a policy: a name, a kind and constructor params."""
+
+    name: str
+    kind: str
+    params: dict = field(default_factory=dict)
+
+    def build(self):
+        """Construct a fresh policy instance."""
+        return POLICY_CLASSES[self.kind](**self.params)
+
+
+# Same parameters main.py uses (pedagogical, not optimal)
+DEFAULT_SPECS = {
+    "a": PolicySpec("a", "a", {"target_stock": 90.0}),
+    "b": PolicySpec("b", "b", {"safety_stock": 10.0, "learning_rate": 0.05}),
+    "c": PolicySpec("c", "c", {"safety_stock": 10.0, "horizon": 7, "n_futures": 64}),
+}
+
+
+@dataclass(frozen=True)
+class EvalJob:
+    """One policy on a block of consecutive demand scenarios."""
+
+    spec: PolicySpec
+    scenario: int
+    seed: int
+    T: int
+    initial_inventory: float
+    trace_dir: Path | None = None
+    n_scenarios: int = 1
+    batch: bool = False
+    profile: bool = False
+    store: Path | None = None
+
+
+@dataclass
+class JobResult:
+    """Summary metrics of one job."""
+
+    policy: str
+    scenario: int
+    total_cost: float
+    total_stockouts: float
+    avg_inventory: float
+    profile: dict | None = field(default=None, compare=False, repr=False)
+
+
+@dataclass
+class MetricSummary:
+    """Mean, sample standard deviation and confidence interval of one metric."""
+
+    mean: float
+    stdev: float
+    ci_low: float
+    ci_high: float
+
+
+@dataclass
+class PolicyEvaluation:
+    """Aggregated results of one policy across all scenarios."""
+
+    policy: str
+    n: int
+    metrics: dict[str, MetricSummary]
+
+
+def simulate(
+    policy,
+    demands,
+    initial_inventory: float,
+    trace_path: Path | None = None,
+    policy_name: str = "",
+    profiler: Profiler | None = None,
+) -> dict:
+    """
+    Run one policy through the SDM loop without console output.
+
+    Args:
+        policy: Policy instance
+        demands: Demand sequence
+        initial_inventory: Starting inventory level
+        trace_path: Optional trace file to write
+        policy_name: Display name for the trace summary
+        profiler: If given, time the decide, env_step, learn, summary and
+            trace_write phases
+
+    Returns:
+        Dict with total_cost, total_stockouts and avg_inventory
+    """
+    env = InventoryEnv(initial_inventory=initial_inventory)
+    summary = RunSummary()
+
+    p = profiler
+    # Per-seed traces are short; tools build an index on demand if needed
+    with (
+        p or nullcontext(),
+        TraceWriter(trace_path, index=False) if trace_path else nullcontext() as trace,
+    ):
+        for t, demand in enumerate(demands):
+            if p:
+                t0 = clock()
+            order_qty = policy.decide(env.inventory, t)
+            if p:
+                t1 = clock()
+                p.add("decide", t1 - t0)
+            record = env.step(order_qty, demand)
+            if p:
+                t0 = clock()
+                p.add("env_step", t0 - t1)
+            policy.learn(t, demand)
+            if p:
+                t1 = clock()
+                p.add("learn", t1 - t0)
+            summary.update(record)
+            if p:
+                t0 = clock()
+                p.add("summary", t0 - t1)
+
+            if trace is not None:
+                trace.write_step(
+                    record, policy.get_forecast(t), policy.get_forecast_error(t, demand)
+                )
+                if p:
+                    p.add("trace_write", clock() - t0)
+            if p:
+                p.step()
+
+    if trace_path is not None:
+        write_summary(trace_path, summary, policy_name or type(policy).__name__)
+
+    return summary.metrics()
+
+
+def simulate_batch(
+    policy, demands: np.ndarray, initial_inventory: float, profiler: Profiler | None = None
+) -> dict:
+    """
+    Run a BatchPolicy on N scenarios at once, with no loop over scenarios.
+
+    Per-scenario results are identical to running simulate() on each row.
+
+    Args:
+        policy: Policy implementing the BatchPolicy protocol
+        demands: Demand matrix, shape (N, T)
+        initial_inventory: Starting inventory level
+        profiler: If given, time the decide, env_step and learn phases
+
+    Returns:
+        Dict with total_cost, total_stockouts and avg_inventory arrays of shape (N,)
+    """
+    n_scenarios, T = demands.shape
+    env = BatchInventoryEnv(initial_inventory, n_scenarios=n_scenarios)
+    policy.reset_batch(n_scenarios)
+
+    p = profiler
+    with p or nullcontext():
+        for t in range(T):
+            demand = demands[:, t]
+            if p:
+                t0 = clock()
+            order_qty = policy.decide_batch(env.inventory, t)
+            if p:
+                t1 = clock()
+                p.add("decide", t1 - t0)
+            env.step(order_qty, demand)
+            if p:
+                t0 = clock()
+                p.add("env_step", t0 - t1)
+            policy.learn_batch(t, demand)
+            if p:
+                p.add("learn", clock() - t0)
+                p.step()
+
+    return {
+        "total_cost": env.total_cost,
+        "total_stockouts": env.total_stockout,
+        "avg_inventory": env.average_inventory(),
+    }
+
+
+def run_job(job: EvalJob) -> list[JobResult]:
+    """Generate (or map) the job's demand scenarios and simulate them (runs in a worker)."""
+    if job.store is not None:
+        stop = job.scenario + job.n_scenarios
+        demands = open_store(job.store).rows(job.scenario, stop, job.T)
+    else:
+        demands = DemandProcess().sample(
+            job.n_scenarios, job.T, job.seed, first_scenario=job.scenario
+        )
+    scenarios = range(job.scenario, job.scenario + job.n_scenarios)
+
+    if job.batch:
+        profiler = _job_profiler(job) if job.profile else None
+        metrics = simulate_batch(job.spec.build(), demands, job.initial_inventory, profiler)
+        results = [
+            JobResult(job.spec.name, j, *(float(metrics[m][i]) for m in METRICS))
+            for i, j in enumerate(scenarios)
+        ]
+        # One profile per vectorized block, carried by its first result
+        if profiler is not None:
+            results[0].profile = profiler.report()
+        return results
+
+    results = []
+    for j, row in zip(scenarios, demands):
+        trace_path = None
+        if job.trace_dir is not None:
+            trace_path = job.trace_dir / f"policy_{job.spec.name}_seed{j}.txt"
+
+        profiler = _job_profiler(job, j) if job.profile else None
+        metrics = simulate(
+            job.spec.build(),
+            row.tolist(),
+            job.initial_inventory,
+            trace_path,
+            job.spec.name,
+            profiler,
+        )
+        results.append(JobResult(policy=job.spec.name, scenario=j, **metrics))
+        if profiler is not None:
+            results[-1].profile = profiler.report()
+    return results
+
+
+def _job_profiler(job: EvalJob, scenario: int | None = None) -> Profiler:
+    profiler = Profiler()
+    profiler.meta = {"policy": job.spec.name, "scenario": job.scenario, "T": job.T}
+    if scenario is not None:
+        profiler.meta["scenario"] = scenario
+    else:
+        profiler.meta["n_scenarios"] = job.n_scenarios
+    return profiler
+
+
+def summarize(values: list[float], confidence: float = 0.95) -> MetricSummary:
+    """
+    Mean, stdev and normal-approximation confidence interval.
+
+    Args:
+        values: Per-scenario metric values
+        confidence: Two-sided confidence level
+
+    Returns:
+        MetricSummary
+    """
+    mean = statistics.fmean(values)
+    stdev = statistics.stdev(values) if len(values) > 1 else 0.0
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * stdev / math.sqrt(len(values))
+    return MetricSummary(mean, stdev, mean - half_width, mean + half_width)
+
+
+def aggregate(results: list[JobResult], confidence: float = 0.95) -> list[PolicyEvaluation]:
+    """Group job results by policy and summarize every metric."""
+    by_policy: dict[str, list[JobResult]] = {}
+    for r in results:
+        by_policy.setdefault(r.policy, []).append(r)
+
+    return [
+        PolicyEvaluation(
+            policy=name,
+            n=len(rows),
+            metrics={m: summarize([getattr(r, m) for r in rows], confidence) for m in METRICS},
+        )
+        for name, rows in by_policy.items()
+    ]
+
+
+def evaluate(
+    specs: list[PolicySpec],
+    n_seeds: int,
+    T: int,
+    seed: int = 42,
+    initial_inventory: float = 80.0,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    trace_dir: Path | None = None,
+    confidence: float = 0.95,
+    batch: bool = False,
+    profile_path: Path | None = None,
+    store: Path | None = None,
+    cache: EvalCache | None = None,
+) -> list[PolicyEvaluation]:
+    """
+    Evaluate policies across many demand scenarios in parallel.
+
+    Args:
+        specs: Policies to evaluate
+        n_seeds: Number of demand scenarios per policy
+        T: Number of time periods
+        seed: Root seed; scenario j uses child stream j
+        initial_inventory: Starting inventory level
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        chunk_size: Jobs per task sent to a worker (default: spread evenly);
+            in batch mode, scenarios per vectorized block
+        trace_dir: If given, write one trace file per job there
+        confidence: Confidence level for the intervals
+        batch: Step blocks of scenarios together with decide_batch/learn_batch
+            (same results; no traces)
+        profile_path: If given, profile every run and write the per-policy
+            merged profile report (JSON) here
+        store: Scenario store to read demands from instead of generating
+            them (scenarios 0..n_seeds-1, first T periods; seed is ignored)
+        cache: Result cache; scenarios already in it are not simulated again
+            and new ones are added (not used with trace_dir or profile_path)
+
+    Returns:
+        One PolicyEvaluation per spec, in spec order
+    """
+    if batch:
+        scalar_only = [spec.name for spec in specs if not isinstance(spec.build(), BatchPolicy)]
+        if scalar_only:
+            raise ValueError(f"policies without batch support: {', '.join(scalar_only)}")
+    if trace_dir is not None:
+        if batch:
+            raise ValueError("batch evaluation does not write traces")
+        trace_dir.mkdir(parents=True, exist_ok=True)
+    if store is not None:
+        bank = open_store(store)
+        if n_seeds > bank.n_scenarios or T > bank.T:
+            raise ValueError(
+                f"store {store} has {bank.n_scenarios} scenarios × T={bank.T}, "
+                f"asked for {n_seeds} × T={T}"
+            )
+
+    workers = workers or os.cpu_count() or 1
+
+    # Scenarios to compute per policy; the rest are served from the cache
+    todo = {spec.name: list(range(n_seeds)) for spec in specs}
+    cached: list[JobResult] = []
+    keys: dict[tuple[str, int], str] = {}
+    if cache is not None and trace_dir is None and profile_path is None:
+        demand = demand_identity(store_digest=bank.digest if store is not None else None)
+        for spec in filter(_cacheable, specs):
+            for j in range(n_seeds):
+                keys[spec.name, j] = scenario_key(
+                    spec, j, None if store is not None else seed, T, initial_inventory, demand
+                )
+        found = cache.get_many(list(keys.values()))
+        for (name, j), key in keys.items():
+            if key in found:
+                cached.append(JobResult(policy=name, scenario=j, **found[key]))
+        done = {(r.policy, r.scenario) for r in cached}
+        todo = {name: [j for j in js if (name, j) not in done] for name, js in todo.items()}
+
+    if batch:
+        # One job per (policy, block of consecutive scenarios); pool chunks stay at 1
+        block = chunk_size or max(1, -(-max(map(len, todo.values())) // workers))
+        jobs = [
+            EvalJob(
+                spec,
+                j,
+                seed,
+                T,
+                initial_inventory,
+                None,
+                n,
+                True,
+                profile_path is not None,
+                store,
+            )
+            for spec in specs
+            for j, n in _blocks(todo[spec.name], block)
+        ]
+        chunk_size = 1
+    else:
+        jobs = [
+            EvalJob(
+                spec,
+                j,
+                seed,
+                T,
+                initial_inventory,
+                trace_dir,
+                profile=profile_path is not None,
+                store=store,
+            )
+            for spec in specs
+            for j in todo[spec.name]
+        ]
+        chunk_size = chunk_size or max(1, len(jobs) // (workers * 4))
+
+    if not jobs:
+        batches = []
+    elif workers == 1:
+        batches = [run_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batches = list(pool.map(run_job, jobs, chunksize=chunk_size))
+
+    computed = [r for batch_results in batches for r in batch_results]
+    if keys:
+        cache.put_many(
+            [
+                (keys[r.policy, r.scenario], "scenario", {m: getattr(r, m) for m in METRICS})
+                for r in computed
+                if (r.policy, r.scenario) in keys
+            ]
+        )
+    if profile_path is not None:
+        write_report(collect_profiles(computed), profile_path)
+
+    # Scenario order, as without a cache, so aggregates match bit for bit
+    order = {spec.name: i for i, spec in enumerate(specs)}
+    results = sorted(cached + computed, key=lambda r: (order[r.policy], r.scenario))
+    return aggregate(results, confidence)
+
+
+def _cacheable(spec: PolicySpec) -> bool:
+    """Whether a policy's results depend on its inputs only (not on wall time)."""
+    return spec.params.get("time_limit") is None
+
+
+def scenario_key(
+    spec: PolicySpec,
+    scenario: int,
+    seed: int | None,
+    T: int,
+    initial_inventory: float,
+    demand: dict,
+) -> str:
+    """Cache key of one policy on one demand scenario (see cache.cache_key)."""
+    return cache_key(
+        "scenario",
+        POLICY_CLASSES[spec.kind].__name__,
+        spec.params,
+        demand=demand,
+        seed=seed,
+        scenario=scenario,
+        T=T,
+        initial_inventory=initial_inventory,
+    )
+
+
+def _blocks(scenarios: list[int], block: int):
+    """Split sorted scenario indices into (first, count) runs of consecutive indices."""
+    first = count = None
+    for j in scenarios:
+        if count is not None and j == first + count and count < block:
+            count += 1
+            continue
+        if count is not None:
+            yield first, count
+        first, count = j, 1
+    if count is not None:
+        yield first, count
+
+
+def collect_profiles(results: list[JobResult]) -> dict:
+    """Merge the per-run profiles of job results into one report per policy."""
+    by_policy: dict[str, list[dict]] = {}
+    for r in results:
+        if r.profile is not None:
+            by_policy.setdefault(r.policy, []).append(r.profile)
+    return {
+        "policies": {
+            name: merge_reports(reports, {"policy": name}) for name, reports in by_policy.items()
+        }
+    }
+
+
+def format_table(evaluations: list[PolicyEvaluation], confidence: float = 0.95) -> str:
+    """Render evaluations as a fixed-width table."""
+    ci_label = f"{confidence:.0%} CI"
+    lines = [
+        f"{'Policy':<8} {'Metric':<18} {'n':>6} {'Mean':>12} {'Stdev':>12} {ci_label:>25}",
+        "-" * 86,
+    ]
+    for ev in evaluations:
+        for name, m in ev.metrics.items():
+            ci = f"[{m.ci_low:.2f}, {m.ci_high:.2f}]"
+            lines.append(
+                f"{ev.policy:<8} {name:<18} {ev.n:>6} {m.mean:>12.2f} {m.stdev:>12.2f} {ci:>25}"
+            )
+    return "\n".join(lines)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Evaluate policies across many demand seeds")
+    parser.add_argument(
+        "--policies",
+        nargs="+",
+        choices=sorted(DEFAULT_SPECS),
+        default=["a", "b"],
+        help="Policies to evaluate (default: a b)",
+    )
+    parser.add_argument("--seeds", type=int, default=100, help="Scenarios per policy")
+    parser.add_argument("--seed", type=int, default=42, help="Root seed (default: 42)")
+    parser.add_argument("--T", type=int, default=365, help="Time periods (default: 365)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Jobs per worker task")
+    parser.add_argument("--confidence", type=float, default=0.95, help="CI level")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Step blocks of scenarios together (vectorized, no traces)",
+    )
+    parser.add_argument(
+        "--trace-dir",
+        type=Path,
+        default=None,
+        help="Write a trace file per job to this directory (off by default)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        help="Write per-policy phase timings (JSON) merged across runs to this path",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=None,
+        help="Read scenarios from this scenario store instead of generating them",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_CACHE_DIR,
+        default=None,
+        help="Reuse and store results in this cache (no value: runs/cache; default: off)",
+    )
+
+    args = parser.parse_args()
+
+    specs = [DEFAULT_SPECS[p] for p in args.policies]
+    source = f"store {args.store}" if args.store is not None else f"seed={args.seed}"
+    print(
+        f"\nEvaluating {', '.join(args.policies)} on {args.seeds} scenarios "
+        f"(T={args.T}, {source})...\n"
+    )
+    cache = EvalCache(args.cache_dir) if args.cache_dir is not None else None
+    try:
+        evaluations = evaluate(
+            specs,
+            n_seeds=args.seeds,
+            T=args.T,
+            seed=args.seed,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            trace_dir=args.trace_dir,
+            confidence=args.confidence,
+            batch=args.batch,
+            profile_path=args.profile,
+            store=args.store,
+            cache=cache,
+        )
+    except ValueError as e:
+        # Invalid option combinations (--batch with policy c, traces, store size)
+        if cache is not None:
+            cache.close()
+        parser.error(str(e))
+    print(format_table(evaluations, args.confidence))
+    if cache is not None:
+        print(
+            f"\nCache: {cache.hits} scenarios reused, {cache.misses} simulated ({args.cache_dir})"
+        )
+        cache.close()
+    if args.profile is not None:
+        print(f"\nProfile written to {args.profile}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
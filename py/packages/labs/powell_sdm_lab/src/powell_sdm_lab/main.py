@@ -2,15 +2,45 @@
 Main entry point for Powell SDM Lab
 
 Runs one policy through T time steps and writes trace file.
+
+With --cache-dir, finished runs go to the evaluation cache (see cache.py)
+with their trace, so rerunning the same policy, seed and T copies the
+cached trace into place instead of simulating again.
+
+--warm-start W fits the demand model of policy b or c to W weeks of demand
+history before period 0 (DemandProcess.history) instead of starting from
+the default θ.
 """
 
 import argparse
+import shutil
+from contextlib import nullcontext
 from pathlib import Path
 
-from powell_sdm_lab.demand_process import generate_demands
-from powell_sdm_lab.env_inventory import InventoryEnv
-from powell_sdm_lab.policies import PolicyA, PolicyB
-from powell_sdm_lab.trace import TraceWriter, write_summary
+from powell_sdm_lab.cache import DEFAULT_CACHE_DIR, EvalCache, cache_key, demand_identity
+from powell_sdm_lab.demand_process import DemandProcess, generate_demands
+from powell_sdm_lab.env_inventory import InventoryEnv, StepRecordBuffer
+from powell_sdm_lab.policies import LookaheadPolicy, PolicyA, PolicyB
+from powell_sdm_lab.profiling import Profiler, clock, format_report
+from powell_sdm_lab.stats import RunSummary
+from powell_sdm_lab.trace import (
+    TRACE_FORMATS,
+    TRACE_SUFFIXES,
+    index_path,
+    open_trace,
+    write_summary,
+)
+
+# Policy kind -> (class, parameters, display name); pedagogical, not optimal
+POLICIES = {
+    "a": (PolicyA, {"target_stock": 90.0}, "Policy A (Constant Base-Stock)"),
+    "b": (
+        PolicyB,
+        {"safety_stock": 10.0, "learning_rate": 0.05},
+        "Policy B (Forecast-Driven with Learning)",
+    ),
+    "c": (LookaheadPolicy, {"safety_stock": 10.0}, "Policy C (Monte Carlo Rollout Lookahead)"),
+}
 
 
 def run_policy(
@@ -19,6 +49,9 @@ def run_policy(
     initial_inventory: float,
     output_path: Path,
     policy_name: str,
+    trace_format: str = "text",
+    record_buffer: StepRecordBuffer | None = None,
+    profiler: Profiler | None = None,
 ):
     """
     Run one policy through the SDM loop.
@@ -29,67 +62,130 @@ def run_policy(
         initial_inventory: Starting inventory level
         output_path: Where to write trace file
         policy_name: Display name for policy
+        trace_format: "text" (human-readable) or "columnar" (binary columns)
+        record_buffer: If given, every step record is stored in it as columns
+        profiler: If given, time each phase of the loop (decide, forecast,
+            env_step, learn, trace_write, summary, progress)
+
+    Returns:
+        Online summary of the run (records are only kept in record_buffer)
     """
     env = InventoryEnv(initial_inventory=initial_inventory)
-    records = []
+    summary = RunSummary()
 
-    print(f"\n{'='*60}")
+    print(f"\n{'=' * 60}")
     print(f"Running {policy_name}")
-    print(f"{'='*60}\n")
+    print(f"{'=' * 60}\n")
 
-    with TraceWriter(output_path) as trace:
+    trace_options = {"metadata": {"policy": policy_name}} if trace_format == "columnar" else {}
+
+    p = profiler
+    with p or nullcontext(), open_trace(output_path, trace_format, **trace_options) as trace:
         for t, demand in enumerate(demands):
             # Pre-decision state
             inventory = env.inventory
 
             # Decision (possibly using forecast)
+            if p:
+                t0 = clock()
             order_qty = policy.decide(inventory, t)
+            if p:
+                t1 = clock()
+                p.add("decide", t1 - t0)
 
             # Get forecast info before stepping (for tracing)
             forecast = policy.get_forecast(t)
+            if p:
+                t0 = clock()
+                p.add("forecast", t0 - t1)
 
             # Step environment (post-decision → exogenous → transition)
             record = env.step(order_qty, demand)
+            if p:
+                t1 = clock()
+                p.add("env_step", t1 - t0)
 
             # Learning (update model after observing demand)
             policy.learn(t, demand)
+            if p:
+                t0 = clock()
+                p.add("learn", t0 - t1)
 
             # Get forecast error (for tracing)
             forecast_error = policy.get_forecast_error(t, demand)
+            if p:
+                t1 = clock()
+                p.add("forecast", t1 - t0)
 
             # Write trace
             trace.write_step(record, forecast, forecast_error)
-            records.append(record)
+            if p:
+                t0 = clock()
+                p.add("trace_write", t0 - t1)
+            summary.update(record)
+            if record_buffer is not None:
+                record_buffer.append(record)
+            if p:
+                t1 = clock()
+                p.add("summary", t1 - t0)
 
             # Progress indicator
             if (t + 1) % 7 == 0:
                 print(f"Completed week {(t + 1) // 7}")
+            if p:
+                p.add("progress", clock() - t1)
+                p.step()
 
-    # Write summary
-    write_summary(output_path, records, policy_name)
+    # Write summary (columnar traces carry the columns to recompute it)
+    if trace_format == "text":
+        write_summary(output_path, summary, policy_name)
 
     # Print results
-    total_cost = sum(r.cost for r in records)
-    total_stockouts = sum(r.stockout for r in records)
-    avg_inventory = sum(r.inventory_next for r in records) / len(records)
-
-    print(f"\nResults:")
-    print(f"  Total cost: {total_cost:.2f}")
-    print(f"  Total stockouts: {total_stockouts:.2f}")
-    print(f"  Average inventory: {avg_inventory:.2f}")
+    print("\nResults:")
+    print(f"  Total cost: {summary.total_cost:.2f}")
+    print(f"  Total stockouts: {summary.total_stockouts:.2f}")
+    print(f"  Average inventory: {summary.avg_inventory:.2f}")
     print(f"\nTrace written to: {output_path}")
 
+    return summary
+
+
+def restore_run(cache: EvalCache, key: str, output_path: Path) -> dict | None:
+    """
+    Copy a cached run's trace (and text trace index) to output_path.
+
+    Returns:
+        The run's metrics, or None if it is not cached (or lost its trace)
+    """
+    metrics = cache.get(key)
+    files = cache.files(key)
+    if metrics is None or not files.get("trace", Path()).is_file():
+        return None
+    shutil.copyfile(files["trace"], output_path)
+    index = index_path(output_path)
+    if "index" in files:
+        shutil.copyfile(files["index"], index)
+    else:
+        index.unlink(missing_ok=True)
+    return metrics
+
+
+def store_run(cache: EvalCache, key: str, summary: RunSummary, output_path: Path):
+    """Cache a finished run's metrics with its trace file(s)."""
+    files = {"trace": output_path}
+    if index_path(output_path).is_file():
+        files["index"] = index_path(output_path)
+    cache.put(key, "run", summary.metrics(), files)
+
 
 def main():
     """CLI entry point."""
-    parser = argparse.ArgumentParser(
-        description="Run Powell SDM lab with specified policy"
-    )
+    parser = argparse.ArgumentParser(description="Run Powell SDM lab with specified policy")
     parser.add_argument(
         "--policy",
-        choices=["a", "b"],
+        choices=["a", "b", "c"],
         required=True,
-        help="Policy to run: a (constant) or b (forecast-driven)",
+        help="Policy to run: a (constant), b (forecast-driven) or c (rollout lookahead)",
     )
     parser.add_argument(
         "--seed",
@@ -103,8 +199,48 @@ def main():
         default=56,
         help="Number of time periods to simulate (default: 84)",
     )
+    parser.add_argument(
+        "--trace-format",
+        choices=sorted(TRACE_FORMATS),
+        default="text",
+        help="Trace file format (default: text)",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=None,
+        help="Per-decision time budget in seconds for policy c (default: none)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        help="Write a per-phase timing profile (JSON) to this path",
+    )
+    parser.add_argument(
+        "--profile-allocations",
+        action="store_true",
+        help="Also trace allocations with tracemalloc (slows the run)",
+    )
+    parser.add_argument(
+        "--warm-start",
+        type=int,
+        default=0,
+        metavar="WEEKS",
+        help="Fit policy b/c's demand model to this many weeks of history first",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_CACHE_DIR,
+        default=None,
+        help="Reuse and store results in this cache (no value: runs/cache; default: off)",
+    )
 
     args = parser.parse_args()
+    if args.warm_start and args.policy == "a":
+        parser.error("--warm-start needs a learning policy (b or c)")
 
     # Generate demand sequence (same for all policies when using same seed)
     print(f"\nGenerating {args.T} periods of demand (seed={args.seed})...")
@@ -118,25 +254,75 @@ def main():
     initial_inventory = 80.0
 
     # Run selected policy
-    if args.policy == "a":
-        policy = PolicyA(target_stock=90.0)
-        output_path = runs_dir / "policy_a_latest.txt"
-        policy_name = "Policy A (Constant Base-Stock)"
+    policy_class, params, policy_name = POLICIES[args.policy]
+    if args.policy == "c":
+        params = {**params, "time_limit": args.time_limit}
+    policy = policy_class(**params)
+    if args.warm_start:
+        history = DemandProcess().history(7 * args.warm_start, args.seed)
+        policy.warm_start(history)
+        theta = ", ".join(f"{w:.2f}" for w in policy.model.theta)
+        print(f"Warm-started on {len(history)} periods of history: θ = [{theta}]")
+    output_path = runs_dir / f"policy_{args.policy}_latest{TRACE_SUFFIXES[args.trace_format]}"
+
+    profiler = None
+    if args.profile is not None:
+        profiler = Profiler(allocations=args.profile_allocations)
+        profiler.meta = {"policy": args.policy, "seed": args.seed, "T": args.T}
+
+    # Timed decisions depend on machine load and profiles need a real run
+    cache = None
+    if args.cache_dir is not None and params.get("time_limit") is None and profiler is None:
+        cache = EvalCache(args.cache_dir)
+        key = cache_key(
+            "run",
+            policy_class.__name__,
+            params,
+            demand=demand_identity(),
+            seed=args.seed,
+            T=args.T,
+            warm_start_weeks=args.warm_start,
+            initial_inventory=initial_inventory,
+            trace_format=args.trace_format,
+            policy_name=policy_name,
+        )
+
+    metrics = restore_run(cache, key, output_path) if cache is not None else None
+    if metrics is not None:
+        print(f"\n{policy_name}: served from cache ({args.cache_dir})")
+        print("\nResults:")
+        print(f"  Total cost: {metrics['total_cost']:.2f}")
+        print(f"  Total stockouts: {metrics['total_stockouts']:.2f}")
+        print(f"  Average inventory: {metrics['avg_inventory']:.2f}")
+        print(f"\nTrace written to: {output_path}")
     else:
-        policy = PolicyB(safety_stock=10.0, learning_rate=0.05)
-        output_path = runs_dir / "policy_b_latest.txt"
-        policy_name = "Policy B (Forecast-Driven with Learning)"
+        summary = run_policy(
+            policy,
+            demands,
+            initial_inventory,
+            output_path,
+            policy_name,
+            args.trace_format,
+            profiler=profiler,
+        )
+        if cache is not None:
+            store_run(cache, key, summary, output_path)
+    if cache is not None:
+        cache.close()
 
-    run_policy(policy, demands, initial_inventory, output_path, policy_name)
+    if profiler is not None:
+        profiler.write_json(args.profile)
+        print(f"\nProfile ({args.profile}):\n")
+        print(format_report(profiler.report()))
 
-    print(f"\n{'='*60}")
+    print(f"\n{'=' * 60}")
     print("Next steps:")
     if args.policy == "a":
         print("  Run Policy B: python -m powell_sdm_lab.main --policy b --seed 42")
     else:
         print("  Run Policy A: python -m powell_sdm_lab.main --policy a --seed 42")
     print("  Compare both: python -m powell_sdm_lab.compare")
-    print(f"{'='*60}\n")
+    print(f"{'=' * 60}\n")
 
 
 if __name__ == "__main__":
@@ -4,9 +4,48 @@ Decision policies
 Two contrasting approaches:
 - Policy A: Fixed base-stock (no learning)
 - Policy B: Forecast-driven base-stock (with online demand model)
+
+plus ScheduledBaseStock, a Policy A variant with a precomputed S_t schedule,
+and LookaheadPolicy, a direct lookahead that scores candidate orders by
+Monte Carlo rollouts of the inventory cost model.
+
+Every policy implements the scalar Policy protocol used by run_policy.
+Policies that also implement BatchPolicy can decide for N scenarios at once
+(one array entry per scenario) with results identical to N scalar runs.
 """
 
-from powell_sdm_lab.demand_model import OnlineDemandModel
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import Protocol, runtime_checkable
+
+import numpy as np
+
+from powell_sdm_lab.demand_model import BatchOnlineDemandModel, OnlineDemandModel
+from powell_sdm_lab.env_inventory import transition_arrays
+
+
+@runtime_checkable
+class Policy(Protocol):
+    """Scalar decision policy: one inventory, one period at a time."""
+
+    def decide(self, inventory: float, t: int) -> float: ...
+
+    def learn(self, t: int, demand: float): ...
+
+    def get_forecast(self, t: int) -> float | None: ...
+
+    def get_forecast_error(self, t: int, demand: float) -> float | None: ...
+
+
+@runtime_checkable
+class BatchPolicy(Protocol):
+    """Scenario-parallel decision policy: N inventories per call."""
+
+    def reset_batch(self, n_scenarios: int): ...
+
+    def decide_batch(self, inventories: np.ndarray, t: int) -> np.ndarray: ...
+
+    def learn_batch(self, t: int, demands: np.ndarray): ...
 
 
 class PolicyA:
@@ -44,6 +83,48 @@ class PolicyA:
         """No learning in this policy."""
         pass
 
+    def reset_batch(self, n_scenarios: int):
+        """No per-scenario state to set up."""
+        pass
+
+    def decide_batch(self, inventories: np.ndarray, t: int) -> np.ndarray:
+        """
+        Compute order quantities for N scenarios.
+
+        Args:
+            inventories: Current inventory levels, shape (N,)
+            t: Time index (unused by this policy)
+
+        Returns:
+            Order quantities, shape (N,)
+        """
+        return np.maximum(0.0, self.S - inventories)
+
+    def learn_batch(self, t: int, demands: np.ndarray):
+        """No learning in this policy."""
+        pass
+
+    def order_up_to(self, T: int) -> np.ndarray:
+        """
+        Order-up-to levels for periods 0 .. T-1 (used by fastpath).
+
+        Args:
+            T: Number of time periods
+
+        Returns:
+            Array of shape (T,)
+        """
+        return np.full(T, float(self.S))
+
+    def get_state(self) -> dict:
+        """Policy parameters as a JSON-serializable dict."""
+        return {"target_stock": self.S}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "PolicyA":
+        """Rebuild a policy from get_state() output."""
+        return cls(state["target_stock"])
+
     def get_forecast(self, t: int) -> float | None:
         """No forecast available."""
         return None
@@ -53,6 +134,74 @@ class PolicyA:
         return None
 
 
+class ScheduledBaseStock(PolicyA):
+    """
+    Base-stock policy with a precomputed level per period.
+
+    Decision: q_t = max(0, S_t - inventory)
+
+    Periods past the end of the schedule reuse its last level.
+    """
+
+    def __init__(self, levels):
+        """
+        Initialize policy.
+
+        Args:
+            levels: Base-stock levels S_0, S_1, ...
+        """
+        self.levels = np.asarray(levels, dtype=np.float64)
+        self._levels = self.levels.tolist()
+        super().__init__(self._levels[-1])
+
+    def decide(self, inventory: float, t: int) -> float:
+        """
+        Compute order quantity.
+
+        Args:
+            inventory: Current inventory level
+            t: Time index
+
+        Returns:
+            Order quantity
+        """
+        return max(0, self._levels[min(t, len(self._levels) - 1)] - inventory)
+
+    def decide_batch(self, inventories: np.ndarray, t: int) -> np.ndarray:
+        """
+        Compute order quantities for N scenarios.
+
+        Args:
+            inventories: Current inventory levels, shape (N,)
+            t: Time index
+
+        Returns:
+            Order quantities, shape (N,)
+        """
+        return np.maximum(0.0, self._levels[min(t, len(self._levels) - 1)] - inventories)
+
+    def order_up_to(self, T: int) -> np.ndarray:
+        """
+        Order-up-to levels for periods 0 .. T-1 (used by fastpath).
+
+        Args:
+            T: Number of time periods
+
+        Returns:
+            Array of shape (T,)
+        """
+        return self.levels[np.minimum(np.arange(T), len(self.levels) - 1)]
+
+    def get_state(self) -> dict:
+        """Policy parameters as a JSON-serializable dict."""
+        return {"levels": self._levels}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "ScheduledBaseStock":
+        """Rebuild a policy from get_state() output."""
+        return cls(state["levels"])
+
+
 class PolicyB:
     """
     Forecast-driven base-stock policy with online learning.
@@ -60,7 +209,9 @@ class PolicyB:
     Decision: q_t = max(0, ŷ_t + safety - inventory)
     where ŷ_t is the demand forecast
 
-    Embeds demand model directly in decision loop.
+    Embeds demand model directly in decision loop. The batch path keeps
+    one θ vector per scenario in a BatchOnlineDemandModel, separate from
+    the scalar model.
     """
 
     def __init__(self, safety_stock: float, learning_rate: float = 0.05):
@@ -75,6 +226,9 @@ class PolicyB:
         self.model = OnlineDemandModel(learning_rate=learning_rate)
         self._last_forecast = None
 
+        self.batch_model: BatchOnlineDemandModel | None = None
+        self._start_theta: list[float] | None = None
+
     def decide(self, inventory: float, t: int) -> float:
         """
         Compute order quantity using forecast.
@@ -102,6 +256,341 @@ class PolicyB:
         """
         self.model.update(t, demand)
 
+    def warm_start(self, history, t0: int | None = None):
+        """
+        Replace the demand model with one fitted to a demand history.
+
+        Batch runs started afterwards begin from the same θ.
+
+        Args:
+            history: Past demands, shape (T,)
+            t0: Time index of history[0] (default: -T, i.e. the T periods
+                just before period 0)
+        """
+        history = np.asarray(history, dtype=np.float64)
+        t0 = -len(history) if t0 is None else t0
+        self.model = OnlineDemandModel.from_history(history, t0, learning_rate=self.model.alpha)
+        self._start_theta = list(self.model.theta)
+
+    def reset_batch(self, n_scenarios: int):
+        """
+        Start N fresh per-scenario demand models (from the warm-start θ, if any).
+
+        Args:
+            n_scenarios: Number of scenarios N
+        """
+        self.batch_model = BatchOnlineDemandModel(
+            n_scenarios, learning_rate=self.model.alpha, theta=self._start_theta
+        )
+
+    def decide_batch(self, inventories: np.ndarray, t: int) -> np.ndarray:
+        """
+        Compute order quantities for N scenarios using per-scenario forecasts.
+
+        Args:
+            inventories: Current inventory levels, shape (N,)
+            t: Time index
+
+        Returns:
+            Order quantities, shape (N,)
+        """
+        if self.batch_model is None:
+            self.reset_batch(len(inventories))
+        elif self.batch_model.n_streams != len(inventories):
+            raise ValueError(
+                f"got {len(inventories)} inventories for {self.batch_model.n_streams} "
+                "scenarios; call reset_batch() first"
+            )
+
+        forecast = self.batch_model.predict(t)
+        target = forecast + self.safety
+        return np.maximum(0.0, target - inventories)
+
+    def learn_batch(self, t: int, demands: np.ndarray):
+        """
+        Update every scenario's demand model after observing its demand.
+
+        Args:
+            t: Time index
+            demands: Observed demands, shape (N,)
+        """
+        self.batch_model.update(t, demands)
+
+    def get_state(self) -> dict:
+        """
+        Scalar-loop state as a JSON-serializable dict.
+
+        Covers the safety stock, the demand model's θ, the warm-start θ that
+        batch runs start from and the last forecast; the batch model is
+        rebuilt by reset_batch() and is not included.
+        """
+        return {
+            "safety_stock": self.safety,
+            "model": self.model.get_state(),
+            "start_theta": self._start_theta,
+            "last_forecast": self._last_forecast,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "PolicyB":
+        """Rebuild a policy, including its learned θ, from get_state() output."""
+        policy = cls(state["safety_stock"], learning_rate=state["model"]["learning_rate"])
+        policy.model = OnlineDemandModel.from_state(state["model"])
+        policy._start_theta = state.get("start_theta")
+        policy._last_forecast = state["last_forecast"]
+        return policy
+
+    def get_forecast(self, t: int) -> float | None:
+        """Get last forecast (for tracing)."""
+        return self._last_forecast
+
+    def get_forecast_error(self, t: int, demand: float) -> float | None:
+        """Compute forecast error (for tracing)."""
+        if self._last_forecast is None:
+            return None
+        return demand - self._last_forecast
+
+
+def rollout_costs(
+    inventory: float,
+    candidates: np.ndarray,
+    futures: np.ndarray,
+    levels: np.ndarray,
+    ordering_cost: float = 0.2,
+    holding_cost: float = 0.05,
+    penalty_cost: float = 1.0,
+) -> np.ndarray:
+    """
+    Total rollout cost of each candidate first order, summed over futures.
+
+    Each rollout orders the candidate now, then follows the base-stock rule
+    q = max(0, S_k - inventory) for the remaining steps. Steps go through
+    env_inventory.transition_arrays, so every rollout step costs exactly
+    what InventoryEnv.step would. All candidates see the same futures.
+
+    Args:
+        inventory: Current inventory level
+        candidates: First-period order quantities, shape (C,)
+        futures: Sampled demand paths, shape (K, H)
+        levels: Base-stock levels for lookahead steps 0 .. H-1, shape (H,)
+        ordering_cost: Per-unit ordering cost
+        holding_cost: Per-unit holding cost per period
+        penalty_cost: Per-unit stockout penalty
+
+    Returns:
+        Array of shape (C,): sum over the K futures of each rollout's cost
+    """
+    n_futures, horizon = futures.shape
+    shape = (len(candidates), n_futures)
+    order = np.broadcast_to(candidates[:, None], shape)
+    inv = np.full(shape, float(inventory))
+    total = np.zeros(shape)
+    out = tuple(np.empty(shape) for _ in range(6))
+    for k in range(horizon):
+        if k > 0:
+            order = np.maximum(0.0, levels[k] - inv)
+        _, _, _, inv, cost = transition_arrays(
+            inv, order, futures[:, k], ordering_cost, holding_cost, penalty_cost, out
+        )
+        total += cost
+    return total.sum(axis=1)
+
+
+class LookaheadPolicy:
+    """
+    Direct lookahead policy with Monte Carlo rollouts.
+
+    Decision: q_t = argmin over candidates q of the mean cost of
+    H-step rollouts that order q now and follow forecast + safety base-stock
+    afterwards, over K sampled demand futures.
+
+    Futures are drawn around the online demand model's forecasts with
+    Normal(0, noise_std) noise, so the lookahead improves as the model learns.
+    Rollouts run in chunks of futures; once time_limit has passed the best
+    candidate so far is returned (at least one chunk is always scored).
+    """
+
+    def __init__(
+        self,
+        safety_stock: float = 10.0,
+        horizon: int = 7,
+        n_futures: int = 64,
+        max_order: float = 200.0,
+        order_step: float = 5.0,
+        noise_std: float = 10.0,
+        learning_rate: float = 0.05,
+        chunk_size: int = 16,
+        time_limit: float | None = None,
+        executor: Executor | None = None,
+        seed: int = 0,
+        ordering_cost: float = 0.2,
+        holding_cost: float = 0.05,
+        penalty_cost: float = 1.0,
+    ):
+        """
+        Initialize policy with demand model and future sampler.
+
+        Args:
+            safety_stock: Safety buffer of the rollout base-stock rule
+            horizon: Lookahead steps H
+            n_futures: Sampled demand futures K per decision
+            max_order: Largest candidate order
+            order_step: Spacing of candidate orders 0, step, ..., max_order
+            noise_std: Demand noise assumed around the forecast
+            learning_rate: Learning rate for demand model
+            chunk_size: Futures per rollout batch (the unit of work and of timing)
+            time_limit: Per-decision budget in seconds (None: score all futures)
+            executor: Optional pool to score chunks in parallel
+            seed: Seed for sampling futures
+            ordering_cost: Per-unit ordering cost
+            holding_cost: Per-unit holding cost per period
+            penalty_cost: Per-unit stockout penalty
+        """
+        self.safety = safety_stock
+        self.horizon = horizon
+        self.n_futures = n_futures
+        self.max_order = max_order
+        self.order_step = order_step
+        self.candidates = np.arange(0.0, max_order + order_step / 2, order_step)
+        self.noise_std = noise_std
+        self.chunk_size = chunk_size
+        self.time_limit = time_limit
+        self.executor = executor
+        self.costs = (ordering_cost, holding_cost, penalty_cost)
+        self.model = OnlineDemandModel(learning_rate=learning_rate)
+        self.rng = np.random.default_rng(seed)
+        self._last_forecast = None
+
+        # Per-decision diagnostics
+        self.last_latency = 0.0
+        self.last_futures = 0
+        self.timeouts = 0
+
+    def decide(self, inventory: float, t: int) -> float:
+        """
+        Compute order quantity by rollout lookahead.
+
+        Args:
+            inventory: Current inventory level
+            t: Time index
+
+        Returns:
+            Order quantity
+        """
+        start = time.perf_counter()
+        deadline = None if self.time_limit is None else start + self.time_limit
+
+        forecasts = self.model.predict_batch(np.arange(t, t + self.horizon))
+        self._last_forecast = float(forecasts[0])
+        levels = forecasts + self.safety
+
+        futures = self.rng.standard_normal((self.n_futures, self.horizon))
+        futures *= self.noise_std
+        futures += forecasts
+        np.maximum(futures, 0.0, out=futures)
+
+        chunks = [
+            futures[i : i + self.chunk_size] for i in range(0, self.n_futures, self.chunk_size)
+        ]
+        totals, n_scored = self._score(inventory, chunks, levels, deadline)
+
+        self.last_latency = time.perf_counter() - start
+        self.last_futures = n_scored
+        if n_scored < self.n_futures:
+            self.timeouts += 1
+        return float(self.candidates[np.argmin(totals)])
+
+    def _score(self, inventory, chunks, levels, deadline) -> tuple[np.ndarray, int]:
+        """Summed rollout costs and number of futures scored before the deadline."""
+        totals = np.zeros(len(self.candidates))
+        n_scored = 0
+
+        if self.executor is None:
+            for chunk in chunks:
+                totals += rollout_costs(inventory, self.candidates, chunk, levels, *self.costs)
+                n_scored += len(chunk)
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+            return totals, n_scored
+
+        pending = {
+            self.executor.submit(
+                rollout_costs, inventory, self.candidates, chunk, levels, *self.costs
+            ): len(chunk)
+            for chunk in chunks
+        }
+        while pending:
+            timeout = None
+            if deadline is not None and n_scored:
+                timeout = max(0.0, deadline - time.perf_counter())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                totals += future.result()
+                n_scored += pending.pop(future)
+        for future in pending:
+            future.cancel()
+        return totals, n_scored
+
+    def learn(self, t: int, demand: float):
+        """
+        Update demand model after observing realized demand.
+
+        Args:
+            t: Time index
+            demand: Observed demand
+        """
+        self.model.update(t, demand)
+
+    def warm_start(self, history, t0: int | None = None):
+        """
+        Replace the demand model with one fitted to a demand history.
+
+        Args:
+            history: Past demands, shape (T,)
+            t0: Time index of history[0] (default: -T)
+        """
+        history = np.asarray(history, dtype=np.float64)
+        t0 = -len(history) if t0 is None else t0
+        self.model = OnlineDemandModel.from_history(history, t0, learning_rate=self.model.alpha)
+
+    def get_state(self) -> dict:
+        """
+        Parameters, demand model θ and sampler state as a JSON-serializable dict.
+
+        The executor is not included; a restored policy scores in-process
+        unless one is attached again.
+        """
+        ordering_cost, holding_cost, penalty_cost = self.costs
+        return {
+            "params": {
+                "safety_stock": self.safety,
+                "horizon": self.horizon,
+                "n_futures": self.n_futures,
+                "max_order": self.max_order,
+                "order_step": self.order_step,
+                "noise_std": self.noise_std,
+                "chunk_size": self.chunk_size,
+                "time_limit": self.time_limit,
+                "ordering_cost": ordering_cost,
+                "holding_cost": holding_cost,
+                "penalty_cost": penalty_cost,
+            },
+            "model": self.model.get_state(),
+            "rng": self.rng.bit_generator.state,
+            "last_forecast": self._last_forecast,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "LookaheadPolicy":
+        """Rebuild a policy, including its learned θ and sampler, from get_state() output."""
+        policy = cls(**state["params"], learning_rate=state["model"]["learning_rate"])
+        policy.model = OnlineDemandModel.from_state(state["model"])
+        policy.rng.bit_generator.state = state["rng"]
+        policy._last_forecast = state["last_forecast"]
+        return policy
+
     def get_forecast(self, t: int) -> float | None:
         """Get last forecast (for tracing)."""
         return self._last_forecast
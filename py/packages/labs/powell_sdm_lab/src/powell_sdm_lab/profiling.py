@@ -0,0 +1,193 @@
+"""
+Opt-in instrumentation for the SDM loop
+
+A Profiler accumulates wall time and call counts per named phase (decide,
+env_step, learn, ...). Loops take `profiler=None` and only read the clock
+when one is passed, so the uninstrumented path costs one truth test per
+phase.
+
+With allocations=True, tracemalloc runs for the whole profiled run: traced
+memory is sampled every `sample_every` steps and the top allocation sites
+are reported at the end. tracemalloc slows the run down considerably, so
+timings from such a run are not representative.
+
+report() returns a JSON-serializable dict; merge_reports() combines the
+reports of many runs (e.g. all scenarios of an evaluation) per phase.
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+clock = time.perf_counter
+
+
+class Profiler:
+    """
+    Per-phase cumulative timers and call counters for one run.
+
+    Usage in a loop:
+        t0 = clock()
+        ...phase...
+        profiler.add("decide", clock() - t0)
+    """
+
+    def __init__(self, allocations: bool = False, sample_every: int = 100, top: int = 10):
+        """
+        Args:
+            allocations: Trace allocations with tracemalloc while running
+            sample_every: Steps between traced-memory samples
+            top: Allocation sites to report
+        """
+        self.allocations = allocations
+        self.sample_every = sample_every
+        self.top = top
+        self.totals: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.steps = 0
+        self.meta: dict = {}
+
+        self._memory_samples: list[tuple[int, int, int]] = []
+        self._sites: list[dict] = []
+        self._peak = 0
+        self._started_tracing = False
+        self._start = None
+        self._wall = 0.0
+
+    def __enter__(self):
+        """Start the wall clock (and tracemalloc if requested)."""
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.allocations:
+            tracemalloc.reset_peak()
+        self._start = clock()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stop the wall clock and collect allocation statistics."""
+        self._wall += clock() - self._start
+        if self.allocations and tracemalloc.is_tracing():
+            _, self._peak = tracemalloc.get_traced_memory()
+            stats = tracemalloc.take_snapshot().statistics("lineno")
+            self._sites = [
+                {"site": str(stat.traceback[0]), "bytes": stat.size, "blocks": stat.count}
+                for stat in stats[: self.top]
+            ]
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def add(self, phase: str, seconds: float):
+        """Add one call of a phase."""
+        self.totals[phase] = self.totals.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block as one call of a phase (for coarse, infrequent phases)."""
+        t0 = clock()
+        try:
+            yield
+        finally:
+            self.add(name, clock() - t0)
+
+    def step(self):
+        """Mark the end of one loop step (samples traced memory when due)."""
+        self.steps += 1
+        if self.allocations and self.steps % self.sample_every == 0:
+            current, peak = tracemalloc.get_traced_memory()
+            self._memory_samples.append((self.steps, current, peak))
+
+    def report(self) -> dict:
+        """Machine-readable profile of the run."""
+        wall = self._wall if self._start is not None else sum(self.totals.values())
+        report = {
+            "meta": self.meta,
+            "runs": 1,
+            "steps": self.steps,
+            "wall_s": wall,
+            "phases": {
+                name: {"calls": self.calls[name], "total_s": total}
+                for name, total in self.totals.items()
+            },
+        }
+        if self.allocations:
+            report["allocations"] = {
+                "peak_bytes": self._peak,
+                "samples": [
+                    {"step": step, "current_bytes": current, "peak_bytes": peak}
+                    for step, current, peak in self._memory_samples
+                ],
+                "top_sites": self._sites,
+            }
+        return _with_shares(report)
+
+    def write_json(self, path: Path):
+        """Write report() to a JSON file."""
+        write_report(self.report(), path)
+
+
+def _with_shares(report: dict) -> dict:
+    """Add per-call means and shares of wall time to each phase."""
+    wall = report["wall_s"]
+    for stats in report["phases"].values():
+        stats["mean_us"] = 1e6 * stats["total_s"] / stats["calls"] if stats["calls"] else 0.0
+        stats["share"] = stats["total_s"] / wall if wall else 0.0
+    return report
+
+
+def merge_reports(reports: list[dict], meta: dict | None = None) -> dict:
+    """
+    Combine per-run reports: phase totals, calls, steps and wall time add up.
+
+    Allocation sections are reduced to the largest peak across runs.
+
+    Args:
+        reports: Reports from Profiler.report() (or earlier merges)
+        meta: Metadata for the merged report
+
+    Returns:
+        Merged report with the same layout
+    """
+    merged = {"meta": meta or {}, "runs": 0, "steps": 0, "wall_s": 0.0, "phases": {}}
+    peaks = []
+    for report in reports:
+        merged["runs"] += report["runs"]
+        merged["steps"] += report["steps"]
+        merged["wall_s"] += report["wall_s"]
+        for name, stats in report["phases"].items():
+            into = merged["phases"].setdefault(name, {"calls": 0, "total_s": 0.0})
+            into["calls"] += stats["calls"]
+            into["total_s"] += stats["total_s"]
+        if "allocations" in report:
+            peaks.append(report["allocations"]["peak_bytes"])
+    if peaks:
+        merged["allocations"] = {"peak_bytes": max(peaks)}
+    return _with_shares(merged)
+
+
+def write_report(report: dict, path: Path):
+    """Write a profile report as indented JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+
+
+def format_report(report: dict) -> str:
+    """Render a report's phases as a fixed-width table, slowest first."""
+    lines = [
+        f"{'Phase':<16} {'Calls':>10} {'Total (s)':>11} {'Mean (µs)':>11} {'Share':>7}",
+        "-" * 59,
+    ]
+    phases = sorted(report["phases"].items(), key=lambda item: -item[1]["total_s"])
+    for name, stats in phases:
+        lines.append(
+            f"{name:<16} {stats['calls']:>10} {stats['total_s']:>11.4f} "
+            f"{stats['mean_us']:>11.2f} {stats['share']:>7.1%}"
+        )
+    lines.append(f"{'wall':<16} {report['steps']:>10} {report['wall_s']:>11.4f}")
+    if "allocations" in report:
+        lines.append(f"peak traced memory: {report['allocations']['peak_bytes'] / 1024:.1f} KiB")
+    return "\n".join(lines)
@@ -0,0 +1,271 @@
+"""
+On-disk scenario banks as memory-mapped demand matrices
+
+A store file holds one (scenarios × T) demand matrix generated once from a
+DemandProcess and a root seed, so every policy is scored on exactly the
+same bytes and no run pays the generation cost again.
+
+Layout:
+    magic (8 bytes) | header length (uint32 LE) | JSON header | zero padding
+    then the raw C-order matrix, starting at a multiple of DATA_ALIGN
+
+The header records the shape, dtype, generator parameters, root seed
+(SeedSequence entropy and spawn key) and a SHA-256 of the data. Row j is
+scenario j of DemandProcess.sample() for that seed (rounded to the stored
+dtype), so a bank can be extended or regenerated bit for bit.
+
+Readers map the file with np.memmap: rows and chunks are views into the
+page cache, never copies, and matrices larger than RAM stream through.
+A ScenarioStore pickles as its path only, so worker processes reopen the
+file themselves (open_store caches one map per process) instead of
+receiving demand arrays.
+"""
+
+import argparse
+import hashlib
+import json
+import struct
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from powell_sdm_lab.demand_process import DemandProcess, SeedLike, as_seed_sequence
+
+STORE_MAGIC = b"PWSCEN01"
+DATA_ALIGN = 4096
+STORE_VERSION = 1
+
+
+def write_store(
+    path: Path,
+    n_scenarios: int,
+    T: int,
+    seed: SeedLike,
+    process: DemandProcess | None = None,
+    dtype: str = "float64",
+    chunk_scenarios: int = 1024,
+) -> Path:
+    """
+    Generate a scenario bank and write it to disk, a chunk of rows at a time.
+
+    Memory use is bounded by chunk_scenarios × T, whatever the bank size.
+
+    Args:
+        path: Store file to write
+        n_scenarios: Number of scenarios N
+        T: Number of time periods
+        seed: Root seed (int or SeedSequence)
+        process: Demand process (default: DemandProcess())
+        dtype: Stored dtype ("float64", or "float32" to halve the size)
+        chunk_scenarios: Rows generated per chunk
+
+    Returns:
+        The path written
+    """
+    process = process or DemandProcess()
+    root = as_seed_sequence(seed)
+    dtype = np.dtype(dtype).newbyteorder("<")
+    header = {
+        "version": STORE_VERSION,
+        "shape": [n_scenarios, T],
+        "dtype": dtype.str,
+        "process": asdict(process),
+        "seed": {"entropy": root.entropy, "spawn_key": list(root.spawn_key)},
+        "sha256": "0" * 64,  # Placeholder of the final length, filled in below
+    }
+    data_offset = _data_offset(header)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    with open(path, "wb") as f:
+        f.seek(data_offset)
+        for first in range(0, n_scenarios, chunk_scenarios):
+            n = min(chunk_scenarios, n_scenarios - first)
+            block = process.sample(n, T, root, first_scenario=first).astype(dtype, copy=False)
+            data = block.tobytes()
+            digest.update(data)
+            f.write(data)
+        f.truncate(data_offset + n_scenarios * T * dtype.itemsize)
+
+        header["sha256"] = digest.hexdigest()
+        f.seek(0)
+        f.write(_encode_header(header, data_offset))
+    # Maps of an earlier file at this path are stale even if its mtime looks unchanged
+    _open_store.cache_clear()
+    return path
+
+
+def _encode_header(header: dict, data_offset: int | None = None) -> bytes:
+    payload = json.dumps(header, sort_keys=True).encode()
+    prefix = STORE_MAGIC + struct.pack("<I", len(payload)) + payload
+    if data_offset is None:
+        return prefix
+    return prefix + b"\0" * (data_offset - len(prefix))
+
+
+def _data_offset(header: dict) -> int:
+    size = len(_encode_header(header))
+    return -(-size // DATA_ALIGN) * DATA_ALIGN
+
+
+def read_store_header(path: Path) -> dict:
+    """
+    Read a store's JSON header.
+
+    Returns:
+        Header dict, with "data_offset" added
+    """
+    with open(path, "rb") as f:
+        if f.read(len(STORE_MAGIC)) != STORE_MAGIC:
+            raise ValueError(f"{path} is not a scenario store")
+        (length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(length))
+    if header["version"] != STORE_VERSION:
+        raise ValueError(f"{path}: unsupported store version {header['version']}")
+    header["data_offset"] = -(-(len(STORE_MAGIC) + 4 + length) // DATA_ALIGN) * DATA_ALIGN
+    return header
+
+
+class ScenarioStore:
+    """
+    Read-only view of a scenario bank.
+
+    `demands` is the whole (N, T) matrix as a memmap; rows(), column slices
+    and iter_chunks() return views of it.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Store file written by write_store
+        """
+        self.path = Path(path)
+        self.header = read_store_header(self.path)
+        n_scenarios, T = self.header["shape"]
+        self.demands = np.memmap(
+            self.path,
+            dtype=np.dtype(self.header["dtype"]),
+            mode="r",
+            offset=self.header["data_offset"],
+            shape=(n_scenarios, T),
+        )
+
+    def __getstate__(self):
+        # Workers reopen the map; the matrix itself never crosses processes
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def __len__(self) -> int:
+        return self.n_scenarios
+
+    @property
+    def n_scenarios(self) -> int:
+        """Number of scenarios N."""
+        return self.demands.shape[0]
+
+    @property
+    def T(self) -> int:
+        """Number of time periods."""
+        return self.demands.shape[1]
+
+    @property
+    def process(self) -> DemandProcess:
+        """The demand process the bank was generated from."""
+        return DemandProcess(**self.header["process"])
+
+    @property
+    def seed(self) -> np.random.SeedSequence:
+        """The root seed the bank was generated from."""
+        seed = self.header["seed"]
+        return np.random.SeedSequence(seed["entropy"], spawn_key=tuple(seed["spawn_key"]))
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 of the matrix bytes, as recorded when the bank was written."""
+        return self.header["sha256"]
+
+    def rows(self, start: int, stop: int, T: int | None = None) -> np.ndarray:
+        """
+        Scenarios start .. stop-1 (optionally only the first T periods).
+
+        Returns:
+            Read-only view of shape (stop - start, T)
+        """
+        if not 0 <= start <= stop <= self.n_scenarios:
+            raise IndexError(f"rows {start}:{stop} outside 0:{self.n_scenarios}")
+        if T is not None and T > self.T:
+            raise ValueError(f"store has T={self.T}, asked for {T}")
+        return self.demands[start:stop, :T]
+
+    def iter_chunks(
+        self, chunk_size: int, start: int = 0, stop: int | None = None, T: int | None = None
+    ):
+        """
+        Stream the bank in blocks of rows.
+
+        Yields:
+            (first scenario index, view of shape (≤ chunk_size, T))
+        """
+        stop = self.n_scenarios if stop is None else stop
+        for first in range(start, stop, chunk_size):
+            yield first, self.rows(first, min(first + chunk_size, stop), T)
+
+    def verify(self, chunk_size: int = 4096) -> bool:
+        """Recompute the data digest and compare it with the header's."""
+        digest = hashlib.sha256()
+        for _, block in self.iter_chunks(chunk_size):
+            digest.update(np.ascontiguousarray(block).data)
+        return digest.hexdigest() == self.digest
+
+
+def open_store(path: str | Path) -> ScenarioStore:
+    """
+    Open a store once per process (workers call this per job).
+
+    Maps are shared by resolved path and reopened when the file's size or
+    modification time changes, e.g. after write_store rewrote it.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    return _open_store(path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=8)
+def _open_store(path: Path, mtime_ns: int, size: int) -> ScenarioStore:
+    return ScenarioStore(path)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Write or inspect a memory-mapped scenario bank")
+    parser.add_argument("path", type=Path, help="Store file")
+    parser.add_argument("--scenarios", type=int, default=None, help="Write N scenarios")
+    parser.add_argument("--T", type=int, default=365, help="Time periods (default: 365)")
+    parser.add_argument("--seed", type=int, default=42, help="Root seed (default: 42)")
+    parser.add_argument(
+        "--dtype", choices=["float64", "float32"], default="float64", help="Stored dtype"
+    )
+    parser.add_argument("--verify", action="store_true", help="Check the data digest")
+    args = parser.parse_args()
+
+    if args.scenarios is not None:
+        print(f"\nWriting {args.scenarios} × {args.T} scenarios (seed={args.seed})...")
+        write_store(args.path, args.scenarios, args.T, args.seed, dtype=args.dtype)
+
+    store = ScenarioStore(args.path)
+    size = store.demands.nbytes
+    print(f"\n{args.path}: {store.n_scenarios} scenarios × T={store.T}, {store.demands.dtype}")
+    print(f"Data: {size / 2**20:.1f} MiB at offset {store.header['data_offset']}")
+    print(f"Process: {store.header['process']}")
+    print(f"Seed entropy: {store.seed.entropy}  sha256: {store.digest[:16]}…")
+    if args.verify:
+        print(f"Digest check: {'ok' if store.verify() else 'MISMATCH'}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
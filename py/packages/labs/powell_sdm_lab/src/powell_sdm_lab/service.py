@@ -0,0 +1,340 @@
+"""
+Online decision service around the SDM loop
+
+Where run_policy loops over a pregenerated demand list, the service reacts
+to demand events as they arrive, for many independent SKUs on one asyncio
+event loop. Each SKU has its own policy and InventoryEnv:
+
+    on register:            order = decide(inventory, 0)
+    on event (sku, t, D_t): step(order, D_t), learn(t, D_t),
+                            order = decide(inventory, t + 1)
+
+which is the same sequence of calls as run_policy, so per-SKU results
+match a batch run on the same demands. Events of one SKU are handled in
+order by that SKU's task; different SKUs interleave freely.
+
+Cheap policies decide inline on the loop. Heavy ones (rollout lookahead)
+are offloaded to an executor so one slow decision does not stall every
+other SKU. Decision latency (the decide call) and response latency (event
+received to next order ready, including queueing) are tracked with P²
+sketches, alongside events/sec and deadline misses, to size a deployment.
+Unpaced replay measures saturation throughput (response latency is then
+mostly queueing); pace the source at a target rate to measure latency
+under that load.
+
+Sources are async iterators of DemandEvent: replay_demands() replays
+in-memory streams (optionally paced), replay_file() a CSV event log and
+queue_source() an asyncio.Queue fed by another task.
+"""
+
+import argparse
+import asyncio
+import csv
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from powell_sdm_lab.demand_process import DemandProcess
+from powell_sdm_lab.env_inventory import InventoryEnv
+from powell_sdm_lab.evaluate import DEFAULT_SPECS
+from powell_sdm_lab.policies import LookaheadPolicy
+from powell_sdm_lab.stats import RunningStats, RunSummary
+
+# Policies whose decide() is slow enough to run off the event loop
+HEAVY_POLICIES = (LookaheadPolicy,)
+
+LATENCY_QUANTILES = (0.5, 0.99)
+
+
+@dataclass(frozen=True)
+class DemandEvent:
+    """Demand observed for one SKU in period t."""
+
+    sku: str
+    t: int
+    demand: float
+
+
+async def replay_demands(
+    streams: dict[str, list[float]], rate: float | None = None
+) -> AsyncIterator[DemandEvent]:
+    """
+    Replay per-SKU demand sequences period by period.
+
+    Args:
+        streams: Demand sequence per SKU
+        rate: Events per second to pace at (None: as fast as consumed)
+    """
+    T = max((len(d) for d in streams.values()), default=0)
+    start = time.perf_counter()
+    n = 0
+    for t in range(T):
+        for sku, demands in streams.items():
+            if t < len(demands):
+                if rate:
+                    delay = start + n / rate - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                n += 1
+                yield DemandEvent(sku, t, demands[t])
+        # Let SKU tasks run between periods even when not pacing
+        await asyncio.sleep(0)
+
+
+def write_events(path: Path, events: Iterable[DemandEvent]):
+    """Write events as a CSV log (sku,t,demand) for replay_file."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["sku", "t", "demand"])
+        for event in events:
+            writer.writerow([event.sku, event.t, repr(event.demand)])
+
+
+async def replay_file(path: Path, rate: float | None = None) -> AsyncIterator[DemandEvent]:
+    """
+    Replay a CSV event log written by write_events, in file order.
+
+    Args:
+        path: Event log
+        rate: Events per second to pace at (None: as fast as consumed)
+    """
+    start = time.perf_counter()
+    with open(path, newline="") as f:
+        for n, row in enumerate(csv.DictReader(f)):
+            if rate:
+                delay = start + n / rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif n % 256 == 0:
+                await asyncio.sleep(0)
+            yield DemandEvent(row["sku"], int(row["t"]), float(row["demand"]))
+
+
+async def queue_source(queue: asyncio.Queue) -> AsyncIterator[DemandEvent]:
+    """Yield events put on a queue until a None sentinel arrives."""
+    while (event := await queue.get()) is not None:
+        yield event
+
+
+@dataclass
+class SkuState:
+    """One SKU's policy, environment and next order."""
+
+    policy: object
+    env: InventoryEnv
+    summary: RunSummary = field(default_factory=lambda: RunSummary(quantiles=()))
+    order: float = 0.0
+    t: int = 0
+
+
+@dataclass
+class ServiceStats:
+    """Throughput and latency of a service run."""
+
+    events: int = 0
+    decisions: int = 0
+    deadline_misses: int = 0
+    wall_s: float = 0.0
+    decide: RunningStats = field(default_factory=lambda: RunningStats(LATENCY_QUANTILES))
+    response: RunningStats = field(default_factory=lambda: RunningStats(LATENCY_QUANTILES))
+
+    @property
+    def events_per_sec(self) -> float:
+        """Events handled per second of wall time."""
+        return self.events / self.wall_s if self.wall_s else 0.0
+
+    def report(self) -> dict:
+        """Machine-readable summary (latencies in milliseconds)."""
+
+        def latency(stats: RunningStats) -> dict:
+            if not stats.n:
+                return {"mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+            return {
+                "mean_ms": 1e3 * stats.mean,
+                "p50_ms": 1e3 * stats.quantile(0.5),
+                "p99_ms": 1e3 * stats.quantile(0.99),
+                "max_ms": 1e3 * stats.max,
+            }
+
+        return {
+            "events": self.events,
+            "decisions": self.decisions,
+            "deadline_misses": self.deadline_misses,
+            "wall_s": self.wall_s,
+            "events_per_sec": self.events_per_sec,
+            "decide": latency(self.decide),
+            "response": latency(self.response),
+        }
+
+
+class DecisionService:
+    """
+    Serve order decisions for many SKU demand streams on one event loop.
+
+    SKUs are registered on their first event (or explicitly), each with a
+    fresh policy from policy_factory.
+    """
+
+    def __init__(
+        self,
+        policy_factory: Callable[[str], object],
+        initial_inventory: float = 80.0,
+        executor: Executor | None = None,
+        offload: bool | None = None,
+        deadline: float | None = None,
+        queue_size: int = 64,
+    ):
+        """
+        Args:
+            policy_factory: Builds the policy for a SKU (called with the SKU id)
+            initial_inventory: Starting inventory of every SKU
+            executor: Executor for offloaded decisions (default: the loop's)
+            offload: Run decide() in the executor (None: for HEAVY_POLICIES only)
+            deadline: Response-time budget in seconds; slower responses are
+                counted as misses
+            queue_size: Pending events per SKU before the source is paused
+        """
+        self.policy_factory = policy_factory
+        self.initial_inventory = initial_inventory
+        self.executor = executor
+        self.offload = offload
+        self.deadline = deadline
+        self.queue_size = queue_size
+        self.skus: dict[str, SkuState] = {}
+        self.stats = ServiceStats()
+        self._queues: dict[str, asyncio.Queue] = {}
+
+    async def _decide(self, state: SkuState, t: int) -> float:
+        policy = state.policy
+        offload = self.offload if self.offload is not None else isinstance(policy, HEAVY_POLICIES)
+        t0 = time.perf_counter()
+        if offload:
+            loop = asyncio.get_running_loop()
+            order = await loop.run_in_executor(self.executor, policy.decide, state.env.inventory, t)
+        else:
+            order = policy.decide(state.env.inventory, t)
+        self.stats.decide.update(time.perf_counter() - t0)
+        self.stats.decisions += 1
+        return order
+
+    async def register(self, sku: str) -> SkuState:
+        """Create a SKU's state and make its first decision."""
+        policy = self.policy_factory(sku)
+        state = SkuState(policy, InventoryEnv(initial_inventory=self.initial_inventory))
+        self.skus[sku] = state
+        state.order = await self._decide(state, 0)
+        return state
+
+    async def handle(self, event: DemandEvent, received: float | None = None):
+        """
+        Apply one demand event to its SKU and decide the next order.
+
+        Args:
+            event: Demand event; must be the SKU's next period
+            received: perf_counter() time the event arrived (default: now)
+        """
+        received = time.perf_counter() if received is None else received
+        state = self.skus.get(event.sku) or await self.register(event.sku)
+        if event.t != state.t:
+            raise ValueError(f"SKU {event.sku}: expected period {state.t}, got {event.t}")
+
+        record = state.env.step(state.order, event.demand)
+        state.policy.learn(event.t, event.demand)
+        state.summary.update(record)
+        state.t += 1
+        state.order = await self._decide(state, state.t)
+
+        elapsed = time.perf_counter() - received
+        self.stats.response.update(elapsed)
+        self.stats.events += 1
+        if self.deadline is not None and elapsed > self.deadline:
+            self.stats.deadline_misses += 1
+
+    async def _serve_sku(self, queue: asyncio.Queue):
+        while (item := await queue.get()) is not None:
+            await self.handle(*item)
+
+    async def run(self, source: AsyncIterator[DemandEvent]) -> ServiceStats:
+        """
+        Consume a source to the end, one task per SKU.
+
+        Returns:
+            Service statistics (also kept in self.stats)
+        """
+        start = time.perf_counter()
+        # A failing SKU task cancels the whole group, including this loop
+        async with asyncio.TaskGroup() as group:
+            async for event in source:
+                queue = self._queues.get(event.sku)
+                if queue is None:
+                    queue = self._queues[event.sku] = asyncio.Queue(self.queue_size)
+                    group.create_task(self._serve_sku(queue))
+                await queue.put((event, time.perf_counter()))
+            for queue in self._queues.values():
+                await queue.put(None)
+        self.stats.wall_s += time.perf_counter() - start
+        return self.stats
+
+
+def format_stats(stats: ServiceStats) -> str:
+    """Render throughput and latency percentiles as a fixed-width table."""
+    report = stats.report()
+    lines = [
+        f"Events: {report['events']}  decisions: {report['decisions']}  "
+        f"wall: {report['wall_s']:.3f}s  throughput: {report['events_per_sec']:,.0f} events/s",
+        f"Deadline misses: {report['deadline_misses']}",
+        "",
+        f"{'Latency':<10} {'Mean (ms)':>10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'Max (ms)':>10}",
+        "-" * 54,
+    ]
+    for name in ("decide", "response"):
+        r = report[name]
+        lines.append(
+            f"{name:<10} {r['mean_ms']:>10.3f} {r['p50_ms']:>10.3f} "
+            f"{r['p99_ms']:>10.3f} {r['max_ms']:>10.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Serve order decisions for SKU demand streams")
+    parser.add_argument(
+        "--policy", choices=sorted(DEFAULT_SPECS), default="b", help="Policy for every SKU"
+    )
+    parser.add_argument("--skus", type=int, default=100, help="Independent SKU streams")
+    parser.add_argument("--T", type=int, default=365, help="Periods per SKU (default: 365)")
+    parser.add_argument("--seed", type=int, default=42, help="Root seed; SKU k is scenario k")
+    parser.add_argument("--events", type=Path, default=None, help="Replay this CSV event log")
+    parser.add_argument("--rate", type=float, default=None, help="Pace at events per second")
+    parser.add_argument(
+        "--deadline", type=float, default=None, help="Response budget in milliseconds"
+    )
+    parser.add_argument("--threads", type=int, default=None, help="Executor threads")
+    args = parser.parse_args()
+
+    spec = DEFAULT_SPECS[args.policy]
+    if args.events is not None:
+        source = replay_file(args.events, args.rate)
+        described = f"events from {args.events}"
+    else:
+        demands = DemandProcess().sample(args.skus, args.T, args.seed)
+        streams = {f"sku{k}": row.tolist() for k, row in enumerate(demands)}
+        source = replay_demands(streams, args.rate)
+        described = f"{args.skus} SKUs × {args.T} periods"
+
+    deadline = args.deadline / 1e3 if args.deadline is not None else None
+    print(f"\nServing policy {args.policy} for {described}...\n")
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        service = DecisionService(lambda sku: spec.build(), executor=executor, deadline=deadline)
+        stats = asyncio.run(service.run(source))
+
+    print(format_stats(stats))
+    total = sum(state.summary.total_cost for state in service.skus.values())
+    print(f"\nTotal cost over {len(service.skus)} SKUs: {total:.2f}\n")
+
+
+if __name__ == "__main__":
+    main()
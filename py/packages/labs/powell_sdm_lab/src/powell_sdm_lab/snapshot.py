@@ -0,0 +1,277 @@
+"""
+Snapshot and fork of the simulation loop
+
+Runs the SDM loop to some period t, captures its full state (environment,
+policy internals such as PolicyB's θ or LookaheadPolicy's sampler, and
+the demand RNG) and continues many branches from there in parallel
+instead of repeating the warm-up.
+
+Snapshots serialize to a small binary blob: an 8-byte magic followed by
+zlib-compressed JSON. Floats round-trip exactly, so a restored run is
+bit-identical to the uninterrupted one.
+
+Branches restore the snapshot's RNG state by default, so they see the same
+underlying noise and differ only by their demand shock (common random
+numbers). Give a branch its own seed to draw a fresh future instead.
+"""
+
+import argparse
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from powell_sdm_lab.demand_process import DemandProcess, DemandStream
+from powell_sdm_lab.env_inventory import InventoryEnv, StepRecord
+from powell_sdm_lab.evaluate import DEFAULT_SPECS
+from powell_sdm_lab.policies import LookaheadPolicy, PolicyA, PolicyB, ScheduledBaseStock
+from powell_sdm_lab.stats import RunSummary
+
+SNAPSHOT_MAGIC = b"PWSNAP01"
+
+# Policy classes that can be captured, by name
+POLICY_TYPES = {
+    cls.__name__: cls for cls in (PolicyA, ScheduledBaseStock, PolicyB, LookaheadPolicy)
+}
+
+
+@dataclass
+class Snapshot:
+    """Full state of the SDM loop at the start of period t."""
+
+    t: int
+    env: dict
+    policy_type: str
+    policy: dict
+    rng: dict
+    process: dict
+
+    def to_bytes(self) -> bytes:
+        """Serialize to magic + compressed JSON."""
+        payload = json.dumps(asdict(self), separators=(",", ":")).encode()
+        return SNAPSHOT_MAGIC + zlib.compress(payload)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Snapshot":
+        """Deserialize from to_bytes() output."""
+        if not data.startswith(SNAPSHOT_MAGIC):
+            raise ValueError("not a simulation snapshot")
+        return cls(**json.loads(zlib.decompress(data[len(SNAPSHOT_MAGIC) :])))
+
+    def save(self, path: Path):
+        """Write the snapshot to a file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: Path) -> "Snapshot":
+        """Read a snapshot written by save()."""
+        return cls.from_bytes(path.read_bytes())
+
+
+@dataclass(frozen=True)
+class Branch:
+    """
+    A what-if continuation: demand becomes max(0, scale * D_t + shift).
+
+    Args:
+        label: Display name
+        scale: Multiplicative demand shock
+        shift: Additive demand shock
+        seed: Fresh noise seed (None continues the snapshot's RNG)
+    """
+
+    label: str
+    scale: float = 1.0
+    shift: float = 0.0
+    seed: int | None = None
+
+    def apply(self, demand: float) -> float:
+        """Shocked demand."""
+        if self.scale == 1.0 and self.shift == 0.0:
+            return demand
+        return max(0.0, self.scale * demand + self.shift)
+
+
+class Simulation:
+    """
+    The run_policy loop as a resumable object: env, policy and demand stream.
+
+    Args:
+        env: Inventory environment (its t is the next period to run)
+        policy: Policy instance
+        stream: Demand source for the remaining periods
+        branch: Optional demand shock applied to every drawn demand
+    """
+
+    def __init__(
+        self, env: InventoryEnv, policy, stream: DemandStream, branch: Branch | None = None
+    ):
+        self.env = env
+        self.policy = policy
+        self.stream = stream
+        self.branch = branch
+
+    @classmethod
+    def start(
+        cls,
+        policy,
+        seed: int,
+        initial_inventory: float = 80.0,
+        process: DemandProcess | None = None,
+    ) -> "Simulation":
+        """New run at t = 0 with the same demands as generate_demands(T, seed)."""
+        return cls(InventoryEnv(initial_inventory), policy, DemandStream(seed, process))
+
+    @classmethod
+    def restore(cls, snapshot: Snapshot, branch: Branch | None = None) -> "Simulation":
+        """Continue from a snapshot, optionally under a demand shock."""
+        process = DemandProcess(**snapshot.process)
+        stream = DemandStream(branch.seed if branch and branch.seed is not None else 0, process)
+        if branch is None or branch.seed is None:
+            stream.set_state(snapshot.rng)
+        return cls(
+            InventoryEnv.from_state(snapshot.env),
+            POLICY_TYPES[snapshot.policy_type].from_state(snapshot.policy),
+            stream,
+            branch,
+        )
+
+    @property
+    def t(self) -> int:
+        """Next period to run."""
+        return self.env.t
+
+    def step(self) -> StepRecord:
+        """Run one period: decide, draw demand, transition, learn."""
+        t = self.env.t
+        order_qty = self.policy.decide(self.env.inventory, t)
+        demand = self.stream.next(t)
+        if self.branch is not None:
+            demand = self.branch.apply(demand)
+        record = self.env.step(order_qty, demand)
+        self.policy.learn(t, demand)
+        return record
+
+    def run(self, T: int, summary: RunSummary | None = None) -> RunSummary:
+        """
+        Step until period T (exclusive).
+
+        Args:
+            T: End of the horizon
+            summary: Summary to fold records into (default: a new one)
+
+        Returns:
+            Summary of the periods run by this call
+        """
+        summary = summary if summary is not None else RunSummary(quantiles=())
+        while self.env.t < T:
+            summary.update(self.step())
+        return summary
+
+    def snapshot(self) -> Snapshot:
+        """Capture the current state."""
+        return Snapshot(
+            t=self.env.t,
+            env=self.env.get_state(),
+            policy_type=type(self.policy).__name__,
+            policy=self.policy.get_state(),
+            rng=self.stream.get_state(),
+            process=asdict(self.stream.process),
+        )
+
+
+def _run_branch(task: tuple[bytes, Branch, int]) -> dict[str, float]:
+    data, branch, T = task
+    return Simulation.restore(Snapshot.from_bytes(data), branch).run(T).metrics()
+
+
+def fork(
+    snapshot: Snapshot, branches: list[Branch], T: int, workers: int | None = None
+) -> list[dict[str, float]]:
+    """
+    Continue every branch from a snapshot to period T.
+
+    Workers receive the compact serialized snapshot, not live objects. T
+    must be after snapshot.t (ValueError otherwise).
+
+    Args:
+        snapshot: Starting state
+        branches: What-if continuations
+        T: End of the horizon
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+
+    Returns:
+        Metrics over periods snapshot.t .. T-1, one dict per branch
+    """
+    if T <= snapshot.t:
+        raise ValueError(f"empty horizon: snapshot is at t={snapshot.t}, T={T}")
+    data = snapshot.to_bytes()
+    tasks = [(data, branch, T) for branch in branches]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [_run_branch(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        return list(pool.map(_run_branch, tasks))
+
+
+def parse_branch(spec: str) -> Branch:
+    """Parse "scale:shift" or "scale:shift:seed" into a Branch."""
+    parts = spec.split(":")
+    scale, shift = float(parts[0]), float(parts[1]) if len(parts) > 1 else 0.0
+    seed = int(parts[2]) if len(parts) > 2 else None
+    return Branch(spec, scale, shift, seed)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Warm up a run, snapshot it and fork what-ifs")
+    parser.add_argument("--policy", choices=sorted(DEFAULT_SPECS), default="b")
+    parser.add_argument("--seed", type=int, default=42, help="Demand seed (default: 42)")
+    parser.add_argument("--warmup", type=int, default=200, help="Periods before the fork")
+    parser.add_argument("--T", type=int, default=365, help="Time periods (default: 365)")
+    parser.add_argument(
+        "--branch",
+        action="append",
+        default=None,
+        help="scale:shift[:seed] demand shock (repeatable; default: a few shocks)",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--save", type=Path, default=None, help="Write the snapshot here")
+    parser.add_argument("--load", type=Path, default=None, help="Fork from a saved snapshot")
+    args = parser.parse_args()
+    if args.load is None and args.warmup >= args.T:
+        parser.error(f"--warmup ({args.warmup}) must be less than --T ({args.T})")
+
+    if args.load is not None:
+        snapshot = Snapshot.load(args.load)
+    else:
+        sim = Simulation.start(DEFAULT_SPECS[args.policy].build(), args.seed)
+        sim.run(args.warmup)
+        snapshot = sim.snapshot()
+    if args.save is not None:
+        snapshot.save(args.save)
+        print(f"\nSnapshot at t={snapshot.t} written to {args.save}")
+
+    specs = args.branch or ["1:0", "1.2:0", "0.8:0", "1:20"]
+    branches = [parse_branch(spec) for spec in specs]
+    try:
+        results = fork(snapshot, branches, args.T, workers=args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"\nBranches from t={snapshot.t} to T={args.T} ({snapshot.policy_type}):\n")
+    print(f"{'Branch':<16} {'Total cost':>12} {'Stockouts':>12} {'Avg inv':>10}")
+    print("-" * 53)
+    for branch, metrics in zip(branches, results):
+        print(
+            f"{branch.label:<16} {metrics['total_cost']:>12.2f} "
+            f"{metrics['total_stockouts']:>12.2f} {metrics['avg_inventory']:>10.2f}"
+        )
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Online summary statistics
+
+Constant-memory accumulators updated once per step of the SDM loop, so a
+run does not need to keep its full record history to be summarized.
+
+- RunningStats: count, exact running total, Welford mean/variance, min/max
+- P2Quantile: streaming quantile estimate (Jain & Chlamtac P² algorithm)
+- RunSummary: the per-run bundle that run_policy updates and
+  trace.write_summary consumes
+"""
+
+import math
+
+from powell_sdm_lab.env_inventory import StepRecord
+
+# Quantiles for callers that want distribution lines in trace summaries
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class P2Quantile:
+    """
+    Streaming estimate of one quantile using five markers (P² algorithm).
+
+    Exact for the first five values.
+    """
+
+    def __init__(self, p: float):
+        """
+        Args:
+            p: Quantile to track, in (0, 1)
+        """
+        self.p = p
+        self.count = 0
+        self._q: list[float] = []  # marker heights
+        self._n = [0, 1, 2, 3, 4]  # marker positions
+        self._np = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]  # desired positions
+        self._dn = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def update(self, x: float):
+        """Add one observation."""
+        self.count += 1
+        q = self._q
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        # Find cell k containing x, extending the extremes if needed
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        n = self._n
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._np[i] += self._dn[i]
+
+        # Adjust the three middle markers
+        for i in range(1, 4):
+            d = self._np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                qp = self._parabolic(i, s)
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+                q[i] = qp
+                n[i] += s
+
+    def _parabolic(self, i: int, s: int) -> float:
+        q, n = self._q, self._n
+        return q[i] + s / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> float:
+        """Current quantile estimate (NaN before any observation)."""
+        q = self._q
+        if not q:
+            return math.nan
+        if self.count <= 5:
+            # Markers still hold the whole (sorted) sample
+            return q[round(self.p * (len(q) - 1))]
+        return q[2]
+
+
+class RunningStats:
+    """
+    Count, total, mean, variance, min and max of a stream of values.
+
+    The total is accumulated in arrival order, so it equals sum() over the
+    same values exactly. Mean and variance use Welford's update.
+    """
+
+    def __init__(self, quantiles: tuple[float, ...] = ()):
+        """
+        Args:
+            quantiles: Quantiles to track with P² sketches
+        """
+        self.n = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def update(self, x: float):
+        """Add one observation."""
+        self.n += 1
+        self.total += x
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        for sketch in self.quantiles.values():
+            sketch.update(x)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 with fewer than two observations)."""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+    def quantile(self, p: float) -> float:
+        """Estimate of a tracked quantile."""
+        return self.quantiles[p].value
+
+
+class RunSummary:
+    """
+    Online summary of one run: per-step cost, stockout and ending inventory.
+
+    Totals match summing a full list of StepRecords exactly.
+    """
+
+    def __init__(self, quantiles: tuple[float, ...] = ()):
+        """
+        Args:
+            quantiles: Quantiles to sketch for cost and inventory (none by
+                default: every sketch is a Python update per step; pass
+                SUMMARY_QUANTILES to opt in)
+        """
+        self.cost = RunningStats(quantiles)
+        self.stockout = RunningStats()
+        self.inventory = RunningStats(quantiles)
+
+    def update(self, record: StepRecord):
+        """Fold one step record into the summary."""
+        self.cost.update(record.cost)
+        self.stockout.update(record.stockout)
+        self.inventory.update(record.inventory_next)
+
+    @property
+    def n(self) -> int:
+        """Number of steps seen."""
+        return self.cost.n
+
+    @property
+    def total_cost(self) -> float:
+        """Sum of per-step costs."""
+        return self.cost.total
+
+    @property
+    def total_stockouts(self) -> float:
+        """Sum of per-step stockouts."""
+        return self.stockout.total
+
+    @property
+    def avg_inventory(self) -> float:
+        """Mean end-of-period inventory."""
+        return self.inventory.total / self.n
+
+    def metrics(self) -> dict[str, float]:
+        """The three headline metrics as a dict."""
+        return {
+            "total_cost": self.total_cost,
+            "total_stockouts": self.total_stockouts,
+            "avg_inventory": self.avg_inventory,
+        }
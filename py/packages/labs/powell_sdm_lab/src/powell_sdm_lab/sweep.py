@@ -0,0 +1,413 @@
+"""
+Parameter sweeps for policy tuning
+
+Evaluates a policy at many parameter points (a full grid, random samples or
+a Latin hypercube) and reports the Pareto front of mean cost against mean
+stockouts.
+
+Every point is scored on the same demand matrix (common random numbers),
+so differences between points come from the parameters, not from noise.
+Each worker generates that matrix once from the seed (or maps it from a
+scenario store) instead of receiving it by pickling. Order-up-to policies
+are scored with the closed-form evaluator in fastpath, so fine grids over S
+cost little. Results are cached by a content hash of (policy, params,
+scenario set, env costs, code), with --cache-dir in the shared evaluation
+cache, so repeated sweeps only evaluate new points; profiling covers those
+evaluated points only.
+"""
+
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from powell_sdm_lab.cache import DEFAULT_CACHE_DIR, EvalCache, cache_key, demand_identity
+from powell_sdm_lab.demand_process import DemandProcess
+from powell_sdm_lab.evaluate import POLICY_CLASSES
+from powell_sdm_lab.fastpath import simulate_fast
+from powell_sdm_lab.profiling import Profiler, merge_reports, write_report
+from powell_sdm_lab.scenario_store import open_store
+
+
+@dataclass(frozen=True)
+class ScenarioSet:
+    """
+    The common demand scenarios every point is scored on.
+
+    With `store` set, the scenarios are the first n_scenarios rows (first T
+    periods) of that scenario store and `seed` is not used.
+    """
+
+    n_scenarios: int
+    T: int
+    seed: int
+    initial_inventory: float = 80.0
+    store: str | None = None
+
+    def demands(self) -> np.ndarray:
+        """Generate the (n_scenarios × T) demand matrix (a memmap view for stores)."""
+        if self.store is not None:
+            return open_store(self.store).rows(0, self.n_scenarios, self.T)
+        return DemandProcess().sample(self.n_scenarios, self.T, self.seed)
+
+    def identity(self) -> dict:
+        """What determines the scenarios: a store counts by content, not path."""
+        identity = asdict(self)
+        digest = open_store(self.store).digest if self.store is not None else None
+        identity["store"] = digest
+        identity["demand"] = demand_identity(store_digest=digest)
+        return identity
+
+
+@dataclass
+class SweepResult:
+    """Scores of one parameter point."""
+
+    policy: str
+    params: dict
+    mean_cost: float
+    stdev_cost: float
+    mean_stockouts: float
+    mean_inventory: float
+
+
+def grid(axes: dict[str, list[float]]) -> list[dict]:
+    """
+    Full Cartesian grid of parameter values.
+
+    Args:
+        axes: Parameter name -> values
+
+    Returns:
+        One params dict per grid point
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def random_points(bounds: dict[str, tuple[float, float]], n: int, seed: int = 0) -> list[dict]:
+    """
+    Independent uniform samples inside parameter bounds.
+
+    Args:
+        bounds: Parameter name -> (low, high)
+        n: Number of points
+        seed: Sampling seed
+
+    Returns:
+        n params dicts
+    """
+    rng = np.random.default_rng(seed)
+    columns = {name: rng.uniform(lo, hi, size=n) for name, (lo, hi) in bounds.items()}
+    return [{name: float(col[i]) for name, col in columns.items()} for i in range(n)]
+
+
+def latin_hypercube(bounds: dict[str, tuple[float, float]], n: int, seed: int = 0) -> list[dict]:
+    """
+    Latin hypercube samples: each axis is cut into n strata, each used once.
+
+    Args:
+        bounds: Parameter name -> (low, high)
+        n: Number of points
+        seed: Sampling seed
+
+    Returns:
+        n params dicts
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, (lo, hi) in bounds.items():
+        u = (rng.permutation(n) + rng.uniform(size=n)) / n
+        columns[name] = lo + u * (hi - lo)
+    return [{name: float(col[i]) for name, col in columns.items()} for i in range(n)]
+
+
+class SweepCache:
+    """
+    Results keyed by (policy, params, scenario set), optionally persisted as JSON.
+
+    Keys are content hashes (cache.cache_key), so they also cover the env
+    costs and the package code. With a shared EvalCache behind it, points
+    evaluated by any earlier sweep are reused as well.
+
+    Args:
+        path: JSON file to load from and save to (None keeps results in memory)
+        store: Shared evaluation cache to read through and write back to
+    """
+
+    def __init__(self, path: Path | None = None, store: EvalCache | None = None):
+        self.path = path
+        self.store = store
+        self.entries: dict[str, dict] = {}
+        self._pending: dict[str, dict] = {}
+        if path is not None and path.exists():
+            self.entries = json.loads(path.read_text())
+
+    @staticmethod
+    def key(policy: str, params: dict, scenarios: ScenarioSet) -> str:
+        """Stable hash of everything that determines a result."""
+        return cache_key(
+            "sweep", POLICY_CLASSES[policy].__name__, params, scenarios=scenarios.identity()
+        )
+
+    def prefetch(self, keys: list[str]):
+        """Load the shared cache's entries for these keys in one query."""
+        if self.store is not None:
+            missing = [key for key in keys if key not in self.entries]
+            self.entries.update(self.store.get_many(missing))
+
+    def get(self, key: str) -> SweepResult | None:
+        """Cached result, or None."""
+        entry = self.entries.get(key)
+        return SweepResult(**entry) if entry is not None else None
+
+    def put(self, key: str, result: SweepResult):
+        """Store a result."""
+        self.entries[key] = self._pending[key] = asdict(result)
+
+    def save(self):
+        """Write entries to the JSON file and new ones to the shared cache."""
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.entries))
+        if self.store is not None and self._pending:
+            self.store.put_many([(key, "sweep", entry) for key, entry in self._pending.items()])
+        self._pending.clear()
+
+
+# Per-worker copy of the common demand matrix, built once by _init_worker
+_demands: np.ndarray | None = None
+
+
+def _init_worker(scenarios: ScenarioSet):
+    global _demands
+    _demands = scenarios.demands()
+
+
+def evaluate_point(
+    policy: str,
+    params: dict,
+    demands: np.ndarray,
+    initial_inventory: float,
+    profiler: Profiler | None = None,
+) -> SweepResult:
+    """
+    Score one parameter point on a demand matrix.
+
+    Args:
+        policy: Policy kind ("a" or "b")
+        params: Constructor parameters
+        demands: Demand matrix, shape (N, T)
+        initial_inventory: Starting inventory level
+        profiler: If given, time the evaluation phases
+
+    Returns:
+        SweepResult with means over scenarios
+    """
+    metrics = simulate_fast(POLICY_CLASSES[policy](**params), demands, initial_inventory, profiler)
+    return SweepResult(
+        policy=policy,
+        params=params,
+        mean_cost=float(metrics["total_cost"].mean()),
+        stdev_cost=float(metrics["total_cost"].std(ddof=1)) if len(demands) > 1 else 0.0,
+        mean_stockouts=float(metrics["total_stockouts"].mean()),
+        mean_inventory=float(metrics["avg_inventory"].mean()),
+    )
+
+
+def _evaluate_task(task: tuple[str, dict, float, bool], demands: np.ndarray):
+    policy, params, initial_inventory, profile = task
+    profiler = Profiler() if profile else None
+    result = evaluate_point(policy, params, demands, initial_inventory, profiler)
+    return result, profiler.report() if profiler is not None else None
+
+
+def _evaluate_in_worker(task: tuple[str, dict, float, bool]):
+    return _evaluate_task(task, _demands)
+
+
+def sweep(
+    policy: str,
+    points: list[dict],
+    scenarios: ScenarioSet,
+    workers: int | None = None,
+    cache: SweepCache | None = None,
+    profile_path: Path | None = None,
+) -> list[SweepResult]:
+    """
+    Evaluate a policy at every parameter point on common scenarios.
+
+    Args:
+        policy: Policy kind ("a" or "b")
+        points: Parameter dicts to evaluate
+        scenarios: Common demand scenarios
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        cache: Result cache; hits are not re-evaluated
+        profile_path: If given, profile each evaluated point and write the
+            merged report (JSON) here
+
+    Returns:
+        One SweepResult per point, in input order
+    """
+    cache = cache if cache is not None else SweepCache()
+    keys = [SweepCache.key(policy, params, scenarios) for params in points]
+    cache.prefetch(keys)
+
+    todo = [(key, params) for key, params in zip(keys, points) if cache.get(key) is None]
+    # Duplicate points only need evaluating once
+    todo = list(dict(todo).items())
+    profile = profile_path is not None
+    tasks = [(policy, params, scenarios.initial_inventory, profile) for _, params in todo]
+
+    workers = workers or os.cpu_count() or 1
+    if not tasks:
+        outputs = []
+    elif workers == 1:
+        demands = scenarios.demands()
+        outputs = [_evaluate_task(task, demands) for task in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(scenarios,)
+        ) as pool:
+            chunk_size = max(1, len(tasks) // (workers * 4))
+            outputs = list(pool.map(_evaluate_in_worker, tasks, chunksize=chunk_size))
+
+    for (key, _), (result, _) in zip(todo, outputs):
+        cache.put(key, result)
+    cache.save()
+
+    if profile:
+        meta = {"policy": policy, "points": len(outputs), **asdict(scenarios)}
+        write_report(merge_reports([report for _, report in outputs], meta), profile_path)
+
+    return [cache.get(key) for key in keys]
+
+
+def pareto_front(results: list[SweepResult]) -> list[SweepResult]:
+    """
+    Points not dominated in (mean cost, mean stockouts), sorted by cost.
+
+    A point is dominated if another is no worse on both and better on one.
+    """
+    ordered = sorted(results, key=lambda r: (r.mean_cost, r.mean_stockouts))
+    front = []
+    best_stockouts = float("inf")
+    for r in ordered:
+        if r.mean_stockouts < best_stockouts:
+            front.append(r)
+            best_stockouts = r.mean_stockouts
+    return front
+
+
+def parse_axis(spec: str) -> tuple[str, list[float] | tuple[float, float]]:
+    """
+    Parse a CLI parameter spec.
+
+    "name=lo:hi:step" gives a grid axis, "name=v1,v2,..." explicit values,
+    "name=lo:hi" bounds for random / Latin hypercube sampling.
+    """
+    name, _, values = spec.partition("=")
+    if ":" in values:
+        parts = [float(v) for v in values.split(":")]
+        if len(parts) == 2:
+            return name, (parts[0], parts[1])
+        lo, hi, step = parts
+        return name, np.arange(lo, hi + step / 2, step).round(10).tolist()
+    return name, [float(v) for v in values.split(",")]
+
+
+def format_results(results: list[SweepResult]) -> str:
+    """Render sweep results as a fixed-width table."""
+    lines = [
+        f"{'Params':<40} {'Mean cost':>12} {'Sd cost':>10} {'Stockouts':>12} {'Avg inv':>10}",
+        "-" * 88,
+    ]
+    for r in results:
+        params = ", ".join(f"{k}={v:g}" for k, v in r.params.items())
+        lines.append(
+            f"{params:<40} {r.mean_cost:>12.2f} {r.stdev_cost:>10.2f} "
+            f"{r.mean_stockouts:>12.2f} {r.mean_inventory:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Sweep policy parameters against cost")
+    parser.add_argument("--policy", choices=sorted(POLICY_CLASSES), required=True)
+    parser.add_argument(
+        "--param",
+        action="append",
+        required=True,
+        help="name=lo:hi:step, name=v1,v2,... (grid) or name=lo:hi (random/lhs)",
+    )
+    parser.add_argument("--method", choices=["grid", "random", "lhs"], default="grid")
+    parser.add_argument("--samples", type=int, default=50, help="Points for random/lhs")
+    parser.add_argument(
+        "--sample-seed", type=int, default=0, help="Seed for random/lhs points (default: 0)"
+    )
+    parser.add_argument("--scenarios", type=int, default=200, help="Common demand scenarios")
+    parser.add_argument("--seed", type=int, default=42, help="Demand seed (default: 42)")
+    parser.add_argument("--T", type=int, default=365, help="Time periods (default: 365)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--cache", type=Path, default=None, help="JSON result cache file")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_CACHE_DIR,
+        default=None,
+        help="Also use this shared result cache (no value: runs/cache; default: off)",
+    )
+    parser.add_argument(
+        "--profile", type=Path, default=None, help="Write merged phase timings (JSON) here"
+    )
+    parser.add_argument("--store", type=Path, default=None, help="Scenario store to score on")
+    args = parser.parse_args()
+
+    axes = dict(parse_axis(spec) for spec in args.param)
+    if args.method == "grid":
+        if any(isinstance(v, tuple) for v in axes.values()):
+            parser.error("grid needs name=lo:hi:step or name=v1,v2,...")
+        points = grid(axes)
+    else:
+        if not all(isinstance(v, tuple) for v in axes.values()):
+            parser.error(f"{args.method} needs name=lo:hi bounds")
+        sampler = random_points if args.method == "random" else latin_hypercube
+        points = sampler(axes, args.samples, seed=args.sample_seed)
+
+    store = str(args.store) if args.store is not None else None
+    scenarios = ScenarioSet(args.scenarios, args.T, args.seed, store=store)
+    print(
+        f"\nSweeping policy {args.policy} over {len(points)} points "
+        f"on {args.scenarios} scenarios...\n"
+    )
+    shared = EvalCache(args.cache_dir) if args.cache_dir is not None else None
+    try:
+        results = sweep(
+            args.policy,
+            points,
+            scenarios,
+            workers=args.workers,
+            cache=SweepCache(args.cache, shared),
+            profile_path=args.profile,
+        )
+    finally:
+        if shared is not None:
+            shared.close()
+
+    print(format_results(sorted(results, key=lambda r: r.mean_cost)[:20]))
+    print("\nPareto front (cost vs stockouts):\n")
+    print(format_results(pareto_front(results)))
+    if args.profile is not None:
+        print(f"\nProfile written to {args.profile}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,70 @@
 """
 Trace writer
 
-Produces human-readable step-by-step logs of the SDM loop.
+Produces step-by-step logs of the SDM loop.
 Primary learning artifact for understanding Powell's framework.
+
+Two trace sinks share one interface (context manager + write_step):
+- TraceWriter: human-readable fixed-width text (the default)
+- ColumnarTraceWriter: buffered binary column blocks with a schema header,
+  so tools can load whole columns without parsing text
+
+Both support jumping to step t without scanning. Text traces get a sidecar
+index (`<trace>.idx`: magic, then one uint64 byte offset per row plus the
+end of the last row). Columnar blocks are fixed-size except the last, so
+the block holding step t is found by arithmetic.
 """
 
+import json
+import struct
+from array import array
 from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+
 from powell_sdm_lab.env_inventory import StepRecord
+from powell_sdm_lab.stats import RunSummary
+
+# Trace columns, in file order (header label, StepRecord field or extra)
+COLUMNS = [
+    ("t", "t"),
+    ("I_t", "inventory_pre"),
+    ("q_t", "order_qty"),
+    ("I_post", "inventory_post"),
+    ("D_t+1", "demand"),
+    ("sales", "sales"),
+    ("I_t+1", "inventory_next"),
+    ("stockout", "stockout"),
+    ("cost", "cost"),
+    ("yhat", "forecast"),
+    ("err", "forecast_error"),
+]
+
+COLUMNAR_MAGIC = b"PWCOLTR1"
+INDEX_MAGIC = b"PWTRIDX1"
+
+
+class TraceSink(Protocol):
+    """Anything run_policy can write trace steps to."""
+
+    def __enter__(self): ...
+
+    def __exit__(self, exc_type, exc_val, exc_tb): ...
+
+    def write_step(
+        self,
+        record: StepRecord,
+        forecast: float | None = None,
+        forecast_error: float | None = None,
+    ): ...
+
+
+def format_value(v) -> str:
+    """Integral values print without decimals, everything else with two."""
+    if isinstance(v, int) or v.is_integer():
+        return f"{int(v):>8}"
+    return f"{v:>8.2f}"
 
 
 class TraceWriter:
@@ -15,47 +73,71 @@ class TraceWriter:
 
     Each line records one complete time step through Powell's loop.
     Format is designed for human readability and side-by-side comparison.
+
+    Lines go through the file object's buffer; pass flush_every to force a
+    flush every N steps (e.g. to follow a long run with `tail -f`).
+
+    The byte offset of every row is recorded in a sidecar index, written
+    in batches alongside the trace.
     """
 
-    def __init__(self, filepath: Path):
+    def __init__(self, filepath: Path, flush_every: int | None = None, index: bool = True):
         """
         Initialize trace writer.
 
         Args:
             filepath: Output file path
+            flush_every: Flush to disk every N steps (default: only on close)
+            index: Write the sidecar offset index
         """
         self.filepath = filepath
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.index = index
         self.file = None
+        self._pending = 0
+
+        self._index_file = None
+        self._offsets = array("Q")
+        self._offset = 0
 
     def __enter__(self):
         """Open file and write header."""
-        self.file = open(self.filepath, "w")
+        self.file = open(self.filepath, "w", newline="\n")
+        idx = index_path(self.filepath)
+        if self.index:
+            self._index_file = open(idx, "wb")
+            self._index_file.write(INDEX_MAGIC)
+        else:
+            # A stale index from an earlier run would point at the wrong rows
+            idx.unlink(missing_ok=True)
         self._write_header()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Close file."""
+        """Close file and finish the index with the end of the last row."""
         if self.file:
             self.file.close()
+        if self._index_file:
+            self._offsets.append(self._offset)
+            self._write_offsets()
+            self._index_file.close()
 
     def _write_header(self):
         """Write column headers."""
-        headers = [
-            "t",
-            "I_t",
-            "q_t",
-            "I_post",
-            "D_t+1",
-            "sales",
-            "I_t+1",
-            "stockout",
-            "cost",
-            "yhat",
-            "err",
-        ]
-        self.file.write("  ".join(f"{h:>8}" for h in headers) + "\n")
-        self.file.write("-" * (10 * len(headers) + len(headers) - 1) + "\n")
+        headers = [label for label, _ in COLUMNS]
+        self._write_line("  ".join(f"{h:>8}" for h in headers))
+        self._write_line("-" * (10 * len(headers) + len(headers) - 1))
+
+    def _write_line(self, line: str):
+        """Write one line, tracking its byte offset (lines are ASCII)."""
+        self.file.write(line + "\n")
+        self._offset += len(line) + 1
+
+    def _write_offsets(self):
+        """Append buffered row offsets to the index file."""
+        self._offsets.tofile(self._index_file)
+        del self._offsets[:]
 
     def write_step(
         self,
@@ -71,7 +153,115 @@ class TraceWriter:
             forecast: Optional forecast (Policy B only)
             forecast_error: Optional forecast error (Policy B only)
         """
-        values = [
+        line = "  ".join(
+            (
+                format_value(record.t),
+                format_value(record.inventory_pre),
+                format_value(record.order_qty),
+                format_value(record.inventory_post),
+                format_value(record.demand),
+                format_value(record.sales),
+                format_value(record.inventory_next),
+                format_value(record.stockout),
+                format_value(record.cost),
+                format_value(forecast if forecast is not None else 0.0),
+                format_value(forecast_error if forecast_error is not None else 0.0),
+            )
+        )
+        if self._index_file:
+            self._offsets.append(self._offset)
+            if len(self._offsets) >= 8192:
+                self._write_offsets()
+        self._write_line(line)
+
+        if self.flush_every:
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self.file.flush()
+                self._pending = 0
+
+
+class ColumnarTraceWriter:
+    """
+    Writes binary columnar trace files.
+
+    Layout:
+        magic (8 bytes) | header length (uint32 LE) | JSON schema header
+        then blocks of:  n_rows (uint32 LE) | column 0 | column 1 | ...
+        where each column is n_rows little-endian float64 values.
+
+    Steps are buffered in a preallocated (columns × block_rows) array and
+    written one block at a time. Missing forecasts are stored as NaN.
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        block_rows: int = 4096,
+        flush_every: int | None = None,
+        metadata: dict | None = None,
+        columns: list[tuple[str, str]] | None = None,
+    ):
+        """
+        Initialize columnar trace writer.
+
+        Args:
+            filepath: Output file path
+            block_rows: Steps buffered per block
+            flush_every: Flush to disk every N blocks (default: only on close)
+            metadata: Extra JSON-serializable info stored in the header
+            columns: (label, field) pairs to store (default: COLUMNS)
+        """
+        self.filepath = filepath
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.block_rows = block_rows
+        self.flush_every = flush_every
+        self.metadata = metadata or {}
+        self.columns = columns or COLUMNS
+        self.file = None
+
+        self._buffer = np.empty((len(self.columns), block_rows), dtype="<f8")
+        self._n = 0
+        self._blocks = 0
+
+    def __enter__(self):
+        """Open file and write schema header."""
+        self.file = open(self.filepath, "wb")
+        header = json.dumps(
+            {
+                "columns": [label for label, _ in self.columns],
+                "fields": [name for _, name in self.columns],
+                "dtype": "<f8",
+                "block_rows": self.block_rows,
+                "metadata": self.metadata,
+            }
+        ).encode()
+        self.file.write(COLUMNAR_MAGIC)
+        self.file.write(struct.pack("<I", len(header)))
+        self.file.write(header)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Write the last partial block and close file."""
+        if self.file:
+            self._write_block()
+            self.file.close()
+
+    def write_step(
+        self,
+        record: StepRecord,
+        forecast: float | None = None,
+        forecast_error: float | None = None,
+    ):
+        """
+        Buffer one step, writing a block when the buffer is full.
+
+        Args:
+            record: Step record from environment
+            forecast: Optional forecast (Policy B only)
+            forecast_error: Optional forecast error (Policy B only)
+        """
+        self._buffer[:, self._n] = (
             record.t,
             record.inventory_pre,
             record.order_qty,
@@ -81,40 +271,287 @@ class TraceWriter:
             record.inventory_next,
             record.stockout,
             record.cost,
-            forecast if forecast is not None else 0.0,
-            forecast_error if forecast_error is not None else 0.0,
-        ]
+            forecast if forecast is not None else np.nan,
+            forecast_error if forecast_error is not None else np.nan,
+        )
+        self._n += 1
+        if self._n == self.block_rows:
+            self._write_block()
+
+    def _write_block(self):
+        """Write buffered rows as one block."""
+        if self._n == 0:
+            return
+        self.file.write(struct.pack("<I", self._n))
+        self.file.write(np.ascontiguousarray(self._buffer[:, : self._n]).tobytes())
+        self._n = 0
+        self._blocks += 1
+
+        if self.flush_every and self._blocks % self.flush_every == 0:
+            self.file.flush()
+
 
-        # Format numeric values
-        formatted = []
-        for v in values:
-            if isinstance(v, int) or (isinstance(v, float) and v == int(v)):
-                formatted.append(f"{int(v):>8}")
-            else:
-                formatted.append(f"{v:>8.2f}")
+class LockstepTraceWriter(ColumnarTraceWriter):
+    """
+    Columnar trace of several policies run in lockstep on one demand stream.
+
+    Each policy gets its own copy of COLUMNS, labelled "<policy>/<label>",
+    and the header metadata lists the policies in order. The file is an
+    ordinary columnar trace, so read_columns and iter_columnar_blocks work
+    unchanged (read_columns returns e.g. "b/cost").
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        policies: list[str],
+        block_rows: int = 4096,
+        flush_every: int | None = None,
+        metadata: dict | None = None,
+    ):
+        """
+        Initialize lockstep trace writer.
+
+        Args:
+            filepath: Output file path
+            policies: Policy names, in the order steps are passed
+            block_rows: Steps buffered per block
+            flush_every: Flush to disk every N blocks (default: only on close)
+            metadata: Extra JSON-serializable info stored in the header
+        """
+        self.policies = list(policies)
+        super().__init__(
+            filepath,
+            block_rows,
+            flush_every,
+            metadata={**(metadata or {}), "policies": self.policies},
+            columns=[
+                (f"{policy}/{label}", field) for policy in self.policies for label, field in COLUMNS
+            ],
+        )
+
+    def write_steps(self, steps: list[tuple[StepRecord, float | None, float | None]]):
+        """
+        Buffer one period for every policy.
+
+        Args:
+            steps: (record, forecast, forecast_error) per policy, in policy order
+        """
+        column = self._buffer[:, self._n]
+        width = len(COLUMNS)
+        for i, (record, forecast, forecast_error) in enumerate(steps):
+            column[i * width : (i + 1) * width] = (
+                record.t,
+                record.inventory_pre,
+                record.order_qty,
+                record.inventory_post,
+                record.demand,
+                record.sales,
+                record.inventory_next,
+                record.stockout,
+                record.cost,
+                forecast if forecast is not None else np.nan,
+                forecast_error if forecast_error is not None else np.nan,
+            )
+        self._n += 1
+        if self._n == self.block_rows:
+            self._write_block()
+
+
+TRACE_FORMATS = {
+    "text": TraceWriter,
+    "columnar": ColumnarTraceWriter,
+}
+
+TRACE_SUFFIXES = {
+    "text": ".txt",
+    "columnar": ".ctrace",
+}
+
+
+def open_trace(filepath: Path, trace_format: str = "text", **kwargs) -> TraceSink:
+    """
+    Create a trace sink for the given format.
+
+    Args:
+        filepath: Output file path
+        trace_format: "text" or "columnar"
+        **kwargs: Passed to the sink (flush_every, block_rows, metadata)
+
+    Returns:
+        Trace sink (use as a context manager)
+    """
+    return TRACE_FORMATS[trace_format](filepath, **kwargs)
+
+
+def is_columnar(filepath: Path) -> bool:
+    """True if the file starts with the columnar trace magic."""
+    with open(filepath, "rb") as f:
+        return f.read(len(COLUMNAR_MAGIC)) == COLUMNAR_MAGIC
+
+
+def read_columnar_header(f) -> dict:
+    """Read the schema header from an open columnar trace (positioned at start)."""
+    if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError(f"{f.name} is not a columnar trace file")
+    (length,) = struct.unpack("<I", f.read(4))
+    return json.loads(f.read(length))
+
+
+def iter_columnar_blocks(filepath: Path, start: int = 0, end: int | None = None):
+    """
+    Yield (header, block) pairs, one per stored block.
 
-        self.file.write("  ".join(formatted) + "\n")
-        self.file.flush()  # Ensure immediate write
+    Each block is a (columns × rows) float64 array; only one block is held
+    in memory at a time. With a window, the first block is found by seeking
+    (every block but the last holds block_rows rows) and blocks are trimmed
+    to rows start .. end-1.
+
+    Args:
+        filepath: Columnar trace path
+        start: First row to yield
+        end: Row to stop before (default: end of trace)
+    """
+    with open(filepath, "rb") as f:
+        header = read_columnar_header(f)
+        n_cols = len(header["columns"])
+        dtype = np.dtype(header["dtype"])
+        block_rows = header["block_rows"]
+
+        first = start // block_rows
+        f.seek(first * (4 + n_cols * block_rows * dtype.itemsize), 1)
+        row = first * block_rows
+        while end is None or row < end:
+            raw = f.read(4)
+            if not raw:
+                return
+            (n_rows,) = struct.unpack("<I", raw)
+            data = np.frombuffer(f.read(n_cols * n_rows * dtype.itemsize), dtype=dtype)
+            block = data.reshape(n_cols, n_rows)
+            lo = max(start - row, 0)
+            hi = n_rows if end is None else min(n_rows, end - row)
+            if lo < hi:
+                yield header, block[:, lo:hi] if (lo, hi) != (0, n_rows) else block
+            row += n_rows
+
+
+def read_columns(filepath: Path) -> tuple[dict, dict[str, np.ndarray]]:
+    """
+    Load a columnar trace as whole columns.
+
+    Args:
+        filepath: Columnar trace path
+
+    Returns:
+        (header, {column label: float64 array})
+    """
+    with open(filepath, "rb") as f:
+        header = read_columnar_header(f)
+    blocks = [block for _, block in iter_columnar_blocks(filepath)]
+    n_cols = len(header["columns"])
+    data = np.concatenate(blocks, axis=1) if blocks else np.empty((n_cols, 0))
+    return header, dict(zip(header["columns"], data))
+
+
+def index_path(filepath: Path) -> Path:
+    """Sidecar offset index path for a text trace."""
+    return filepath.with_name(filepath.name + ".idx")
+
+
+def build_index(filepath: Path) -> Path:
+    """
+    Write the sidecar index for a text trace by scanning it once.
+
+    For traces written without an index; TraceWriter normally writes it.
+
+    Returns:
+        Index path
+    """
+    offsets = array("Q")
+    with open(filepath, "rb") as f:
+        f.readline()
+        f.readline()
+        offset = f.tell()
+        for line in f:
+            if not line.strip():
+                break
+            offsets.append(offset)
+            offset += len(line)
+    offsets.append(offset)
+
+    path = index_path(filepath)
+    with open(path, "wb") as f:
+        f.write(INDEX_MAGIC)
+        offsets.tofile(f)
+    return path
+
+
+def read_index(filepath: Path) -> np.ndarray:
+    """
+    Row offsets of a text trace, memory-mapped from its sidecar index.
+
+    The index is built first if missing.
+
+    Returns:
+        uint64 array of n_rows + 1 byte offsets (the last is the end of the last row)
+    """
+    path = index_path(filepath)
+    if not path.exists():
+        build_index(filepath)
+    with open(path, "rb") as f:
+        if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+            raise ValueError(f"{path} is not a trace index")
+    return np.memmap(path, dtype="<u8", mode="r", offset=len(INDEX_MAGIC))
+
+
+def iter_text_rows(filepath: Path, start: int = 0, end: int | None = None):
+    """
+    Yield the raw data lines of rows start .. end-1 of a text trace.
+
+    Seeks straight to row `start` through the index, so the cost does not
+    depend on how far into the trace the window is.
+
+    Args:
+        filepath: Text trace path
+        start: First row
+        end: Row to stop before (default: end of trace)
+    """
+    offsets = read_index(filepath)
+    n_rows = len(offsets) - 1
+    end = n_rows if end is None else min(end, n_rows)
+    if start >= end:
+        return
+    with open(filepath, "rb") as f:
+        f.seek(int(offsets[start]))
+        for _ in range(end - start):
+            yield f.readline().decode().rstrip()
 
 
-def write_summary(filepath: Path, records: list[StepRecord], policy_name: str):
+def write_summary(filepath: Path, summary: RunSummary, policy_name: str):
     """
     Append summary statistics to trace file.
 
     Args:
         filepath: Trace file path
-        records: List of step records
+        summary: Online summary accumulated during the run
         policy_name: Name of policy for display
     """
-    total_cost = sum(r.cost for r in records)
-    total_stockouts = sum(r.stockout for r in records)
-    avg_inventory = sum(r.inventory_next for r in records) / len(records)
+    cost, inventory = summary.cost, summary.inventory
 
     with open(filepath, "a") as f:
         f.write("\n")
         f.write("=" * 80 + "\n")
         f.write(f"Policy: {policy_name}\n")
-        f.write(f"Total cost: {total_cost:.2f}\n")
-        f.write(f"Total stockouts: {total_stockouts:.2f}\n")
-        f.write(f"Average inventory: {avg_inventory:.2f}\n")
+        f.write(f"Total cost: {summary.total_cost:.2f}\n")
+        f.write(f"Total stockouts: {summary.total_stockouts:.2f}\n")
+        f.write(f"Average inventory: {summary.avg_inventory:.2f}\n")
+        cost_line = f"Cost per period: mean {cost.mean:.2f}, sd {cost.stdev:.2f}, "
+        inventory_line = f"Inventory range: min {inventory.min:.2f}, "
+        # Quantiles only when the summary was built with sketches
+        if {0.5, 0.9} <= cost.quantiles.keys():
+            cost_line += f"p50 {cost.quantile(0.5):.2f}, p90 {cost.quantile(0.9):.2f}, "
+        if 0.5 in inventory.quantiles:
+            inventory_line += f"p50 {inventory.quantile(0.5):.2f}, "
+        f.write(f"{cost_line}max {cost.max:.2f}\n")
+        f.write(f"{inventory_line}max {inventory.max:.2f}\n")
         f.write("=" * 80 + "\n")
@@ -0,0 +1,43 @@
+"""Tests for the benchmark suite and its regression check"""
+
+from dataclasses import replace
+
+from powell_sdm_lab.bench import (
+    BENCHMARKS,
+    cases,
+    find_regressions,
+    load_baseline,
+    run_suite,
+    save_baseline,
+)
+
+TINY_GRID = {"T": [50], "N": [1, 8], "scenario_T": 20}
+
+
+def test_every_benchmark_runs_on_its_grid():
+    """Every benchmark runs once per grid case and reports throughput and memory."""
+    results = run_suite(TINY_GRID, repeats=1)
+    assert {r.name for r in results} == set(BENCHMARKS)
+    assert len(results) == len(cases(TINY_GRID))
+    batch = [r for r in results if r.n_scenarios == 8]
+    assert {r.name for r in batch} == {"demand_generation", "env_step_batch"}
+    assert all(r.steps == 20 * 8 for r in batch)
+    assert all(r.steps_per_sec > 0 and r.peak_bytes > 0 for r in results)
+
+
+def test_check_flags_throughput_and_memory_regressions(tmp_path):
+    """Slower or bigger results beyond the threshold are flagged as regressions."""
+    results = run_suite(TINY_GRID, names=["env_step"], repeats=1)
+    path = tmp_path / "baseline.json"
+    save_baseline(results, TINY_GRID, path)
+    baseline = load_baseline(path)
+    assert baseline["grid"] == TINY_GRID
+    assert find_regressions(results, baseline, 25.0) == []
+
+    slower = replace(results[0], steps_per_sec=results[0].steps_per_sec * 0.5)
+    bigger = replace(results[0], peak_bytes=results[0].peak_bytes + (8 << 20))
+    (regression,) = find_regressions([slower], baseline, 25.0)
+    assert regression.metric == "steps_per_sec"
+    assert round(regression.change_pct) == -50
+    assert [r.metric for r in find_regressions([bigger], baseline, 25.0)] == ["peak_bytes"]
+    assert find_regressions([slower], baseline, 60.0) == []
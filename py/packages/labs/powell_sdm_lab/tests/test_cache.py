@@ -0,0 +1,71 @@
+"""Tests for the content-addressed evaluation cache"""
+
+from powell_sdm_lab import cache as cache_module
+from powell_sdm_lab.cache import EvalCache, cache_key, demand_identity
+from powell_sdm_lab.demand_process import DemandProcess, generate_demands
+from powell_sdm_lab.evaluate import DEFAULT_SPECS, evaluate
+from powell_sdm_lab.main import restore_run, run_policy, store_run
+from powell_sdm_lab.policies import PolicyB
+
+
+def _key(**overrides):
+    inputs = {"demand": demand_identity(), "seed": 1, "T": 10, **overrides}
+    return cache_key("scenario", "PolicyA", {"target_stock": 90.0}, **inputs)
+
+
+def test_keys_address_content():
+    """Keys are stable and change with seed, process or store digest."""
+    assert _key() == _key()
+    assert _key(seed=2) != _key()
+    assert _key(demand=demand_identity(DemandProcess(noise_std=5.0))) != _key()
+    assert _key(demand=demand_identity(store_digest="ab" * 32)) != _key()
+
+
+def test_lru_eviction_by_entries_and_size(tmp_path):
+    """The least recently used entries go first once over budget."""
+    with EvalCache(tmp_path, max_entries=2) as cache:
+        cache.put_many([("k1", "test", {"v": 1}), ("k2", "test", {"v": 2})])
+        assert cache.get("k1") == {"v": 1}  # k2 is now least recently used
+        cache.put_many([("k3", "test", {"v": 3})])
+        assert set(cache.get_many(["k1", "k2", "k3"])) == {"k1", "k3"}
+
+    with EvalCache(tmp_path, max_bytes=100) as cache:
+        cache.put_many([("big", "test", {"v": "x" * 200})])
+        assert cache.get("big") is None
+
+
+def test_stale_entries_are_pruned(tmp_path, monkeypatch):
+    """Entries from other code fingerprints count as stale and are pruned."""
+    with EvalCache(tmp_path) as cache:
+        cache.put_many([("old", "test", {"v": 1})])
+        monkeypatch.setattr(cache_module, "code_fingerprint", lambda: "changed")
+        cache.put_many([("new", "test", {"v": 2})])
+        assert cache.stats()["stale"] == 1
+        assert cache.prune_stale() == 1
+        assert set(cache.get_many(["old", "new"])) == {"new"}
+
+
+def test_evaluate_reuses_overlapping_scenarios(tmp_path):
+    """A larger run reuses cached scenarios and matches an uncached run."""
+    specs = [DEFAULT_SPECS["a"], DEFAULT_SPECS["b"]]
+    fresh = evaluate(specs, n_seeds=12, T=20, workers=1)
+    with EvalCache(tmp_path) as cache:
+        evaluate(specs, n_seeds=8, T=20, workers=1, cache=cache)
+        assert (cache.hits, cache.misses) == (0, 16)
+        served = evaluate(specs, n_seeds=12, T=20, workers=1, batch=True, cache=cache)
+        assert (cache.hits, cache.misses) == (16, 24)
+    assert served == fresh
+
+
+def test_run_trace_round_trips(tmp_path):
+    """A cached run restores its trace and index byte for byte."""
+    trace = tmp_path / "policy_b.txt"
+    summary = run_policy(PolicyB(10), generate_demands(14, 3), 80.0, trace, "B")
+    expected = trace.read_bytes()
+    with EvalCache(tmp_path / "cache") as cache:
+        store_run(cache, "run-key", summary, trace)
+        trace.unlink()
+        assert restore_run(cache, "run-key", trace) == summary.metrics()
+        assert restore_run(cache, "other-key", trace) is None
+    assert trace.read_bytes() == expected
+    assert trace.with_name("policy_b.txt.idx").exists()
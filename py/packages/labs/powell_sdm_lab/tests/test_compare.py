@@ -0,0 +1,59 @@
+"""Tests for streaming trace comparison"""
+
+from itertools import zip_longest
+
+from powell_sdm_lab.compare import TraceStream, compare_traces
+from powell_sdm_lab.demand_process import generate_demands
+from powell_sdm_lab.main import run_policy
+from powell_sdm_lab.policies import PolicyA, PolicyB
+
+
+def _write_traces(tmp_path, trace_format, suffix):
+    demands = generate_demands(30, seed=1)
+    paths = []
+    for name, policy in (("a", PolicyA(target_stock=90.0)), ("b", PolicyB(safety_stock=10.0))):
+        path = tmp_path / f"policy_{name}{suffix}"
+        run_policy(policy, demands, 80.0, path, name, trace_format)
+        paths.append(path)
+    return paths
+
+
+def test_text_and_columnar_streams_agree(tmp_path):
+    """Both formats stream the same rows and summary (up to text rounding)."""
+    [text_a, _] = _write_traces(tmp_path, "text", ".txt")
+    [col_a, _] = _write_traces(tmp_path, "columnar", ".ctrace")
+
+    text, col = TraceStream(text_a), TraceStream(col_a)
+    rows = list(zip_longest(text, col))
+
+    assert len(rows) == 30
+    assert all(abs(a - b) <= 0.005 for ra, rb in rows for a, b in zip(ra, rb))
+    assert text.summary.keys() == col.summary.keys() == {"cost", "stockouts", "inventory"}
+    assert all(abs(text.summary[k] - col.summary[k]) <= 0.005 for k in text.summary)
+
+
+def test_compare_prints_same_summary_for_both_formats(tmp_path, capsys):
+    """The summary table does not depend on the trace format."""
+    compare_traces(*_write_traces(tmp_path, "text", ".txt"), n_steps=3)
+    text_out = capsys.readouterr().out
+    compare_traces(*_write_traces(tmp_path, "columnar", ".ctrace"), n_steps=3)
+    col_out = capsys.readouterr().out
+
+    def summary_table(out):
+        return out.split("SUMMARY COMPARISON")[1].split("Per-column")[0]
+
+    assert "Total Cost" in summary_table(text_out)
+    assert summary_table(text_out) == summary_table(col_out)
+
+
+def test_windowed_compare_agrees_across_formats(tmp_path):
+    """A window deep into the run streams the same rows from both formats."""
+    [text_a, _] = _write_traces(tmp_path, "text", ".txt")
+    [col_a, _] = _write_traces(tmp_path, "columnar", ".ctrace")
+
+    text, col = TraceStream(text_a, 20, 25), TraceStream(col_a, 20, 25)
+    rows = list(zip_longest(text, col))
+
+    assert [int(ra[0]) for ra, _ in rows] == list(range(20, 25))
+    assert all(abs(a - b) <= 0.005 for ra, rb in rows for a, b in zip(ra, rb))
+    assert abs(text.summary["cost"] - col.summary["cost"]) <= 0.05
@@ -0,0 +1,125 @@
+"""Tests for the online demand model"""
+
+import math
+
+import numpy as np
+from powell_sdm_lab.demand_model import (
+    FEATURE_TABLE,
+    BatchOnlineDemandModel,
+    OnlineDemandModel,
+    fit_models,
+    fit_theta,
+)
+from powell_sdm_lab.demand_process import DemandProcess, generate_demand_matrix
+from powell_sdm_lab.evaluate import simulate, simulate_batch
+from powell_sdm_lab.policies import PolicyB
+
+
+def test_feature_table_matches_trig_features():
+    """Cached features equal sin/cos(2πt/7) up to rounding of 2πt/7."""
+    model = OnlineDemandModel()
+    for t in range(30):
+        _, s, c = model._features(t)
+        assert math.isclose(s, math.sin(2 * math.pi * t / 7), abs_tol=1e-12)
+        assert math.isclose(c, math.cos(2 * math.pi * t / 7), abs_tol=1e-12)
+
+
+def test_batch_methods_match_scalar_updates_exactly():
+    """update_batch/predict_batch reproduce step-by-step predict/update."""
+    ys = generate_demand_matrix(1, 40, seed=2)[0]
+    ts = np.arange(40)
+
+    scalar = OnlineDemandModel()
+    errors = [scalar.update(t, y) for t, y in zip(ts.tolist(), ys.tolist())]
+
+    batched = OnlineDemandModel()
+    np.testing.assert_array_equal(batched.update_batch(ts, ys), errors)
+    assert batched.theta == scalar.theta
+    np.testing.assert_array_equal(
+        batched.predict_batch(ts), [scalar.predict(t) for t in ts.tolist()]
+    )
+
+
+def test_parallel_streams_match_independent_scalar_models():
+    """Each stream of the batch model is bit-identical to its own scalar model."""
+    demands = generate_demand_matrix(5, 30, seed=8)
+    batch = BatchOnlineDemandModel(5, learning_rate=0.1)
+    forecasts = []
+    for t in range(30):
+        forecasts.append(batch.predict(t))
+        batch.update(t, demands[:, t])
+
+    for i in range(5):
+        model = OnlineDemandModel(learning_rate=0.1)
+        for t in range(30):
+            assert model.predict(t) == forecasts[t][i]
+            model.update(t, float(demands[i, t]))
+        assert model.theta == batch.theta[:, i].tolist()
+
+
+def test_fit_theta_matches_full_least_squares():
+    """Per-phase sums give the lstsq solution on the full design matrix."""
+    history = generate_demand_matrix(20, 45, seed=4)
+    for t0 in (0, 3, -45):
+        design = FEATURE_TABLE[(t0 + np.arange(45)) % 7]
+        expected = np.linalg.lstsq(design, history.T, rcond=None)[0]
+        np.testing.assert_allclose(fit_theta(history, t0), expected, atol=1e-9)
+        np.testing.assert_allclose(fit_theta(history[7], t0), expected[:, 7], atol=1e-9)
+
+
+def test_memmapped_history_fits_in_chunks(tmp_path):
+    """A memmap read a few rows at a time gives the in-memory fit exactly."""
+    history = generate_demand_matrix(50, 30, seed=6)
+    mapped = np.memmap(tmp_path / "history.f8", dtype=np.float64, mode="w+", shape=(50, 30))
+    mapped[:] = history
+    mapped.flush()
+    np.testing.assert_array_equal(fit_theta(mapped, chunk_rows=7), fit_theta(history))
+
+    models = fit_models(mapped, learning_rate=0.1)
+    batch = BatchOnlineDemandModel.from_history(mapped, learning_rate=0.1)
+    assert [m.theta for m in models] == batch.theta.T.tolist()
+    np.testing.assert_allclose(
+        models[3].theta, OnlineDemandModel.from_history(history[3]).theta, rtol=1e-12
+    )
+
+
+def test_warm_start_beats_cold_start_and_keeps_learning():
+    """A fitted model forecasts better early on and still updates online."""
+    process = DemandProcess()
+    future = process.sample(1, 14, seed=9)[0]
+    warm = OnlineDemandModel.from_history(process.history(56, seed=9), t0=-56)
+    cold = OnlineDemandModel()
+
+    def error(model):
+        return np.mean(np.abs(model.predict_batch(np.arange(14)) - future))
+
+    assert error(warm) < error(cold) / 2
+    before = list(warm.theta)
+    warm.update(0, float(future[0]))
+    assert warm.theta != before
+
+
+def test_warm_started_policy_batch_matches_scalar():
+    """reset_batch starts every scenario from the warm-start θ."""
+    demands = generate_demand_matrix(3, 28, seed=1)
+    history = DemandProcess().history(28, seed=1)
+
+    policy = PolicyB(10.0)
+    policy.warm_start(history)
+    batch = simulate_batch(policy, demands, 80.0)
+    for i in range(3):
+        scalar = PolicyB(10.0)
+        scalar.warm_start(history)
+        assert simulate(scalar, demands[i].tolist(), 80.0)["total_cost"] == batch["total_cost"][i]
+
+
+def test_warm_start_survives_state_round_trip():
+    """from_state(get_state()) keeps the θ that batch runs start from."""
+    demands = generate_demand_matrix(2, 28, seed=3)
+    policy = PolicyB(10.0)
+    policy.warm_start(DemandProcess().history(28, seed=3))
+    restored = PolicyB.from_state(policy.get_state())
+    np.testing.assert_array_equal(
+        simulate_batch(restored, demands, 80.0)["total_cost"],
+        simulate_batch(policy, demands, 80.0)["total_cost"],
+    )
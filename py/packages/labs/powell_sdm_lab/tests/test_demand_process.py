@@ -0,0 +1,46 @@
+"""Tests for the demand process"""
+
+import random
+
+import numpy as np
+from powell_sdm_lab.demand_process import (
+    DemandProcess,
+    generate_demand_matrix,
+    generate_demands,
+    spawn_seeds,
+)
+
+
+def test_scenario_rows_do_not_depend_on_scenario_count():
+    """Scenario i gets the same stream however many scenarios are drawn."""
+    small = generate_demand_matrix(3, 50, seed=7)
+    large = generate_demand_matrix(100, 50, seed=7)
+    np.testing.assert_array_equal(small, large[:3])
+
+
+def test_generate_demands_is_row_zero_and_leaves_global_rng_alone():
+    """The list wrapper matches the matrix API and does not reseed `random`."""
+    random.seed(123)
+    expected_next = random.random()
+
+    random.seed(123)
+    demands = generate_demands(30, seed=42)
+    assert random.random() == expected_next
+
+    assert demands == generate_demand_matrix(1, 30, seed=42)[0].tolist()
+    assert min(demands) >= 0.0
+
+
+def test_spawn_seeds_is_repeatable():
+    """Child streams are a pure function of (seed, index)."""
+    a = [s.generate_state(2).tolist() for s in spawn_seeds(5, 4)]
+    b = [s.generate_state(2).tolist() for s in spawn_seeds(5, 4)]
+    assert a == b
+    assert len({tuple(x) for x in a}) == 4
+
+
+def test_mean_matches_seasonal_model():
+    """Noise-free part follows base + amplitude*sin(2πt/period)."""
+    process = DemandProcess()
+    assert process.mean(8)[0] == 80.0
+    assert np.isclose(process.mean(8)[7], 80.0)
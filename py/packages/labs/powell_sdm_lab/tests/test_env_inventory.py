@@ -0,0 +1,80 @@
+"""Tests for the inventory environments"""
+
+import numpy as np
+from powell_sdm_lab.env_inventory import (
+    BatchInventoryEnv,
+    InventoryEnv,
+    MultiItemInventoryEnv,
+    StepRecordBuffer,
+)
+
+
+def test_batch_env_matches_scalar_env_bit_for_bit():
+    """Batch totals equal the scalar env's summed records exactly."""
+    rng = np.random.default_rng(0)
+    n_scenarios, T = 16, 60
+    demands = np.maximum(0.0, 80.0 + 10.0 * rng.standard_normal((n_scenarios, T)))
+    target = 90.0
+
+    batch = BatchInventoryEnv(80.0, n_scenarios=n_scenarios)
+    for t in range(T):
+        orders = np.maximum(0.0, target - batch.inventory)
+        batch.step(orders, demands[:, t])
+
+    for i in range(n_scenarios):
+        env = InventoryEnv(initial_inventory=80.0)
+        records = []
+        for t in range(T):
+            order_qty = max(0, target - env.inventory)
+            records.append(env.step(order_qty, float(demands[i, t])))
+
+        assert batch.total_cost[i] == sum(r.cost for r in records)
+        assert batch.total_stockout[i] == sum(r.stockout for r in records)
+        assert batch.average_inventory()[i] == (
+            sum(r.inventory_next for r in records) / len(records)
+        )
+        assert batch.inventory[i] == env.inventory
+
+
+def test_step_record_buffer_round_trips_and_grows():
+    """Buffered records come back equal and columns are views over them."""
+    env = InventoryEnv(initial_inventory=80.0)
+    buffer = StepRecordBuffer(capacity=4)
+    records = []
+    for t in range(10):
+        record = env.step(max(0, 90.0 - env.inventory), 70.0 + 3.5 * t)
+        buffer.append(record)
+        records.append(record)
+
+    assert not hasattr(records[0], "__dict__")
+    assert len(buffer) == 10
+    assert list(buffer) == records
+    assert buffer[-1] == records[-1]
+    np.testing.assert_array_equal(buffer.column("cost"), [r.cost for r in records])
+    assert set(buffer.columns()) == set(StepRecordBuffer.FIELDS)
+
+
+def test_multi_item_env_matches_scalar_env_per_item():
+    """Per-item parameters broadcast over (locations, items) with scalar-env math."""
+    rng = np.random.default_rng(1)
+    shape = (2, 3)
+    holding = np.array([0.01, 0.05, 0.1])  # per item, shared across locations
+    penalty = np.array([[1.0], [2.0]])  # per location
+    demands = np.maximum(0.0, 50.0 + 20.0 * rng.standard_normal((20, *shape)))
+
+    env = MultiItemInventoryEnv(60.0, shape=shape, holding_cost=holding, penalty_cost=penalty)
+    for demand in demands:
+        record = env.step(np.maximum(0.0, 70.0 - env.inventory), demand)
+    assert record.cost.shape == shape
+
+    for loc in range(2):
+        for item in range(3):
+            scalar = InventoryEnv(
+                60.0, holding_cost=float(holding[item]), penalty_cost=float(penalty[loc, 0])
+            )
+            costs = [
+                scalar.step(max(0, 70.0 - scalar.inventory), float(d[loc, item])).cost
+                for d in demands
+            ]
+            assert env.total_cost[loc, item] == sum(costs)
+            assert env.inventory[loc, item] == scalar.inventory
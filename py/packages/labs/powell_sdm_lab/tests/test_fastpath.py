@@ -0,0 +1,48 @@
+"""Tests for the closed-form order-up-to evaluator"""
+
+import numpy as np
+from powell_sdm_lab.demand_process import DemandProcess
+from powell_sdm_lab.evaluate import simulate, simulate_batch
+from powell_sdm_lab.fastpath import simulate_fast, simulate_order_up_to, sweep_base_stock
+from powell_sdm_lab.policies import PolicyA, PolicyB, ScheduledBaseStock
+
+
+def test_closed_form_matches_step_loop():
+    """Closed-form totals match the batch step loop for any S and start."""
+    demands = DemandProcess().sample(20, 120, seed=3)
+    for S in (0.0, 60.0, 90.0, 140.0):
+        for initial in (0.0, 80.0, 200.0):
+            fast = simulate_order_up_to(S, demands, initial)
+            slow = simulate_batch(PolicyA(S), demands, initial)
+            for key in slow:
+                np.testing.assert_allclose(fast[key], slow[key], rtol=1e-10, atol=1e-9)
+
+
+def test_schedule_matches_scalar_loop():
+    """A time-varying S_t schedule matches scalar ScheduledBaseStock runs."""
+    demands = DemandProcess().sample(3, 50, seed=5)
+    levels = 80 + 30 * np.sin(np.arange(40))
+    policy = ScheduledBaseStock(levels)
+    fast = simulate_fast(policy, demands, 80.0)
+    for i, row in enumerate(demands):
+        slow = simulate(ScheduledBaseStock(levels), row.tolist(), 80.0)
+        for key, value in slow.items():
+            assert abs(fast[key][i] - value) < 1e-9
+
+
+def test_learning_policy_falls_back_to_step_loop():
+    """Policies without a closed form go through simulate_batch unchanged."""
+    demands = DemandProcess().sample(4, 30, seed=1)
+    fast = simulate_fast(PolicyB(10), demands, 80.0)
+    slow = simulate_batch(PolicyB(10), demands, 80.0)
+    for key in slow:
+        np.testing.assert_array_equal(fast[key], slow[key])
+
+
+def test_sweep_base_stock_shapes():
+    """sweep_base_stock scores every level on every scenario."""
+    demands = DemandProcess().sample(5, 20, seed=0)
+    result = sweep_base_stock(np.linspace(50, 150, 11), demands, 80.0)
+    assert result["total_cost"].shape == (11, 5)
+    # More stock never means more stockouts
+    assert np.all(np.diff(result["total_stockouts"], axis=0) <= 1e-9)
@@ -0,0 +1,96 @@
+"""Tests for the lockstep multi-policy runner"""
+
+import numpy as np
+import pytest
+from powell_sdm_lab import compare
+from powell_sdm_lab.compare import TraceStream, compare_many, main, split_lockstep
+from powell_sdm_lab.demand_process import generate_demands
+from powell_sdm_lab.evaluate import DEFAULT_SPECS, simulate
+from powell_sdm_lab.lockstep import run_lockstep
+from powell_sdm_lab.main import run_policy
+from powell_sdm_lab.trace import read_columns
+
+
+def test_lockstep_matches_separate_runs(tmp_path):
+    """Each policy's columns equal a separate columnar run on the same demands."""
+    demands = generate_demands(40, seed=2)
+    specs = [DEFAULT_SPECS["a"], DEFAULT_SPECS["b"]]
+    path = tmp_path / "lockstep.ctrace"
+    result = run_lockstep(specs, demands, 80.0, path, block_rows=16)
+
+    header, columns = read_columns(path)
+    assert header["metadata"]["policies"] == ["a", "b"]
+    for spec in specs:
+        single = tmp_path / f"{spec.name}.ctrace"
+        run_policy(spec.build(), demands, 80.0, single, spec.name, "columnar")
+        _, expected = read_columns(single)
+        for label, values in expected.items():
+            np.testing.assert_array_equal(columns[f"{spec.name}/{label}"], values)
+
+        assert result.summaries[spec.name].metrics() == simulate(spec.build(), demands, 80.0)
+
+    diff = result.cost_diffs["b"]
+    assert (
+        abs(diff.total - (result.summaries["b"].total_cost - result.summaries["a"].total_cost))
+        < 1e-9
+    )
+
+
+def test_compare_many_reads_combined_trace(tmp_path, capsys):
+    """A combined trace expands to one stream per policy, a as the baseline."""
+    demands = generate_demands(20, seed=4)
+    path = tmp_path / "lockstep.ctrace"
+    run_lockstep([DEFAULT_SPECS[p] for p in "abc"], demands, 80.0, path)
+
+    rows = list(TraceStream(path, 5, 8, policy="c"))
+    assert [int(r[0]) for r in rows] == [5, 6, 7]
+
+    compare_many([path], n_steps=2)
+    out = capsys.readouterr().out
+    assert "TRACE COMPARISON: a vs b vs c" in out
+    assert "Mean per-step difference vs a" in out
+
+
+def test_cli_routes_combined_traces_and_reports_missing(tmp_path, capsys, monkeypatch):
+    """Any lockstep input goes to compare_many; a missing file is an error message."""
+    demands = generate_demands(10, seed=1)
+    combined = tmp_path / "lockstep.ctrace"
+    run_lockstep([DEFAULT_SPECS["a"], DEFAULT_SPECS["b"]], demands, 80.0, combined)
+    single = tmp_path / "c.ctrace"
+    spec = DEFAULT_SPECS["c"]
+    run_policy(spec.build(), demands, 80.0, single, spec.name, "columnar")
+    capsys.readouterr()
+
+    monkeypatch.setattr("sys.argv", ["compare", str(combined), str(single)])
+    main()
+    assert "TRACE COMPARISON: a vs b vs c" in capsys.readouterr().out
+
+    monkeypatch.setattr("sys.argv", ["compare", str(tmp_path / "missing.ctrace")])
+    main()
+    assert "ERROR:" in capsys.readouterr().out
+
+
+def test_compare_many_reads_lockstep_once_and_rejects_duplicates(tmp_path, monkeypatch):
+    """A combined trace is decoded in one pass; repeated policy names raise."""
+    demands = generate_demands(20, seed=2)
+    path = tmp_path / "lockstep.ctrace"
+    run_lockstep([DEFAULT_SPECS[p] for p in "abc"], demands, 80.0, path)
+    expected_c = list(TraceStream(path, policy="c"))
+
+    reads = []
+    original = compare.iter_columnar_blocks
+
+    def counting(*args, **kwargs):
+        reads.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(compare, "iter_columnar_blocks", counting)
+    streams = split_lockstep(path)
+    rows = {name: list(stream) for name, stream in streams.items()}
+    assert len(reads) == 1
+    assert rows["c"] == expected_c
+
+    compare_many([path], n_steps=2)
+    assert len(reads) == 2
+    with pytest.raises(ValueError, match="'a'"):
+        compare_many([path, path])
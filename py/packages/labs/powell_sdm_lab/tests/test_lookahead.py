@@ -0,0 +1,62 @@
+"""Tests for the rollout lookahead policy"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from powell_sdm_lab.demand_process import generate_demands
+from powell_sdm_lab.env_inventory import InventoryEnv
+from powell_sdm_lab.evaluate import simulate
+from powell_sdm_lab.policies import LookaheadPolicy, rollout_costs
+
+
+def test_rollout_costs_match_env_for_one_step():
+    """One-step rollout costs equal the hand-computed env costs."""
+    futures = np.array([[50.0], [120.0]])
+    totals = rollout_costs(80.0, np.array([0.0, 20.0]), futures, np.array([0.0]))
+    # q=0: holding 30*0.05 + stockout 40; q=20: 0.2*20 + holding 50*0.05 + stockout 20
+    np.testing.assert_allclose(totals, [1.5 + 40.0, (4.0 + 2.5) + (4.0 + 20.0)])
+
+
+def test_rollout_costs_match_inventory_env_exactly():
+    """Every rollout costs exactly what stepping InventoryEnv with the same orders costs."""
+    rng = np.random.default_rng(4)
+    futures = rng.uniform(0.0, 150.0, size=(5, 7))
+    levels = rng.uniform(40.0, 120.0, size=7)
+    candidates = np.array([0.0, 17.5, 60.0])
+    totals = rollout_costs(73.25, candidates, futures, levels)
+
+    for i, first in enumerate(candidates):
+        expected = 0.0
+        for future in futures:
+            env = InventoryEnv(73.25)
+            cost = 0.0
+            for k, demand in enumerate(future):
+                order = first if k == 0 else max(0.0, levels[k] - env.inventory)
+                cost += env.step(order, demand).cost
+            expected += cost
+        assert totals[i] == expected
+
+
+def test_lookahead_runs_and_is_reproducible():
+    """Runs with the same seed give identical results."""
+    demands = generate_demands(30, 42)
+    first = simulate(LookaheadPolicy(seed=1), demands, 80.0)
+    assert simulate(LookaheadPolicy(seed=1), demands, 80.0) == first
+
+
+def test_executor_gives_same_decisions():
+    """Scoring chunks on a thread pool does not change decisions."""
+    policy = LookaheadPolicy(seed=3)
+    with ThreadPoolExecutor(2) as pool:
+        pooled = LookaheadPolicy(seed=3, executor=pool)
+        for t in range(5):
+            assert pooled.decide(60.0, t) == policy.decide(60.0, t)
+
+
+def test_time_limit_returns_best_so_far():
+    """An expired budget still scores one chunk and returns a candidate."""
+    policy = LookaheadPolicy(n_futures=256, chunk_size=16, time_limit=0.0)
+    order = policy.decide(40.0, 0)
+    assert order in policy.candidates
+    assert policy.last_futures == 16
+    assert policy.timeouts == 1
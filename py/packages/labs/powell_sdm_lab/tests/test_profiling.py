@@ -0,0 +1,65 @@
+"""Tests for per-phase profiling of the SDM loop"""
+
+import json
+
+from powell_sdm_lab.demand_process import DemandProcess, generate_demands
+from powell_sdm_lab.evaluate import DEFAULT_SPECS, evaluate, simulate
+from powell_sdm_lab.fastpath import simulate_fast
+from powell_sdm_lab.policies import PolicyA, PolicyB
+from powell_sdm_lab.profiling import Profiler, merge_reports
+
+
+def test_profiled_run_matches_and_counts_phases():
+    """Profiling leaves results unchanged and times every phase once per step."""
+    demands = generate_demands(50, seed=3)
+    profiler = Profiler()
+    profiled = simulate(PolicyB(10), demands, 80.0, profiler=profiler)
+    assert profiled == simulate(PolicyB(10), demands, 80.0)
+
+    report = profiler.report()
+    assert report["steps"] == 50
+    assert set(report["phases"]) == {"decide", "env_step", "learn", "summary"}
+    assert all(stats["calls"] == 50 for stats in report["phases"].values())
+    assert sum(stats["total_s"] for stats in report["phases"].values()) <= report["wall_s"]
+
+
+def test_allocation_tracking_reports_peak_and_samples():
+    """tracemalloc mode reports a peak and samples every sample_every steps."""
+    profiler = Profiler(allocations=True, sample_every=10)
+    simulate(PolicyB(10), generate_demands(30, seed=0), 80.0, profiler=profiler)
+    allocations = profiler.report()["allocations"]
+    assert allocations["peak_bytes"] > 0
+    assert [s["step"] for s in allocations["samples"]] == [10, 20, 30]
+
+
+def test_merge_adds_up_runs():
+    """merge_reports sums runs, steps and calls across reports."""
+    reports = []
+    for seed in range(3):
+        profiler = Profiler()
+        simulate(PolicyA(90), generate_demands(20, seed), 80.0, profiler=profiler)
+        reports.append(profiler.report())
+    merged = merge_reports(reports, {"policy": "a"})
+    assert merged["runs"] == 3
+    assert merged["steps"] == 60
+    assert merged["phases"]["decide"]["calls"] == 60
+    assert 0 < sum(s["share"] for s in merged["phases"].values()) <= 1.0
+
+
+def test_closed_form_is_one_phase():
+    """The closed-form evaluator records a single closed_form phase."""
+    profiler = Profiler()
+    simulate_fast(PolicyA(90), DemandProcess().sample(5, 40, seed=1), 80.0, profiler)
+    assert list(profiler.report()["phases"]) == ["closed_form"]
+
+
+def test_evaluate_writes_per_policy_profile(tmp_path):
+    """evaluate(profile_path=...) writes one merged profile per policy."""
+    path = tmp_path / "profile.json"
+    evaluate(
+        [DEFAULT_SPECS["a"], DEFAULT_SPECS["b"]], n_seeds=4, T=25, workers=1, profile_path=path
+    )
+    policies = json.loads(path.read_text())["policies"]
+    assert set(policies) == {"a", "b"}
+    assert policies["b"]["runs"] == 4
+    assert policies["b"]["steps"] == 100
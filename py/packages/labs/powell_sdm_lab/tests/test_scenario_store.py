@@ -0,0 +1,69 @@
+"""Tests for the memory-mapped scenario store"""
+
+import pickle
+
+import numpy as np
+import pytest
+from powell_sdm_lab.demand_process import DemandProcess
+from powell_sdm_lab.evaluate import DEFAULT_SPECS, evaluate
+from powell_sdm_lab.scenario_store import DATA_ALIGN, ScenarioStore, open_store, write_store
+
+
+def test_store_holds_generated_matrix(tmp_path):
+    """A store maps exactly DemandProcess.sample() for its seed, page-aligned."""
+    process = DemandProcess(base=50.0, noise_std=5.0)
+    path = write_store(tmp_path / "bank.scn", 25, 30, seed=3, process=process, chunk_scenarios=7)
+    store = ScenarioStore(path)
+
+    assert isinstance(store.demands, np.memmap)
+    assert store.header["data_offset"] % DATA_ALIGN == 0
+    assert store.process == process
+    np.testing.assert_array_equal(store.demands, process.sample(25, 30, seed=3))
+    np.testing.assert_array_equal(store.rows(5, 9, T=10), store.demands[5:9, :10])
+    assert [first for first, _ in store.iter_chunks(10)] == [0, 10, 20]
+    assert store.verify()
+
+
+def test_store_pickles_by_path(tmp_path):
+    """Pickling sends the path, not the matrix."""
+    store = ScenarioStore(write_store(tmp_path / "bank.scn", 200, 365, seed=1))
+    payload = pickle.dumps(store)
+    assert len(payload) < 1024
+    np.testing.assert_array_equal(pickle.loads(payload).demands, store.demands)
+
+
+def test_verify_detects_changed_bytes(tmp_path):
+    """verify() notices a flipped byte in the data."""
+    path = write_store(tmp_path / "bank.scn", 4, 10, seed=0, dtype="float32")
+    assert ScenarioStore(path).demands.dtype == np.float32
+    with open(path, "r+b") as f:
+        f.seek(DATA_ALIGN + 8)
+        f.write(b"\xff")
+    assert not ScenarioStore(path).verify()
+
+
+def test_evaluate_from_store_matches_generated(tmp_path):
+    """Scoring on a store matches generating the same scenarios."""
+    path = write_store(tmp_path / "bank.scn", 12, 40, seed=42)
+    specs = [DEFAULT_SPECS["a"], DEFAULT_SPECS["b"]]
+    generated = evaluate(specs, n_seeds=10, T=30, seed=42, workers=1)
+    stored = evaluate(specs, n_seeds=10, T=30, workers=2, store=path)
+    batched = evaluate(specs, n_seeds=10, T=30, workers=1, batch=True, store=path)
+    for g, s, b in zip(generated, stored, batched):
+        assert g.metrics["total_cost"].mean == s.metrics["total_cost"].mean
+        assert g.metrics["total_cost"].mean == b.metrics["total_cost"].mean
+
+    with pytest.raises(ValueError):
+        evaluate(specs, n_seeds=20, T=30, workers=1, store=path)
+
+
+def test_open_store_shares_maps_and_sees_rewrites(tmp_path):
+    """str and Path share one map; a rewritten bank is reopened, not served stale."""
+    path = write_store(tmp_path / "bank.scn", 3, 10, seed=1)
+    store = open_store(path)
+    assert open_store(str(path)) is store
+
+    write_store(path, 5, 10, seed=2)
+    fresh = open_store(str(path))
+    assert fresh.n_scenarios == 5
+    np.testing.assert_array_equal(fresh.demands, DemandProcess().sample(5, 10, seed=2))
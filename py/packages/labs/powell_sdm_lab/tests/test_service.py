@@ -0,0 +1,67 @@
+"""Tests for the asyncio decision service"""
+
+import asyncio
+
+import pytest
+from powell_sdm_lab.demand_process import DemandProcess
+from powell_sdm_lab.evaluate import DEFAULT_SPECS, simulate
+from powell_sdm_lab.service import (
+    DecisionService,
+    DemandEvent,
+    queue_source,
+    replay_demands,
+    replay_file,
+    write_events,
+)
+
+
+def _streams(n_skus: int, T: int) -> dict[str, list[float]]:
+    demands = DemandProcess().sample(n_skus, T, seed=4)
+    return {f"sku{k}": row.tolist() for k, row in enumerate(demands)}
+
+
+@pytest.mark.parametrize("offload", [False, True])
+def test_per_sku_results_match_batch_runs(offload):
+    """Each SKU served from events matches a plain simulate() on its demands."""
+    streams = _streams(5, 30)
+    spec = DEFAULT_SPECS["b"]
+    service = DecisionService(lambda sku: spec.build(), offload=offload)
+    stats = asyncio.run(service.run(replay_demands(streams)))
+
+    assert stats.events == 5 * 30
+    assert stats.decisions == 5 * 30 + 5  # plus each SKU's first decision
+    assert stats.response.n == stats.events
+    for sku, demands in streams.items():
+        expected = simulate(spec.build(), demands, 80.0)
+        assert service.skus[sku].summary.metrics() == expected
+
+
+def test_file_replay_round_trips(tmp_path):
+    """Events written to CSV replay unchanged and in order."""
+    streams = _streams(3, 10)
+    path = tmp_path / "events.csv"
+    events = [DemandEvent(sku, t, d[t]) for t in range(10) for sku, d in streams.items()]
+    write_events(path, events)
+
+    async def collect():
+        return [event async for event in replay_file(path)]
+
+    assert asyncio.run(collect()) == events
+
+
+def test_queue_source_and_out_of_order_events():
+    """Queue sources are served; a skipped period fails the run."""
+
+    async def serve(events):
+        queue = asyncio.Queue()
+        for event in [*events, None]:
+            queue.put_nowait(event)
+        service = DecisionService(lambda sku: DEFAULT_SPECS["a"].build())
+        await service.run(queue_source(queue))
+        return service
+
+    service = asyncio.run(serve([DemandEvent("x", 0, 70.0), DemandEvent("x", 1, 90.0)]))
+    assert service.skus["x"].t == 2
+
+    with pytest.raises(ExceptionGroup):
+        asyncio.run(serve([DemandEvent("x", 0, 70.0), DemandEvent("x", 2, 90.0)]))
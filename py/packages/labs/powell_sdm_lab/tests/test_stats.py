@@ -0,0 +1,66 @@
+"""Tests for online summary statistics"""
+
+import statistics
+
+import numpy as np
+from powell_sdm_lab.demand_process import generate_demands
+from powell_sdm_lab.env_inventory import InventoryEnv
+from powell_sdm_lab.stats import SUMMARY_QUANTILES, P2Quantile, RunningStats, RunSummary
+from powell_sdm_lab.trace import write_summary
+
+
+def test_run_summary_totals_match_record_sums_exactly():
+    """Online totals equal the old sum(...) passes over the record list."""
+    env = InventoryEnv(initial_inventory=80.0)
+    summary = RunSummary()
+    records = []
+    for demand in generate_demands(200, seed=4):
+        record = env.step(max(0, 90.0 - env.inventory), demand)
+        summary.update(record)
+        records.append(record)
+
+    assert summary.total_cost == sum(r.cost for r in records)
+    assert summary.total_stockouts == sum(r.stockout for r in records)
+    assert summary.avg_inventory == sum(r.inventory_next for r in records) / len(records)
+
+
+def test_running_stats_moments():
+    """Welford mean/stdev and min/max agree with the statistics module."""
+    values = [3.0, 1.5, 8.25, -2.0, 4.0, 4.0, 0.5]
+    stats = RunningStats()
+    for v in values:
+        stats.update(v)
+
+    assert stats.n == len(values)
+    assert np.isclose(stats.mean, statistics.fmean(values))
+    assert np.isclose(stats.stdev, statistics.stdev(values))
+    assert (stats.min, stats.max) == (-2.0, 8.25)
+
+
+def test_p2_quantile_tracks_sample_quantiles():
+    """P² estimates land close to exact quantiles on a large sample."""
+    x = np.random.default_rng(0).exponential(size=20_000)
+    sketches = {p: P2Quantile(p) for p in (0.5, 0.9, 0.99)}
+    for v in x.tolist():
+        for sketch in sketches.values():
+            sketch.update(v)
+
+    for p, sketch in sketches.items():
+        assert abs(sketch.value - np.quantile(x, p)) < 0.05 * np.quantile(x, p)
+
+
+def test_summary_quantiles_are_opt_in(tmp_path):
+    """Sketches are off by default; trace summaries add quantiles when present."""
+    env = InventoryEnv(initial_inventory=80.0)
+    plain, sketched = RunSummary(), RunSummary(quantiles=SUMMARY_QUANTILES)
+    for demand in generate_demands(50, seed=2):
+        record = env.step(max(0, 90.0 - env.inventory), demand)
+        plain.update(record)
+        sketched.update(record)
+
+    assert not plain.cost.quantiles
+    assert plain.metrics() == sketched.metrics()
+    write_summary(tmp_path / "plain.txt", plain, "A")
+    write_summary(tmp_path / "sketched.txt", sketched, "A")
+    assert "p50" not in (tmp_path / "plain.txt").read_text()
+    assert "p90" in (tmp_path / "sketched.txt").read_text()
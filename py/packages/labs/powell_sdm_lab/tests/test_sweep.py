@@ -0,0 +1,55 @@
+"""Tests for parameter sweeps"""
+
+import numpy as np
+from powell_sdm_lab.sweep import (
+    ScenarioSet,
+    SweepCache,
+    SweepResult,
+    grid,
+    latin_hypercube,
+    pareto_front,
+    sweep,
+)
+
+
+def test_samplers_cover_the_space():
+    """Grids are Cartesian products; LHS uses every stratum once per axis."""
+    assert len(grid({"a": [1, 2, 3], "b": [0.1, 0.2]})) == 6
+
+    points = latin_hypercube({"x": (0.0, 10.0), "y": (5.0, 6.0)}, n=10, seed=1)
+    strata = sorted(int(p["x"]) for p in points)
+    assert strata == list(range(10))
+    assert all(5.0 <= p["y"] <= 6.0 for p in points)
+
+
+def test_sweep_uses_cache_and_common_scenarios(tmp_path):
+    """Cached points are served from disk; every point sees the same demands."""
+    scenarios = ScenarioSet(n_scenarios=20, T=28, seed=3)
+    points = grid({"target_stock": [80.0, 100.0, 120.0]})
+    cache_path = tmp_path / "cache.json"
+
+    first = sweep("a", points, scenarios, workers=1, cache=SweepCache(cache_path))
+
+    cache = SweepCache(cache_path)
+    assert len(cache.entries) == 3
+    key = SweepCache.key("a", points[0], scenarios)
+    cache.entries[key]["mean_cost"] = -1.0  # served from cache, not recomputed
+    again = sweep("a", points, scenarios, workers=1, cache=cache)
+
+    assert again[0].mean_cost == -1.0
+    assert again[1:] == first[1:]
+    # More stock costs more to hold but never stocks out more (same demands)
+    stockouts = [r.mean_stockouts for r in first]
+    assert stockouts == sorted(stockouts, reverse=True)
+
+
+def test_pareto_front_drops_dominated_points():
+    """Only points not beaten on both cost and stockouts remain."""
+
+    def result(cost, stockouts):
+        return SweepResult("a", {}, cost, 0.0, stockouts, 0.0)
+
+    results = [result(10, 5), result(12, 1), result(11, 6), result(15, 1), result(9, 9)]
+    front = pareto_front(results)
+    assert [(r.mean_cost, r.mean_stockouts) for r in front] == [(9, 9), (10, 5), (12, 1)]
+    assert np.all(np.diff([r.mean_cost for r in front]) > 0)
@@ -0,0 +1,103 @@
+"""Tests for trace sinks"""
+
+import numpy as np
+from powell_sdm_lab.env_inventory import InventoryEnv
+from powell_sdm_lab.trace import (
+    ColumnarTraceWriter,
+    TraceWriter,
+    build_index,
+    index_path,
+    iter_columnar_blocks,
+    iter_text_rows,
+    read_columns,
+)
+
+
+def _run(sink, demands):
+    env = InventoryEnv(initial_inventory=80.0)
+    records = []
+    with sink:
+        for t, demand in enumerate(demands):
+            record = env.step(max(0, 90.0 - env.inventory), demand)
+            sink.write_step(record, forecast=80.0 + t, forecast_error=None)
+            records.append(record)
+    return records
+
+
+def test_columnar_round_trip_across_blocks(tmp_path):
+    """Columns come back exactly, including a trailing partial block."""
+    demands = [70.0 + (t * 7) % 30 for t in range(23)]
+    path = tmp_path / "trace.ctrace"
+    records = _run(ColumnarTraceWriter(path, block_rows=5, metadata={"policy": "a"}), demands)
+
+    header, columns = read_columns(path)
+
+    assert header["metadata"] == {"policy": "a"}
+    assert header["columns"][0] == "t"
+    np.testing.assert_array_equal(columns["t"], np.arange(23))
+    np.testing.assert_array_equal(columns["cost"], [r.cost for r in records])
+    np.testing.assert_array_equal(columns["yhat"], 80.0 + np.arange(23))
+    assert np.isnan(columns["err"]).all()
+
+
+def test_text_trace_format_is_unchanged(tmp_path):
+    """Integral values print bare, others with two decimals; missing forecasts as 0."""
+    path = tmp_path / "trace.txt"
+    _run(TraceWriter(path, flush_every=1), [85.5])
+
+    lines = path.read_text().splitlines()
+    assert lines[0].split() == [
+        "t",
+        "I_t",
+        "q_t",
+        "I_post",
+        "D_t+1",
+        "sales",
+        "I_t+1",
+        "stockout",
+        "cost",
+        "yhat",
+        "err",
+    ]
+    assert lines[2].split() == [
+        "0",
+        "80",
+        "10",
+        "90",
+        "85.50",
+        "85.50",
+        "4.50",
+        "0",
+        "2.23",
+        "80",
+        "0",
+    ]
+
+
+def test_text_index_seeks_to_any_window(tmp_path):
+    """Indexed windows match the rows of a full read, with or without a prebuilt index."""
+    demands = [70.0 + (t * 7) % 30 + 0.25 * (t % 3) for t in range(40)]
+    path = tmp_path / "trace.txt"
+    _run(TraceWriter(path), demands)
+    rows = path.read_text().splitlines()[2:42]
+
+    assert list(iter_text_rows(path, 17, 23)) == rows[17:23]
+    assert list(iter_text_rows(path, 35)) == rows[35:]
+    assert list(iter_text_rows(path, 50, 60)) == []
+
+    written = index_path(path).read_bytes()
+    index_path(path).unlink()
+    build_index(path)
+    assert index_path(path).read_bytes() == written
+
+
+def test_columnar_window_skips_to_block(tmp_path):
+    """Windows spanning block boundaries and the partial last block."""
+    demands = [70.0 + (t * 7) % 30 for t in range(23)]
+    path = tmp_path / "trace.ctrace"
+    _run(ColumnarTraceWriter(path, block_rows=5), demands)
+
+    for start, end in ((0, 23), (7, 13), (12, 100), (20, None), (5, 10)):
+        blocks = [block for _, block in iter_columnar_blocks(path, start, end)]
+        t = np.concatenate([block[0] for block in blocks])
+        np.testing.assert_array_equal(t, np.arange(start, min(end or 23, 23)))